@@ -0,0 +1,296 @@
+import multiprocessing
+import os
+from typing import Any, Dict, Iterable, Iterator
+
+from Modules.Lexer_Core import LexerCore
+from Modules.Lexer_Cache import DiskCache
+from Modules.componentsLEXER.Core_Errors import ParseError
+from Modules.componentsLEXER.Language_Parser import LanguageParser
+
+# Analyzer owned by each worker process, built once by `_init_worker`.
+_worker_core = None
+# Whether the worker sends summaries instead of full results.
+_worker_summary = False
+
+def _build_cache(cache_options: tuple) -> DiskCache:
+    """
+    Opens the `DiskCache` of the current grammar, if a cache directory is set.
+
+    Parameters
+    ----------
+    cache_options : tuple
+        Cache directory (or None), maximum size in bytes and maximum age
+        in seconds of the disk cache.
+
+    Returns
+    -------
+    DiskCache or None
+        The cache, or None if no cache directory is set.
+    """
+    cache_dir, max_bytes, max_age = cache_options
+    if not cache_dir:
+        return None
+    return DiskCache(cache_dir, LanguageParser.grammar_version(), max_bytes, max_age)
+
+def _build_core(cache_options: tuple) -> LexerCore:
+    """
+    Builds a `LexerCore`, backed by a `DiskCache` if a cache directory is set.
+
+    Parameters
+    ----------
+    cache_options : tuple
+        See `_build_cache`.
+
+    Returns
+    -------
+    LexerCore
+        The analyzer.
+    """
+    return LexerCore(_build_cache(cache_options))
+
+def _init_worker(cache_options: tuple, summary: bool) -> None:
+    """
+    Builds the `LexerCore` used by the current worker process.
+
+    Parameters
+    ----------
+    cache_options : tuple
+        See `_build_core`.
+    summary : bool
+        Whether the worker sends summaries, see `BatchAnalyzer.summarize`.
+
+    Returns
+    -------
+        None
+    """
+    global _worker_core, _worker_summary
+    _worker_core = _build_core(cache_options)
+    _worker_summary = summary
+
+def _analyze_in_worker(path: str) -> Dict[str, Any]:
+    """
+    Analyzes a file inside a worker process and prepares the result to be
+    sent back to the parent.
+
+    Only what the parent needs is sent: the summary in summary mode;
+    otherwise the result with the error contexts rendered, so errors
+    don't carry the line table of the whole input with them.
+
+    Parameters
+    ----------
+    path : str
+        Path of the file to analyze.
+
+    Returns
+    -------
+    dict
+        The analysis result, see `BatchAnalyzer.analyze_file`, or its
+        summary.
+    """
+    result = BatchAnalyzer.analyze_file(_worker_core, path)
+    if _worker_summary:
+        return BatchAnalyzer.summarize(result)
+    if "error" in result:
+        return result
+    for err in result["lexer_errors"] + result["parser_errors"]:
+        # Setting the context drops the line table it was rendered from.
+        err.context = err.context
+    tokens = result["tokens"]
+    if isinstance(tokens, list):
+        for tok in tokens:
+            # PLY attaches the lexer to tokens built by rule functions; it
+            # holds the whole parser and can't be pickled.
+            tok.__dict__.pop("lexer", None)
+    return result
+
+class BatchAnalyzer:
+    """
+    Runs the analyzer over many files, optionally in parallel.
+
+    PLY lexers and parsers keep mutable state, so a single instance can't
+    be shared between workers. Each worker process builds its own
+    `LexerCore` once and analyzes the file paths streamed to it.
+
+    Attributes
+    ----------
+    workers : int
+        Number of worker processes; 1 analyzes in the current process.
+    chunksize : int
+        Number of paths sent to a worker at a time.
+    ordered : bool
+        If True results are yielded in input order, otherwise in
+        completion order.
+    cache_dir : str or None
+        Directory of the `DiskCache` used to skip unchanged files, None
+        to disable it.
+    cache_max_bytes : int or None
+        Size limit applied to the disk cache after each run.
+    cache_max_age : float or None
+        Age limit in seconds applied to the disk cache after each run.
+    summary : bool
+        If True, each result is reduced by `summarize` as soon as it is
+        built, so tokens, AST and errors are neither kept nor sent
+        between processes.
+    """
+    def __init__(self, workers: int = 1, chunksize: int = 1, ordered: bool = True,
+                 cache_dir: str = None, cache_max_bytes: int = None,
+                 cache_max_age: float = None, summary: bool = False) -> None:
+        """
+        Initializes the BatchAnalyzer.
+
+        Parameters
+        ----------
+        workers : int, optional
+            Number of worker processes, 0 uses one per CPU, by default 1.
+        chunksize : int, optional
+            Number of paths sent to a worker at a time, by default 1.
+        ordered : bool, optional
+            Whether results keep the input order, by default True.
+        cache_dir : str, optional
+            Directory of the disk cache, by default None (no cache).
+        cache_max_bytes : int, optional
+            Size limit of the disk cache, by default None (no limit).
+        cache_max_age : float, optional
+            Age limit in seconds of the disk cache, by default None (no limit).
+        summary : bool, optional
+            Whether results are reduced to summaries, by default False.
+        """
+        self.workers = workers if workers > 0 else (os.cpu_count() or 1)
+        self.chunksize = max(1, chunksize)
+        self.ordered = ordered
+        self.cache_dir = cache_dir
+        self.cache_max_bytes = cache_max_bytes
+        self.cache_max_age = cache_max_age
+        self.summary = summary
+        self._core = None
+
+    @staticmethod
+    def analyze_file(core: LexerCore, path: str) -> Dict[str, Any]:
+        """
+        Reads and analyzes a single file.
+
+        Parameters
+        ----------
+        core : LexerCore
+            The analyzer used to process the file.
+        path : str
+            Path of the file to analyze.
+
+        Returns
+        -------
+        dict
+            A copy of the result of `LexerCore.process` with the file path
+            added, or a dictionary with 'path' and 'error' if the file
+            can't be read.
+        """
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                code = f.read()
+        except (OSError, UnicodeDecodeError) as e:
+            return {"path": path, "error": f"Can't open file: {str(e)}"}
+        # Cached results are shared and must not be modified.
+        result = dict(core.process(code))
+        result["path"] = path
+        return result
+
+    @staticmethod
+    def count_errors(result: Dict[str, Any]) -> tuple:
+        """
+        Counts the lexer and parser errors of an analysis result.
+
+        Parser errors are counted by kind, because the parser pass also
+        reports the lexer errors it runs into.
+
+        Parameters
+        ----------
+        result : dict
+            Result returned by `analyze_file`.
+
+        Returns
+        -------
+        tuple
+            Number of lexer errors and number of parser errors.
+        """
+        lexer_errors = len(result["lexer_errors"])
+        parser_errors = sum(1 for err in result["parser_errors"] if isinstance(err, ParseError))
+        return lexer_errors, parser_errors
+
+    @classmethod
+    def summarize(cls, result: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Reduces an analysis result to its path, token count and error
+        counts.
+
+        Parameters
+        ----------
+        result : dict
+            Result returned by `analyze_file`.
+
+        Returns
+        -------
+        dict
+            'path', 'token_count', 'lexer_error_count' and
+            'parser_error_count', or the result itself if it holds an
+            'error'.
+        """
+        if "error" in result:
+            return result
+        lexer_errors, parser_errors = cls.count_errors(result)
+        return {
+            "path": result["path"],
+            "token_count": len(result["tokens"]),
+            "lexer_error_count": lexer_errors,
+            "parser_error_count": parser_errors
+        }
+
+    def analyze(self, paths: Iterable[str]) -> Iterator[Dict[str, Any]]:
+        """
+        Analyzes the given files and yields their results.
+
+        Paths are consumed lazily, so they can come from a directory walk
+        that is still running. Once every file is analyzed, the disk cache
+        (if any) is pruned to its limits.
+
+        Parameters
+        ----------
+        paths : Iterable[str]
+            Paths of the files to analyze.
+
+        Returns
+        -------
+        Iterator[dict]
+            One result per path, see `analyze_file`, or its summary if
+            `summary` is set.
+        """
+        if self.workers == 1:
+            if self._core is None:
+                self._core = _build_core(self._cache_options())
+            for path in paths:
+                result = self.analyze_file(self._core, path)
+                yield self.summarize(result) if self.summary else result
+            if self._core.cache is not None:
+                self._core.cache.prune()
+        else:
+            # Only the workers analyze files; the parent just prunes the
+            # cache. It is opened first so its fingerprint is checked once.
+            cache = _build_cache(self._cache_options())
+            with multiprocessing.Pool(
+                self.workers, initializer=_init_worker,
+                initargs=(self._cache_options(), self.summary)
+            ) as pool:
+                imap = pool.imap if self.ordered else pool.imap_unordered
+                yield from imap(_analyze_in_worker, paths, self.chunksize)
+            if cache is not None:
+                cache.prune()
+                cache.close()
+
+    def _cache_options(self) -> tuple:
+        """
+        Returns the disk cache settings passed to `_build_core`.
+
+        Returns
+        -------
+        tuple
+            Cache directory, maximum size and maximum age.
+        """
+        return (self.cache_dir, self.cache_max_bytes, self.cache_max_age)
@@ -0,0 +1,243 @@
+import argparse
+import os
+import sys
+from typing import Any, Dict, Iterator, List, TextIO
+
+from Modules.Lexer_Batch import BatchAnalyzer
+from Modules.componentsLEXER.Json_Encoder import ResultJsonEncoder
+
+class LexerCLI:
+    """
+    Command line interface for running the analyzer headlessly.
+
+    Walks the given files and directories, runs `LexerCore.process` on
+    every source file found (in parallel through a `BatchAnalyzer`) and
+    writes the results as JSON Lines or as a summary table. It does not
+    depend on the GUI toolkit, so it can be used in CI.
+
+    Attributes
+    ----------
+    DEFAULT_EXTENSIONS : tuple
+        File extensions analyzed when walking directories.
+    """
+    DEFAULT_EXTENSIONS = ('.go',)
+
+    def create_arg_parser(self) -> argparse.ArgumentParser:
+        """
+        Builds the argument parser with the available subcommands.
+
+        Returns
+        -------
+        argparse.ArgumentParser
+            Parser for the command line arguments.
+        """
+        arg_parser = argparse.ArgumentParser(
+            prog="python -m Modules",
+            description="Lexical and syntactic analyzer for a Go-like language."
+        )
+        subparsers = arg_parser.add_subparsers(dest="command", required=True)
+        analyze = subparsers.add_parser("analyze", help="Analyze source files and directories.")
+        analyze.add_argument("paths", nargs="+", help="Files or directories to analyze.")
+        analyze.add_argument(
+            "-f", "--format",
+            choices=("jsonl", "summary"),
+            default="summary",
+            help="Output format, by default 'summary'."
+        )
+        analyze.add_argument(
+            "-e", "--ext",
+            action="append",
+            dest="extensions",
+            help="File extension analyzed inside directories, can be repeated (default: .go)."
+        )
+        analyze.add_argument(
+            "-o", "--output",
+            help="File where the results are written, by default stdout."
+        )
+        analyze.add_argument(
+            "-j", "--jobs",
+            type=int,
+            default=1,
+            help="Number of worker processes, 0 uses one per CPU (default: 1)."
+        )
+        analyze.add_argument(
+            "--chunk-size",
+            type=int,
+            default=8,
+            help="Number of files sent to a worker at a time (default: 8)."
+        )
+        analyze.add_argument(
+            "--unordered",
+            action="store_true",
+            help="Write results as soon as they are ready instead of in input order."
+        )
+        analyze.add_argument(
+            "--cache-dir",
+            help="Directory of a persistent cache used to skip unchanged files."
+        )
+        analyze.add_argument(
+            "--cache-max-mb",
+            type=float,
+            help="Size limit of the persistent cache in megabytes."
+        )
+        analyze.add_argument(
+            "--cache-max-age-days",
+            type=float,
+            help="Drop cached results not used for this many days."
+        )
+        return arg_parser
+
+    def collect_files(self, paths: List[str], extensions: tuple) -> Iterator[str]:
+        """
+        Yields the files to analyze from a list of files and directories.
+
+        Files given explicitly are always yielded; directories are walked
+        recursively in sorted order, keeping only matching extensions.
+
+        Parameters
+        ----------
+        paths : list of str
+            Files or directories given on the command line.
+        extensions : tuple
+            File extensions to keep when walking directories.
+
+        Returns
+        -------
+        Iterator[str]
+            Paths of the files to analyze.
+        """
+        for path in paths:
+            if not os.path.isdir(path):
+                yield path
+                continue
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for name in sorted(files):
+                    if name.endswith(extensions):
+                        yield os.path.join(root, name)
+
+    def write_results(self, results: Iterator[Dict[str, Any]], out: TextIO, output_format: str) -> bool:
+        """
+        Writes the analysis results in the requested format.
+
+        Parameters
+        ----------
+        results : Iterator[dict]
+            Results returned by `BatchAnalyzer.analyze`, in output order:
+            summaries for the 'summary' format, full results otherwise.
+        out : TextIO
+            Stream where the results are written.
+        output_format : str
+            Either 'jsonl' or 'summary'.
+
+        Returns
+        -------
+        bool
+            True if any file had errors or couldn't be read.
+        """
+        failed = False
+
+        def check(results):
+            nonlocal failed
+            for result in results:
+                if "error" in result:
+                    failed = True
+                elif output_format == "jsonl":
+                    failed = failed or any(BatchAnalyzer.count_errors(result))
+                else:
+                    failed = failed or result["lexer_error_count"] > 0 or result["parser_error_count"] > 0
+                yield result
+
+        if output_format == "jsonl":
+            # Streamed without building the dictionaries of the result.
+            ResultJsonEncoder(out).write_jsonl(check(results))
+        else:
+            self.write_summary(check(results), out)
+        return failed
+
+    def write_summary(self, results: Iterator[Dict[str, Any]], out: TextIO) -> None:
+        """
+        Writes a table with the token and error counts of each file.
+
+        Each summary is turned into its row as it arrives, so only the rows
+        are kept until the table is written.
+
+        Parameters
+        ----------
+        results : Iterator[dict]
+            Summaries returned by `BatchAnalyzer.summarize`.
+        out : TextIO
+            Stream where the table is written.
+
+        Returns
+        -------
+            None
+        """
+        header = ("FILE", "TOKENS", "LEXER", "PARSER")
+        rows = []
+        totals = [0, 0, 0]
+        files = 0
+        for result in results:
+            files += 1
+            if "error" in result:
+                rows.append((result["path"], "-", "-", result["error"]))
+                continue
+            counts = (result["token_count"], result["lexer_error_count"], result["parser_error_count"])
+            totals = [total + count for total, count in zip(totals, counts)]
+            rows.append((result["path"],) + tuple(str(count) for count in counts))
+        rows.append((f"TOTAL ({files} files)",) + tuple(str(total) for total in totals))
+        width = max(len(row[0]) for row in rows + [header])
+        for row in [header] + rows:
+            out.write(f"{row[0]:<{width}}  {row[1]:>8}  {row[2]:>6}  {row[3]:>6}\n")
+
+    def analyze(self, args: argparse.Namespace) -> int:
+        """
+        Runs the 'analyze' subcommand.
+
+        Parameters
+        ----------
+        args : argparse.Namespace
+            Parsed command line arguments.
+
+        Returns
+        -------
+        int
+            Exit status: 0 if no errors were found, 1 otherwise.
+        """
+        extensions = tuple(args.extensions) if args.extensions else self.DEFAULT_EXTENSIONS
+        paths = self.collect_files(args.paths, extensions)
+        batch = BatchAnalyzer(
+            args.jobs,
+            args.chunk_size,
+            ordered=not args.unordered,
+            cache_dir=args.cache_dir,
+            cache_max_bytes=int(args.cache_max_mb * 1024 * 1024) if args.cache_max_mb else None,
+            cache_max_age=args.cache_max_age_days * 86400 if args.cache_max_age_days else None,
+            summary=args.format == "summary"
+        )
+        results = batch.analyze(paths)
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as out:
+                failed = self.write_results(results, out, args.format)
+        else:
+            failed = self.write_results(results, sys.stdout, args.format)
+        return 1 if failed else 0
+
+    def run(self, argv: List[str] = None) -> int:
+        """
+        Parses the command line and runs the selected subcommand.
+
+        Parameters
+        ----------
+        argv : list of str, optional
+            Command line arguments, by default `sys.argv[1:]`.
+
+        Returns
+        -------
+        int
+            Exit status of the subcommand.
+        """
+        args = self.create_arg_parser().parse_args(argv)
+        if args.command == "analyze":
+            return self.analyze(args)
+        return 2
@@ -0,0 +1,395 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from Modules.componentsLEXER.Result_Format import FORMAT_VERSION, ResultReader, ResultWriter
+
+class ResultCache:
+    """
+    In-memory LRU cache of analysis results.
+
+    Results are keyed by a hash of the source text and the grammar
+    version, so an unchanged input is answered without analyzing it
+    again. The cache is bounded both by number of entries and by an
+    estimate of the memory held by the cached results. Cached results are
+    shared between callers and must be treated as read-only.
+
+    Attributes
+    ----------
+    max_entries : int
+        Maximum number of cached results.
+    max_bytes : int
+        Maximum estimated size of all cached results.
+    hits : int
+        Number of lookups answered from the cache.
+    misses : int
+        Number of lookups not found in the cache.
+    evictions : int
+        Number of results dropped to respect the bounds.
+    """
+    # Rough memory held per token by each token representation and by
+    # the AST and errors built from it, used by `estimate_size`.
+    TOKEN_BYTES = 180
+    COMPACT_TOKEN_BYTES = 16
+    AST_BYTES_PER_TOKEN = 64
+    ERROR_BYTES = 200
+
+    def __init__(self, max_entries: int = 128, max_bytes: int = 256 * 1024 * 1024) -> None:
+        """
+        Initializes an empty ResultCache.
+
+        Parameters
+        ----------
+        max_entries : int, optional
+            Maximum number of cached results, by default 128.
+        max_bytes : int, optional
+            Maximum estimated size of all cached results, by default 256 MB.
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(code: str, *parts: Any) -> str:
+        """
+        Builds a cache key from the source text and extra key parts.
+
+        Parameters
+        ----------
+        code : str
+            The source code that was analyzed.
+        *parts : any
+            Other values the result depends on, such as the grammar
+            version or the token representation.
+
+        Returns
+        -------
+        str
+            Hexadecimal digest identifying the input.
+        """
+        digest = hashlib.blake2b(code.encode('utf-8', 'surrogatepass'), digest_size=20)
+        for part in parts:
+            digest.update(b'\0' + repr(part).encode('utf-8'))
+        return digest.hexdigest()
+
+    @classmethod
+    def estimate_size(cls, result: Dict[str, Any]) -> int:
+        """
+        Estimates the memory held by an analysis result.
+
+        Parameters
+        ----------
+        result : dict
+            Result returned by `LexerCore.process`.
+
+        Returns
+        -------
+        int
+            Approximate size in bytes.
+        """
+        tokens = result["tokens"]
+        per_token = cls.TOKEN_BYTES if isinstance(tokens, list) else cls.COMPACT_TOKEN_BYTES
+        errors = len(result["lexer_errors"]) + len(result["parser_errors"])
+        return len(tokens) * (per_token + cls.AST_BYTES_PER_TOKEN) + errors * cls.ERROR_BYTES
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Returns the cached result for a key and marks it as recently used.
+
+        Parameters
+        ----------
+        key : str
+            Key built by `make_key`.
+
+        Returns
+        -------
+        dict or None
+            The cached result, or None if it is not cached.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: str, result: Dict[str, Any], size: int = None) -> None:
+        """
+        Stores a result, evicting the least recently used ones if needed.
+
+        Results larger than `max_bytes` on their own are not stored.
+
+        Parameters
+        ----------
+        key : str
+            Key built by `make_key`.
+        result : dict
+            Result returned by `LexerCore.process`.
+        size : int, optional
+            Size of the result in bytes, by default `estimate_size(result)`.
+
+        Returns
+        -------
+            None
+        """
+        if size is None:
+            size = self.estimate_size(result)
+        if size > self.max_bytes or self.max_entries <= 0:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._entries[key] = (result, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """
+        Removes every cached result; statistics are kept.
+
+        Returns
+        -------
+            None
+        """
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns the usage statistics of the cache.
+
+        Returns
+        -------
+        dict
+            Hits, misses, evictions, number of entries and estimated bytes.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes
+            }
+
+class DiskCache:
+    """
+    Persistent cache of analysis results stored in SQLite.
+
+    It has the same interface as `ResultCache`, so it can be given to
+    `LexerCore` to skip unchanged files between runs. The database keeps
+    the grammar fingerprint it was filled with and drops every entry when
+    it no longer matches, so results never outlive the grammar that built
+    them. Results are stored in the binary format of `ResultWriter`,
+    compressed. Entries can be evicted by age and by total size with `prune`.
+
+    Attributes
+    ----------
+    FILENAME : str
+        Name of the database file inside the cache directory.
+    path : str
+        Path of the database file.
+    fingerprint : str
+        Grammar version the stored results belong to.
+    max_bytes : int or None
+        Maximum total size kept by `prune`, None for no limit.
+    max_age : float or None
+        Maximum age in seconds since last use kept by `prune`, None for
+        no limit.
+    hits : int
+        Number of lookups answered from the cache.
+    misses : int
+        Number of lookups not found in the cache.
+    """
+    FILENAME = "analysis.sqlite3"
+
+    def __init__(self, cache_dir: str, fingerprint: str, max_bytes: int = None,
+                 max_age: float = None) -> None:
+        """
+        Opens (creating it if needed) the cache stored in `cache_dir`.
+
+        Parameters
+        ----------
+        cache_dir : str
+            Directory holding the cache database.
+        fingerprint : str
+            Grammar version of the results, see
+            `LanguageParser.grammar_version`.
+        max_bytes : int, optional
+            Maximum total size kept by `prune`, by default no limit.
+        max_age : float, optional
+            Maximum age in seconds since last use kept by `prune`, by
+            default no limit.
+        """
+        os.makedirs(cache_dir, exist_ok=True)
+        self.path = os.path.join(cache_dir, self.FILENAME)
+        self.fingerprint = fingerprint
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+        self._db = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT)")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "key TEXT PRIMARY KEY, data BLOB, size INTEGER, accessed REAL)"
+        )
+        self._check_fingerprint()
+
+    def _check_fingerprint(self) -> None:
+        """
+        Drops every stored entry if they were built by another grammar or
+        stored in another format version.
+
+        Returns
+        -------
+            None
+        """
+        stored_fingerprint = f"{self.fingerprint}/{FORMAT_VERSION}"
+        with self._db:
+            self._db.execute("BEGIN IMMEDIATE")
+            row = self._db.execute("SELECT value FROM meta WHERE name = 'fingerprint'").fetchone()
+            if row is None or row[0] != stored_fingerprint:
+                self._db.execute("DELETE FROM entries")
+                self._db.execute(
+                    "INSERT OR REPLACE INTO meta (name, value) VALUES ('fingerprint', ?)",
+                    (stored_fingerprint,)
+                )
+
+    make_key = staticmethod(ResultCache.make_key)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Loads the stored result for a key and records its use.
+
+        Parameters
+        ----------
+        key : str
+            Key built by `make_key`.
+
+        Returns
+        -------
+        dict or None
+            The stored result, or None if it is not stored.
+        """
+        row = self._db.execute("SELECT data FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self._db.execute("UPDATE entries SET accessed = ? WHERE key = ?", (time.time(), key))
+        self.hits += 1
+        return ResultReader(zlib.decompress(row[0])).result()
+
+    def put(self, key: str, result: Dict[str, Any], size: int = None) -> None:
+        """
+        Stores a result. Tokens and AST are given back by `get` in the
+        same form.
+
+        Parameters
+        ----------
+        key : str
+            Key built by `make_key`.
+        result : dict
+            Result returned by `LexerCore.process`.
+        size : int, optional
+            Ignored, the stored size is measured; kept for compatibility
+            with `ResultCache.put`.
+
+        Returns
+        -------
+            None
+        """
+        data = zlib.compress(ResultWriter().dumps(result), 1)
+        self._db.execute(
+            "INSERT OR REPLACE INTO entries (key, data, size, accessed) VALUES (?, ?, ?, ?)",
+            (key, data, len(data), time.time())
+        )
+
+    def prune(self) -> int:
+        """
+        Evicts entries unused for longer than `max_age`, then the least
+        recently used ones until the total size fits in `max_bytes`.
+
+        Returns
+        -------
+        int
+            Number of evicted entries.
+        """
+        evicted = 0
+        with self._db:
+            self._db.execute("BEGIN IMMEDIATE")
+            if self.max_age is not None:
+                cursor = self._db.execute(
+                    "DELETE FROM entries WHERE accessed < ?", (time.time() - self.max_age,)
+                )
+                evicted += cursor.rowcount
+            if self.max_bytes is not None:
+                total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+                if total > self.max_bytes:
+                    stale = []
+                    for key, size in self._db.execute("SELECT key, size FROM entries ORDER BY accessed"):
+                        if total <= self.max_bytes:
+                            break
+                        stale.append((key,))
+                        total -= size
+                    self._db.executemany("DELETE FROM entries WHERE key = ?", stale)
+                    evicted += len(stale)
+        return evicted
+
+    def clear(self) -> None:
+        """
+        Removes every stored result; statistics are kept.
+
+        Returns
+        -------
+            None
+        """
+        self._db.execute("DELETE FROM entries")
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns the usage statistics of the cache.
+
+        Returns
+        -------
+        dict
+            Hits, misses, number of entries and stored bytes.
+        """
+        entries, size = self._db.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+        ).fetchone()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": entries,
+            "bytes": size
+        }
+
+    def close(self) -> None:
+        """
+        Closes the database connection.
+
+        Returns
+        -------
+            None
+        """
+        self._db.close()
@@ -1,6 +1,9 @@
-from typing import Any, Dict
+from typing import Any, Callable, Dict
 
 from Modules.componentsLEXER.Language_Parser import LanguageParser
+from Modules.componentsLEXER.Core_Errors import LexerError
+from Modules.componentsLEXER.Token_Buffer import TokenBuffer
+from Modules.Lexer_Cache import ResultCache
 
 class LexerCore:
     """
@@ -13,28 +16,52 @@ class LexerCore:
     ----------
     parser : LanguageParser
         Instance of the language parser used for lexical and syntactic analysis.
+    cache : ResultCache or None
+        Cache of previous results, keyed by source text and grammar version.
     """
-    def __init__(self):
+    def __init__(self, cache: ResultCache = None):
         self.parser = LanguageParser()
+        self.cache = cache
+        self.grammar_version = self.parser.grammar_version()
 
-    def process(self, code: str) -> Dict[str, Any]:
+    def process(self, code: str, compact: bool = False, spans: bool = False,
+                nodes: bool = False, flat: bool = False,
+                progress: Callable[[int, int], None] = None) -> Dict[str, Any]:
         """
         Processes the provided source code by performing both lexical and
-        syntactic analysis. Clears previous errors before each stage and
-        returns a summary of the results, including the tokens, AST, and
-        any errors found.
+        syntactic analysis in a single pass. The tokens consumed by the
+        parser are recorded, so the input is lexed only once, and a summary
+        of the results is returned, including the tokens, AST, and any
+        errors found. If a cache is set and the same code was already
+        analyzed, the cached result is returned as is.
 
         Parameters
         ----------
         code : str
             A string representing the source code to be analyzed.
+        compact : bool, optional
+            If True, tokens are returned in a `TokenBuffer` instead of a
+            list of `LexToken` objects, by default False.
+        spans : bool, optional
+            If True, AST nodes record their source span, see
+            `LanguageParser.parse`, by default False.
+        nodes : bool, optional
+            If True, the AST is built from typed `Node` objects, by
+            default False.
+        flat : bool, optional
+            If True, the AST is a `FlatAst`, which takes much less memory
+            on large inputs, by default False.
+        progress : Callable or None, optional
+            Called now and then with the position reached and the length
+            of the code; it may raise `AnalysisCancelled` to stop the
+            analysis, see `LanguageParser.parse`. By default None.
 
         Returns
         -------
         dict
             A dictionary containing the results of the analysis:
-            - 'tokens' : list
-                List of tokens generated during lexical analysis.
+            - 'tokens' : list or TokenBuffer
+                Tokens generated during lexical analysis.
             - 'ast' : Any
                 Abstract Syntax Tree (AST) generated during parsing.
             - 'lexer_errors' : list of str
@@ -42,15 +69,27 @@ class LexerCore:
             - 'parser_errors' : list of str
                 List of errors found during syntactic analysis.
         """
-        self.parser.errors.clear()
-        tokens = self.parser.tokenize(code)
-        lexer_errors = self.parser.get_errors()
-        self.parser.errors.clear()
-        ast = self.parser.parse(code)
+        key = None
+        if self.cache is not None:
+            key = self.cache.make_key(code, self.grammar_version, compact, spans, nodes, flat)
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+        tokens = TokenBuffer(code) if compact else []
+        ast = self.parser.parse(
+            code, tokens=tokens, spans=spans, nodes=nodes, flat=flat, progress=progress
+        )
+        if compact:
+            # Lets `parse_buffer` report errors at EOF on the last line.
+            tokens.end_lineno = self.parser.lexer.lineno
         parser_errors = self.parser.get_errors()
-        return {
+        lexer_errors = [err for err in parser_errors if isinstance(err, LexerError)]
+        result = {
             "tokens": tokens,
             "ast": ast,
             "lexer_errors": lexer_errors,
             "parser_errors": parser_errors
         }
+        if key is not None:
+            self.cache.put(key, result)
+        return result
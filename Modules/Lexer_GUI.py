@@ -1,9 +1,16 @@
+from typing import Callable
+
 import customtkinter as ctk
+from Modules.componentsGUI.Analysis_Worker import AnalysisWorker
+from Modules.componentsGUI.Live_Analysis import LiveAnalysis
 from Modules.componentsGUI.Menu_Bar import MenuBar
+from Modules.componentsGUI.Result_Lines import ResultLines
 from Modules.componentsGUI.Text_Areas import TextAreas
 from Modules.componentsGUI.File_Handler import FileHandler
 from Modules.componentsGUI.Status_Bar import StatusBar
 from Modules.Lexer_Core import LexerCore
+from Modules.Lexer_Cache import ResultCache
+from Modules.Lexer_Live import LiveSession
 
 class LexerGUI:
     """
@@ -27,8 +34,35 @@ class LexerGUI:
         The bottom status bar displaying messages.
     lexer : LexerCore
         The core lexer engine responsible for lexical and syntactic analysis.
+        It is only used from the worker thread.
+    worker : AnalysisWorker
+        Runs the analyses in the background so the window never freezes.
+    last_result : dict or None
+        Result of the last analysis, used by the JSON export.
+    live_session : LiveSession
+        Incremental analysis used by live mode, only used from the worker
+        thread.
+    live : LiveAnalysis
+        Scheduler of the live mode analyses.
+    pending_mode : str or None
+        'run' or 'live' while an analysis of that kind is in flight.
+    edits : int
+        Number of changes of the input area so far, used to tell whether
+        the result of an analysis still matches the text.
     """
-    def __init__(self):
+    def __init__(self, live_debounce: int = 300, live_budget: int = 1000):
+        """
+        Initializes the application window and its components.
+
+        Parameters
+        ----------
+        live_debounce : int, optional
+            Milliseconds without typing before a live analysis starts, by
+            default 300.
+        live_budget : int, optional
+            Maximum milliseconds of a live analysis; above it live mode
+            turns itself off, by default 1000.
+        """
         ctk.set_appearance_mode("dark")
         ctk.set_default_color_theme("blue")
         self.root = ctk.CTk()
@@ -38,8 +72,27 @@ class LexerGUI:
         self.menu_bar = MenuBar(self.root, self.file_handler)
         self.text_areas = TextAreas(self.root)
         self.status_bar = StatusBar(self.root)
-        self.lexer = LexerCore()
+        self.lexer = LexerCore(cache=ResultCache(max_entries=16))
+        self.last_result = None
+        self.live_session = LiveSession()
+        self.live = LiveAnalysis(
+            self.root, self._live_run, self._live_fallback,
+            debounce=live_debounce, budget=live_budget
+        )
+        self.pending_mode = None
+        self.edits = 0
+        self._submitted_edits = 0
+        self.worker = AnalysisWorker(
+            self.root,
+            self._analyze,
+            self._analysis_done,
+            on_progress=self._analysis_progress,
+            on_error=self._analysis_failed
+        )
         self.menu_bar.set_run_callback(self.run_button_callback)
+        self.menu_bar.set_cancel_callback(self.cancel_callback)
+        self.menu_bar.set_live_callback(self.live_callback)
+        self.menu_bar.set_export_callback(self.export_callback)
         self.setup_ui()
 
     def setup_ui(self) -> None:
@@ -60,14 +113,29 @@ class LexerGUI:
         self.status_bar.create_status_bar()
         self.file_handler.set_status_bar(self.status_bar)
         self.menu_bar.set_status_bar(self.status_bar)
+        self.root.bind("<Escape>", lambda e: self.cancel_callback())
+        self.text_areas.bind_text_changed(self._text_changed)
+
+    def _text_changed(self) -> None:
+        """
+        Counts a change of the input area and lets live mode schedule an
+        analysis.
+
+        Returns
+        -------
+            None
+        """
+        self.edits += 1
+        self.live.text_changed()
 
     def run_button_callback(self) -> None:
         """
         Callback function for the run button execution.
 
-        Processes the input code through lexical and syntactic analysis,
-        clears previous output, and displays the results including tokens,
-        AST, and any errors encountered during processing.
+        Clears previous output and starts the lexical and syntactic
+        analysis of the input code on the background worker, replacing
+        any run still in flight. The results, including tokens, AST, and
+        any errors encountered, are displayed by `_analysis_done`.
 
         Returns
         -------
@@ -76,38 +144,240 @@ class LexerGUI:
             components with the processing results.
         """
         self.text_areas.clear_output()
-        code = self.text_areas.get_text().strip()
-        if not code:
+        code = self.text_areas.get_source()
+        if not code.strip():
+            self.worker.cancel()
+            self.pending_mode = None
+            self.menu_bar.set_running(False)
+            self.text_areas.clear_error_markers()
             self.status_bar.set_text("No input to process")
             self.text_areas.append_to_output("⚠️ No input provided.")
             return
         self.status_bar.set_text("Running...")
         self.text_areas.append_to_output("Running...")
-        try:
-            result = self.lexer.process(code)
-            self.text_areas.append_to_output("\n--- TOKENS ---")
-            for token in result["tokens"]:
-                self.text_areas.append_to_output(str(token))
-            if result["lexer_errors"]:
-                self.text_areas.append_to_output("\n--- LEXER ERRORS ---")
-                for err in result["lexer_errors"]:
-                    self.text_areas.append_to_output(str(err))
-            else:
-                self.text_areas.append_to_output("\nNo lexer errors.")
-            self.text_areas.append_to_output("\n--- AST ---")
-            self.text_areas.append_to_output(str(result["ast"]))
-            if result["parser_errors"]:
-                self.text_areas.append_to_output("\n--- PARSER ERRORS ---")
-                for err in result["parser_errors"]:
-                    self.text_areas.append_to_output(str(err))
-            else:
-                self.text_areas.append_to_output("\nNo parser errors.")
-            self.status_bar.set_text("Execution completed")
-        except Exception as e:
-            error_msg = f"Error: {str(e)}"
-            self.text_areas.append_to_output(error_msg)
+        self._submit("run", code)
+        self.menu_bar.set_running(True)
+
+    def cancel_callback(self) -> None:
+        """
+        Callback function for the cancel button and the Escape key.
+
+        Stops the run in flight, if any; its results are discarded. Live
+        analyses are left alone.
+
+        Returns
+        -------
+            None
+        """
+        if self.pending_mode == "run" and self.worker.cancel():
+            self.pending_mode = None
+            self.live.abandon()
+            self.menu_bar.set_running(False)
+            self.text_areas.append_to_output("Cancelled.")
+            self.status_bar.show_info("Analysis cancelled")
+
+    def live_callback(self, enabled: bool) -> None:
+        """
+        Callback function for the live mode switch.
+
+        Parameters
+        ----------
+        enabled : bool
+            Whether live mode was turned on.
+
+        Returns
+        -------
+            None
+        """
+        self.live.abandon()
+        if enabled:
+            self.live.enable()
+            self.status_bar.show_info("Live analysis on")
+        else:
+            self.live.disable()
+            if self.pending_mode == "live":
+                self.worker.cancel()
+                self.pending_mode = None
+            self.status_bar.show_info("Live analysis off")
+
+    def _live_run(self) -> bool:
+        """
+        Starts a live analysis of the editor text, unless a run started
+        with the run button is still in flight.
+
+        Returns
+        -------
+        bool
+            True if an analysis was started.
+        """
+        if self.pending_mode == "run":
+            # Don't replace the run the user asked for: try again later.
+            self.live.text_changed()
+            return False
+        code = self.text_areas.get_source()
+        if not code.strip():
+            self.text_areas.clear_error_markers()
+            return False
+        self._submit("live", code)
+        return True
+
+    def _live_fallback(self, elapsed: float) -> None:
+        """
+        Leaves live mode after an analysis exceeded the latency budget.
+
+        Parameters
+        ----------
+        elapsed : float
+            Milliseconds the analysis took.
+
+        Returns
+        -------
+            None
+        """
+        if self.pending_mode == "live":
+            self.worker.cancel()
+            self.pending_mode = None
+        self.menu_bar.set_live(False)
+        self.status_bar.show_warning(
+            f"Live analysis took {elapsed:.0f} ms (budget {self.live.budget} ms); "
+            "use Run instead"
+        )
+
+    def _submit(self, mode: str, code: str) -> None:
+        """
+        Starts an analysis on the worker, replacing the one in flight.
+
+        Parameters
+        ----------
+        mode : str
+            'run' for the run button, 'live' for live mode.
+        code : str
+            The source code to analyze.
+
+        Returns
+        -------
+            None
+        """
+        if mode == "run":
+            # A live analysis in flight is replaced: don't time it.
+            self.live.abandon()
+        self.pending_mode = mode
+        self._submitted_edits = self.edits
+        self.worker.submit((mode, code))
+
+    def _analyze(self, job: tuple, progress: Callable[[int, int], None]) -> tuple:
+        """
+        Analyzes the code and prepares the output lines. Runs on the worker
+        thread, so it must not touch any widget.
+
+        Live analyses go through the `LiveSession`, which reuses the
+        results of the previous one, and don't prepare output lines.
+        `LiveSession.update` takes no progress function, so a live analysis
+        can't be stopped once started: when cancelled or replaced, it runs
+        to its end, keeping the session consistent with its text, and only
+        its result is dropped.
+
+        Parameters
+        ----------
+        job : tuple
+            The mode and the source code, see `_submit`.
+        progress : Callable
+            Progress function of the worker, see `AnalysisWorker`.
+
+        Returns
+        -------
+        tuple
+            The mode, the result and its `ResultLines` (None for live
+            analyses).
+        """
+        mode, code = job
+        if mode == "live":
+            return mode, self.live_session.update(code), None
+        result = self.lexer.process(code, compact=True, progress=progress)
+        return mode, result, ResultLines(result)
+
+    def _analysis_progress(self, fraction: float) -> None:
+        """
+        Shows the progress of the run in flight in the status bar.
+
+        Parameters
+        ----------
+        fraction : float
+            Fraction of the input analyzed, from 0 to 1.
+
+        Returns
+        -------
+            None
+        """
+        if self.pending_mode == "run":
+            self.status_bar.show_progress("Running...", fraction)
+
+    def _analysis_done(self, output: tuple) -> None:
+        """
+        Displays the results of a finished analysis: error markers in the
+        editor and, for runs, the output area. If the text changed since
+        the analysis started, its errors no longer match the text, so the
+        markers and the error list are left as they are.
+
+        Parameters
+        ----------
+        output : tuple
+            The mode, the result and the output lines returned by `_analyze`.
+
+        Returns
+        -------
+            None
+        """
+        mode, result, lines = output
+        self.pending_mode = None
+        self.last_result = result
+        if self.edits == self._submitted_edits:
+            self.text_areas.mark_errors(result["parser_errors"])
+        if mode == "live":
+            elapsed = self.live.finished()
+            if self.live.enabled:
+                count = len(result["parser_errors"])
+                self.status_bar.set_text(f"Live: {count} error(s), {elapsed:.0f} ms")
+            return
+        self.menu_bar.set_running(False)
+        self.text_areas.show_output(lines)
+        self.status_bar.set_text("Execution completed")
+
+    def _analysis_failed(self, error: Exception) -> None:
+        """
+        Displays an error raised by the analysis.
+
+        Parameters
+        ----------
+        error : Exception
+            The exception raised on the worker thread.
+
+        Returns
+        -------
+            None
+        """
+        mode, self.pending_mode = self.pending_mode, None
+        error_msg = f"Error: {str(error)}"
+        if mode == "live":
+            self.live.finished()
             self.status_bar.show_error(error_msg)
+            return
+        self.menu_bar.set_running(False)
+        self.text_areas.append_to_output(error_msg)
+        self.status_bar.show_error(error_msg)
 
+    def export_callback(self) -> None:
+        """
+        Callback function for the "Export JSON" menu option.
+
+        Writes the result of the last analysis as JSON to a file chosen by
+        the user.
+
+        Returns
+        -------
+            None
+        """
+        self.file_handler.export_result(self.last_result)
 
     def exit(self) -> None:
         """
@@ -126,6 +396,8 @@ class LexerGUI:
         -------
             None
         """
+        self.live.disable()
+        self.worker.shutdown()
         self.menu_bar.exit_app(forced=True)
 
     def run(self) -> None:
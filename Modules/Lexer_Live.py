@@ -0,0 +1,131 @@
+from typing import Any, Dict, Tuple
+
+from Modules.componentsLEXER.Incremental_Parser import IncrementalParser
+from Modules.componentsLEXER.Core_Errors import LexerError
+
+class LiveSession:
+    """
+    Keeps the analysis of a document up to date while it is being edited.
+
+    Each call to `update` receives the whole text of the editor. The
+    changed range is found by comparing it with the previous text, and
+    only that range is passed to an `IncrementalParser`, so tokens and
+    statements outside of it are reused instead of analyzed again.
+
+    Attributes
+    ----------
+    parser : IncrementalParser
+        Incremental analysis of the document.
+    text : str or None
+        Text of the last update, None before the first one.
+    """
+    def __init__(self) -> None:
+        """
+        Initializes an empty LiveSession.
+        """
+        self.parser = IncrementalParser()
+        self.text = None
+
+    @staticmethod
+    def _common_prefix(old: str, new: str) -> int:
+        """
+        Returns the length of the common prefix of two texts.
+
+        Slices are compared by halves, so the work is done by string
+        comparisons instead of a loop over characters.
+
+        Parameters
+        ----------
+        old : str
+            First text.
+        new : str
+            Second text.
+
+        Returns
+        -------
+        int
+            Number of leading characters the texts share.
+        """
+        low, high = 0, min(len(old), len(new))
+        while low < high:
+            middle = (low + high + 1) // 2
+            if old[low:middle] == new[low:middle]:
+                low = middle
+            else:
+                high = middle - 1
+        return low
+
+    @classmethod
+    def diff(cls, old: str, new: str) -> Tuple[int, int, str]:
+        """
+        Finds the smallest range of `old` to replace to get `new`.
+
+        Parameters
+        ----------
+        old : str
+            Previous text.
+        new : str
+            Current text.
+
+        Returns
+        -------
+        tuple
+            Start and end position (exclusive) of the range in `old`, and
+            the text that replaces it.
+        """
+        start = cls._common_prefix(old, new)
+        limit = min(len(old), len(new)) - start
+        # The common suffix is the common prefix of the reversed tails.
+        suffix = min(cls._common_prefix(old[start:][::-1], new[start:][::-1]), limit)
+        return start, len(old) - suffix, new[start:len(new) - suffix]
+
+    @staticmethod
+    def line_col(text: str, pos: int) -> Tuple[int, int]:
+        """
+        Converts a position into a line (from 1) and a column (from 0).
+
+        Parameters
+        ----------
+        text : str
+            Text the position refers to.
+        pos : int
+            Position in `text`.
+
+        Returns
+        -------
+        tuple
+            Line and column of the position.
+        """
+        return text.count('\n', 0, pos) + 1, pos - (text.rfind('\n', 0, pos) + 1)
+
+    def update(self, text: str) -> Dict[str, Any]:
+        """
+        Brings the analysis up to date with the current text.
+
+        Parameters
+        ----------
+        text : str
+            Whole text of the document.
+
+        Returns
+        -------
+        dict
+            A result with the same keys as `LexerCore.process`: 'tokens'
+            (a `DocumentTokens`), 'ast', 'lexer_errors' and 'parser_errors'.
+        """
+        old = self.text
+        if old is None:
+            self.parser.set_text(text)
+        elif text != old:
+            start, end, replacement = self.diff(old, text)
+            start_line, start_col = self.line_col(old, start)
+            end_line, end_col = self.line_col(old, end)
+            self.parser.edit(start_line, start_col, end_line, end_col, replacement)
+        self.text = text
+        errors = self.parser.get_errors()
+        return {
+            "tokens": self.parser.lexer.tokens_view(),
+            "ast": self.parser.ast,
+            "lexer_errors": [err for err in errors if isinstance(err, LexerError)],
+            "parser_errors": errors
+        }
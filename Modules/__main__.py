@@ -0,0 +1,10 @@
+import sys
+
+from Modules.Lexer_CLI import LexerCLI
+
+if __name__ == "__main__":
+    try:
+        sys.exit(LexerCLI().run())
+    except KeyboardInterrupt:
+        print("\n\n[!] Interrupción detectada (Ctrl+C). Cerrando...\n")
+        sys.exit(130)
@@ -0,0 +1,190 @@
+import queue
+import threading
+from typing import Any, Callable
+
+from Modules.componentsLEXER.Core_Errors import AnalysisCancelled
+
+class AnalysisWorker:
+    """
+    Runs analyses on a background thread so the Tk main loop never waits
+    for them.
+
+    Runs are executed one at a time by a single daemon thread, which is
+    the only one that touches the objects used by `task` (e.g. a
+    `LexerCore`). The thread never calls Tk: it posts its progress and
+    results to a queue that the main thread drains with `root.after`, and
+    the callbacks are invoked from there. Starting a run cancels the one
+    in flight, whose late messages are dropped, so only the newest run
+    reports back. Cancellation is cooperative: `task` receives a progress
+    function that raises `AnalysisCancelled` once its run is cancelled.
+
+    Attributes
+    ----------
+    root : ctk.CTk
+        The main application window, used to schedule the polling.
+    task : Callable
+        Function called on the worker thread as `task(data, progress)`;
+        `progress(done, total)` must be called now and then.
+    on_done : Callable
+        Called on the main thread with the value returned by `task`.
+    on_progress : Callable or None
+        Called on the main thread with the fraction done, from 0 to 1.
+    on_error : Callable or None
+        Called on the main thread with the exception raised by `task`.
+    poll_interval : int
+        Milliseconds between two checks of the message queue.
+    """
+    def __init__(self, root: Any, task: Callable, on_done: Callable,
+                 on_progress: Callable = None, on_error: Callable = None,
+                 poll_interval: int = 50) -> None:
+        """
+        Initializes the worker; the thread is started on the first run.
+
+        Parameters
+        ----------
+        root : ctk.CTk
+            The main application window.
+        task : Callable
+            Function called as `task(data, progress)` on the worker thread.
+        on_done : Callable
+            Called with the value returned by `task`.
+        on_progress : Callable or None, optional
+            Called with the fraction done, by default None.
+        on_error : Callable or None, optional
+            Called with the exception raised by `task`, by default None.
+        poll_interval : int, optional
+            Milliseconds between two checks of the queue, by default 50.
+        """
+        self.root = root
+        self.task = task
+        self.on_done = on_done
+        self.on_progress = on_progress
+        self.on_error = on_error
+        self.poll_interval = poll_interval
+        self._jobs = queue.Queue()
+        self._messages = queue.Queue()
+        self._thread = None
+        self._poll_id = None
+        self._run_id = 0
+        self._active = None
+        self._cancel_event = None
+
+    def submit(self, data: Any) -> int:
+        """
+        Starts a run, cancelling the one in flight, if any.
+
+        Parameters
+        ----------
+        data : any
+            Value passed to `task`, e.g. the code to analyze.
+
+        Returns
+        -------
+        int
+            Id of the new run.
+        """
+        self.cancel()
+        self._run_id += 1
+        self._active = self._run_id
+        self._cancel_event = threading.Event()
+        self._jobs.put((self._run_id, data, self._cancel_event))
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._work, name="AnalysisWorker", daemon=True)
+            self._thread.start()
+        if self._poll_id is None:
+            self._poll_id = self.root.after(self.poll_interval, self._poll)
+        return self._run_id
+
+    def cancel(self) -> bool:
+        """
+        Cancels the run in flight. Its messages are dropped from now on,
+        and the thread stops it at its next progress report.
+
+        Returns
+        -------
+        bool
+            True if a run was cancelled.
+        """
+        if self._active is None:
+            return False
+        self._cancel_event.set()
+        self._active = None
+        return True
+
+    def shutdown(self) -> None:
+        """
+        Cancels the run in flight and lets the thread finish.
+
+        Returns
+        -------
+            None
+        """
+        self.cancel()
+        if self._thread is not None:
+            self._jobs.put(None)
+            self._thread = None
+        if self._poll_id is not None:
+            self.root.after_cancel(self._poll_id)
+            self._poll_id = None
+
+    def _work(self) -> None:
+        """
+        Body of the worker thread: runs the queued jobs, skipping those
+        cancelled before they started.
+
+        Returns
+        -------
+            None
+        """
+        post = self._messages.put
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            run_id, data, cancel_event = job
+            if cancel_event.is_set():
+                continue
+
+            def progress(done: int, total: int) -> None:
+                if cancel_event.is_set():
+                    raise AnalysisCancelled()
+                post(("progress", run_id, done / total if total else 1.0))
+
+            try:
+                post(("done", run_id, self.task(data, progress)))
+            except AnalysisCancelled:
+                pass
+            except Exception as e:
+                post(("error", run_id, e))
+
+    def _poll(self) -> None:
+        """
+        Delivers the messages of the current run on the main thread and
+        reschedules itself while the run is in flight.
+
+        Returns
+        -------
+            None
+        """
+        self._poll_id = None
+        fraction = None
+        while True:
+            try:
+                kind, run_id, value = self._messages.get_nowait()
+            except queue.Empty:
+                break
+            if run_id != self._active:
+                continue
+            if kind == "progress":
+                # Only the latest report matters.
+                fraction = value
+                continue
+            self._active = None
+            if kind == "done":
+                self.on_done(value)
+            elif self.on_error:
+                self.on_error(value)
+        if fraction is not None and self._active is not None and self.on_progress:
+            self.on_progress(fraction)
+        if self._active is not None:
+            self._poll_id = self.root.after(self.poll_interval, self._poll)
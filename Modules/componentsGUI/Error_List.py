@@ -0,0 +1,169 @@
+from typing import Any, Callable
+
+import customtkinter as ctk
+from Modules.componentsGUI.Error_Markers import ErrorIndex
+from Modules.componentsGUI.View_Watcher import ViewWatcher
+
+class ErrorList:
+    """
+    Clickable list of the errors of the last analysis, one row per error;
+    clicking a row jumps to the error in the input area.
+
+    The list holds one empty line per error, which is cheap for Tk and
+    gives the scrollbar its real length, and only the rows in view, plus
+    `margin` rows above and below, get their text. Rows keep their text
+    once filled, so scrolling back costs nothing.
+
+    Attributes
+    ----------
+    root : ctk.CTk
+        The main application window.
+    parent : ctk.CTkFrame
+        Frame holding the list.
+    jump_callback : Callable
+        Called with the line and the column (both starting at 1) of the
+        clicked error.
+    margin : int
+        Rows above and below the view that are filled too.
+    list_area : ctk.CTkTextbox or None
+        The widget showing the rows.
+    watcher : ViewWatcher or None
+        Triggers the filling of the rows when the view may have moved.
+    index : ErrorIndex
+        Errors listed, in row order.
+    """
+    def __init__(self, root: Any, parent: Any, jump_callback: Callable, margin: int = 20) -> None:
+        """
+        Initializes the ErrorList; the widget is built by `create_list`.
+
+        Parameters
+        ----------
+        root : ctk.CTk
+            The main application window.
+        parent : ctk.CTkFrame
+            Frame holding the list.
+        jump_callback : Callable
+            Function called with the line and column of a clicked error.
+        margin : int, optional
+            Rows filled above and below the view, by default 20.
+        """
+        self.root = root
+        self.parent = parent
+        self.jump_callback = jump_callback
+        self.margin = margin
+        self.list_area = None
+        self.watcher = None
+        self.index = ErrorIndex(())
+        self._filled = bytearray()
+
+    def create_list(self) -> None:
+        """
+        Creates the widget of the list, without placing it.
+
+        Returns
+        -------
+            None
+        """
+        self.list_area = ctk.CTkTextbox(
+            self.parent,
+            height=110,
+            wrap="none",
+            state="disabled",
+            corner_radius=6,
+            border_width=1,
+            border_color="#444444",
+            fg_color=("#f0f0f0", "#1a1a1a"),
+            text_color=("#b00020", "#ff7777")
+        )
+        self.list_area.tag_config("error_selected", background="#1f538d")
+        self.list_area.bind("<ButtonRelease-1>", self._row_clicked, add="+")
+        self.watcher = ViewWatcher(self.root, self.list_area, self._fill_view)
+
+    def show(self, index: ErrorIndex) -> None:
+        """
+        Replaces the rows with the errors of an index, keeping the scroll
+        position.
+
+        Parameters
+        ----------
+        index : ErrorIndex
+            Errors to list.
+
+        Returns
+        -------
+            None
+        """
+        top = self.list_area.yview()[0]
+        self.index = index
+        self._filled = bytearray(len(index))
+        self.list_area.configure(state="normal")
+        self.list_area.delete("1.0", "end")
+        if len(index) > 1:
+            self.list_area.insert("1.0", "\n" * (len(index) - 1))
+        self.list_area.configure(state="disabled")
+        self.list_area.yview_moveto(top)
+        self.watcher.schedule()
+
+    @staticmethod
+    def _row_text(err: Any) -> str:
+        """
+        Returns the text of the row of an error: its message and position,
+        without the context lines.
+
+        Parameters
+        ----------
+        err : LexerError or ParseError
+            The error.
+
+        Returns
+        -------
+        str
+            Text of the row.
+        """
+        text = f"Linea {err.lineno}, Col {err.col}: {err.message}"
+        value = getattr(err, "value", None)
+        if value:
+            text += f" at{value!r}"
+        return text
+
+    def _fill_view(self) -> None:
+        """
+        Fills the rows in view that are still empty.
+
+        Returns
+        -------
+            None
+        """
+        top, bottom = self.watcher.visible_lines()
+        stop = min(bottom + self.margin, len(self.index)) + 1
+        rows = [row for row in range(max(top - self.margin, 1), stop) if not self._filled[row - 1]]
+        if not rows:
+            return
+        self.list_area.configure(state="normal")
+        for row in rows:
+            self.list_area.insert(f"{row}.0", self._row_text(self.index[row - 1]))
+            self._filled[row - 1] = 1
+        self.list_area.configure(state="disabled")
+
+    def _row_clicked(self, event: 'tk.Event') -> None:
+        """
+        Selects the clicked row and jumps to its error.
+
+        Parameters
+        ----------
+        event : tk.Event
+            The click event.
+
+        Returns
+        -------
+            None
+        """
+        if not len(self.index):
+            return
+        row = int(self.list_area.index(f"@{event.x},{event.y}").split('.')[0])
+        if row > len(self.index):
+            return
+        self.list_area.tag_remove("error_selected", "1.0", "end")
+        self.list_area.tag_add("error_selected", f"{row}.0", f"{row + 1}.0")
+        err = self.index[row - 1]
+        self.jump_callback(err.lineno, err.col)
@@ -0,0 +1,203 @@
+from bisect import bisect_left
+from operator import attrgetter
+from typing import Any, Iterable, List
+
+from Modules.componentsGUI.View_Watcher import ViewWatcher
+
+class ErrorIndex:
+    """
+    Errors of a text sorted by position, so that the errors of a range of
+    lines are found without going through all of them.
+
+    Behaves as a read-only sequence of the sorted errors.
+
+    Attributes
+    ----------
+    errors : list
+        LexerError and ParseError objects, sorted by line and column.
+    """
+    def __init__(self, errors: Iterable) -> None:
+        """
+        Initializes the index.
+
+        Parameters
+        ----------
+        errors : Iterable
+            LexerError and ParseError objects, in any order.
+        """
+        self.errors = sorted(errors, key=attrgetter('lineno', 'col'))
+        self._lines = [err.lineno for err in self.errors]
+
+    def __len__(self) -> int:
+        return len(self.errors)
+
+    def __getitem__(self, index: int) -> Any:
+        return self.errors[index]
+
+    def between(self, first: int, stop: int) -> List[Any]:
+        """
+        Returns the errors of a range of lines.
+
+        Parameters
+        ----------
+        first : int
+            First line of the range, starting at 1.
+        stop : int
+            Line after the range.
+
+        Returns
+        -------
+        list
+            The errors, sorted by line and column.
+        """
+        return self.errors[bisect_left(self._lines, first):bisect_left(self._lines, stop)]
+
+class ErrorMarkers:
+    """
+    Marks the errors of the last analysis in a text widget: the text at
+    each error is underlined and its line gets a background.
+
+    Like `SyntaxHighlighter`, only the lines in view, plus `margin` lines
+    above and below, carry markers, so thousands of errors cost no more
+    than those in view. Markers already placed move with the text when it
+    is edited, but no new ones are placed until the next analysis, since
+    the positions of the errors no longer match the text.
+
+    Attributes
+    ----------
+    text_area : ctk.CTkTextbox
+        The text widget to mark.
+    margin : int
+        Lines above and below the view that are marked too.
+    watcher : ViewWatcher
+        Triggers the updates when the view may have moved.
+    index : ErrorIndex
+        Errors to mark.
+    """
+    def __init__(self, root: Any, text_area: Any, margin: int = 40,
+                 poll_interval: int = 250) -> None:
+        """
+        Initializes the markers and configures the tags of the widget.
+
+        Parameters
+        ----------
+        root : ctk.CTk
+            The main application window.
+        text_area : ctk.CTkTextbox
+            The text widget to mark.
+        margin : int, optional
+            Lines marked above and below the view, by default 40.
+        poll_interval : int, optional
+            Milliseconds between two checks of the view, by default 250.
+        """
+        self.text_area = text_area
+        self.margin = margin
+        self.index = ErrorIndex(())
+        # Lines [first, stop) whose markers are placed.
+        self._marked = (1, 1)
+        self._current = True
+        text_area.tag_config("error_line", background="#3b2424")
+        text_area.tag_config("error_marker", underline=True, foreground="#ff5555")
+        self.watcher = ViewWatcher(root, text_area, self._update_view, poll_interval)
+
+    def set_errors(self, index: ErrorIndex) -> None:
+        """
+        Replaces the markers with those of new errors.
+
+        Parameters
+        ----------
+        index : ErrorIndex
+            Errors of the current text of the widget.
+
+        Returns
+        -------
+            None
+        """
+        self.index = index
+        self._current = True
+        self._clear_lines(1, None)
+        self._marked = (1, 1)
+        self.watcher.schedule()
+
+    def text_changed(self) -> None:
+        """
+        Stops placing markers until the next `set_errors`, after a change of
+        the text.
+
+        Returns
+        -------
+            None
+        """
+        self._current = False
+
+    def _update_view(self) -> None:
+        """
+        Marks the lines in view that aren't marked yet and clears the lines
+        that left the view.
+
+        Returns
+        -------
+            None
+        """
+        if not self._current:
+            return
+        top, bottom = self.watcher.visible_lines()
+        first, stop = max(top - self.margin, 1), bottom + self.margin + 1
+        marked_first, marked_stop = self._marked
+        keep_first, keep_stop = max(marked_first, first), min(marked_stop, stop)
+        if keep_first >= keep_stop:
+            self._clear_lines(marked_first, marked_stop)
+            self._mark_lines(first, stop)
+        else:
+            self._clear_lines(marked_first, first)
+            self._clear_lines(stop, marked_stop)
+            self._mark_lines(first, keep_first)
+            self._mark_lines(keep_stop, stop)
+        self._marked = (first, stop)
+
+    def _clear_lines(self, first: int, stop: int) -> None:
+        """
+        Removes the markers from a range of lines.
+
+        Parameters
+        ----------
+        first : int
+            First line of the range, starting at 1.
+        stop : int or None
+            Line after the range, None for the end of the text.
+
+        Returns
+        -------
+            None
+        """
+        if stop is None or first < stop:
+            end = "end" if stop is None else f"{stop}.0"
+            for tag in ("error_line", "error_marker"):
+                self.text_area.tag_remove(tag, f"{first}.0", end)
+
+    def _mark_lines(self, first: int, stop: int) -> None:
+        """
+        Places the markers of the errors of a range of lines. Each marker
+        stays within the line of its error.
+
+        Parameters
+        ----------
+        first : int
+            First line of the range, starting at 1.
+        stop : int
+            Line after the range.
+
+        Returns
+        -------
+            None
+        """
+        tag_add = self.text_area.tag_add
+        marked_line = None
+        for err in self.index.between(first, stop):
+            col = max(err.col - 1, 0)
+            value = getattr(err, "value", None)
+            length = len(str(value)) if value is not None else 1
+            tag_add("error_marker", f"{err.lineno}.{col}", f"{err.lineno}.{col + max(length, 1)}")
+            if err.lineno != marked_line:
+                marked_line = err.lineno
+                tag_add("error_line", f"{marked_line}.0", f"{marked_line + 1}.0")
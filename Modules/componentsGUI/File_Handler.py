@@ -1,5 +1,6 @@
 from tkinter import filedialog, messagebox
 import customtkinter as ctk
+from Modules.componentsLEXER.Json_Encoder import ResultJsonEncoder
 
 class FileHandler:
     """
@@ -176,3 +177,42 @@ class FileHandler:
             messagebox.showerror("Save Error", error_msg)
             if self.status_bar:
                 self.status_bar.show_error(error_msg)
+
+    def export_result(self, result: dict) -> None:
+        """
+        Exports an analysis result to a JSON or JSON Lines file chosen
+        through a dialog. The file is written incrementally, so large
+        results don't need to be rendered in memory first.
+
+        Parameters
+        ----------
+        result : dict or None
+            Result returned by `LexerCore.process`, None if nothing was
+            analyzed yet.
+
+        Returns
+        -------
+            None
+        """
+        if result is None:
+            message = "Run the analysis before exporting."
+            messagebox.showinfo("Nothing to export", message)
+            if self.status_bar:
+                self.status_bar.show_info(message)
+            return
+        filename = filedialog.asksaveasfilename(
+            defaultextension=".json",
+            filetypes=[("JSON files", "*.json"), ("JSON Lines files", "*.jsonl"), ("All files", "*.*")]
+        )
+        if not filename:
+            return
+        try:
+            with open(filename, "w", encoding="utf-8") as f:
+                ResultJsonEncoder(f).write_json(result)
+            if self.status_bar:
+                self.status_bar.set_text(f"Exported: {filename}")
+        except Exception as e:
+            error_msg = f"Unable to export the result:\n{str(e)}"
+            messagebox.showerror("Export Error", error_msg)
+            if self.status_bar:
+                self.status_bar.show_error(error_msg)
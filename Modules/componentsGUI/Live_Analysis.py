@@ -0,0 +1,207 @@
+import time
+from typing import Any, Callable
+
+class LiveAnalysis:
+    """
+    Schedules analyses while the user types, when live mode is on.
+
+    Every change of the editor restarts a debounce timer; when it expires
+    without further changes, `start_callback` is asked to start an
+    analysis. Each analysis must be reported back with `finished` within
+    the latency budget. If the budget is exceeded, live mode is turned
+    off and `fallback_callback` is called, so the user goes back to
+    running the analysis on demand. The first analysis after live mode
+    is turned on is not held to the budget, since it has to analyze the
+    whole text before later ones can reuse its results.
+
+    Attributes
+    ----------
+    root : ctk.CTk
+        The main application window, used to schedule the timers.
+    start_callback : Callable
+        Called with no arguments to start an analysis; returns True if
+        one was started.
+    fallback_callback : Callable
+        Called with the elapsed milliseconds when the budget is exceeded.
+    debounce : int
+        Milliseconds without changes before an analysis starts.
+    budget : int
+        Maximum milliseconds an analysis may take before live mode is
+        turned off.
+    enabled : bool
+        Whether live mode is on.
+    """
+    def __init__(self, root: Any, start_callback: Callable, fallback_callback: Callable,
+                 debounce: int = 300, budget: int = 1000) -> None:
+        """
+        Initializes the LiveAnalysis, turned off.
+
+        Parameters
+        ----------
+        root : ctk.CTk
+            The main application window.
+        start_callback : Callable
+            Function starting an analysis, returning True if one started.
+        fallback_callback : Callable
+            Function called when the budget is exceeded.
+        debounce : int, optional
+            Milliseconds without changes before analyzing, by default 300.
+        budget : int, optional
+            Maximum milliseconds per analysis, by default 1000.
+        """
+        self.root = root
+        self.start_callback = start_callback
+        self.fallback_callback = fallback_callback
+        self.debounce = debounce
+        self.budget = budget
+        self.enabled = False
+        self._debounce_id = None
+        self._deadline_id = None
+        self._started = None
+        self._warm = False
+
+    def enable(self) -> None:
+        """
+        Turns live mode on and analyzes the current text right away.
+
+        Returns
+        -------
+            None
+        """
+        self.enabled = True
+        self._warm = False
+        self._schedule(0)
+
+    def disable(self) -> None:
+        """
+        Turns live mode off and drops any pending analysis.
+
+        Returns
+        -------
+            None
+        """
+        self.enabled = False
+        if self._debounce_id is not None:
+            self.root.after_cancel(self._debounce_id)
+            self._debounce_id = None
+        self.abandon()
+
+    def abandon(self) -> None:
+        """
+        Forgets the analysis in flight, if any, without holding it to the
+        budget. Called when the analysis is cancelled or replaced by
+        another one, since `finished` will never be called for it.
+
+        Returns
+        -------
+            None
+        """
+        self._stop_deadline()
+        self._started = None
+
+    def text_changed(self) -> None:
+        """
+        Restarts the debounce timer after a change of the editor.
+
+        Returns
+        -------
+            None
+        """
+        if self.enabled:
+            self._schedule(self.debounce)
+
+    def finished(self) -> float:
+        """
+        Reports that the analysis started last is done.
+
+        Returns
+        -------
+        float
+            Milliseconds the analysis took, or 0 if none was in flight.
+        """
+        self._stop_deadline()
+        if self._started is None:
+            return 0.0
+        elapsed = (time.perf_counter() - self._started) * 1000
+        self._started = None
+        if self._warm and elapsed > self.budget:
+            self._fall_back(elapsed)
+        self._warm = True
+        return elapsed
+
+    def _schedule(self, delay: int) -> None:
+        """
+        Schedules an analysis, replacing the one already scheduled.
+
+        Parameters
+        ----------
+        delay : int
+            Milliseconds to wait.
+
+        Returns
+        -------
+            None
+        """
+        if self._debounce_id is not None:
+            self.root.after_cancel(self._debounce_id)
+        self._debounce_id = self.root.after(delay, self._start)
+
+    def _start(self) -> None:
+        """
+        Starts an analysis when the debounce timer expires.
+
+        Returns
+        -------
+            None
+        """
+        self._debounce_id = None
+        if not self.enabled:
+            return
+        self._stop_deadline()
+        self._started = time.perf_counter()
+        if self._warm:
+            self._deadline_id = self.root.after(self.budget, self._over_budget)
+        if not self.start_callback():
+            self._stop_deadline()
+            self._started = None
+
+    def _stop_deadline(self) -> None:
+        """
+        Cancels the budget timer, if any.
+
+        Returns
+        -------
+            None
+        """
+        if self._deadline_id is not None:
+            self.root.after_cancel(self._deadline_id)
+            self._deadline_id = None
+
+    def _over_budget(self) -> None:
+        """
+        Falls back to on-demand mode when an analysis is still running at
+        the end of its budget.
+
+        Returns
+        -------
+            None
+        """
+        self._deadline_id = None
+        if self._started is not None:
+            self._fall_back((time.perf_counter() - self._started) * 1000)
+
+    def _fall_back(self, elapsed: float) -> None:
+        """
+        Turns live mode off and notifies `fallback_callback`.
+
+        Parameters
+        ----------
+        elapsed : float
+            Milliseconds the analysis took so far.
+
+        Returns
+        -------
+            None
+        """
+        self.disable()
+        self.fallback_callback(elapsed)
@@ -13,6 +13,12 @@ class MenuBar:
         Component responsible for file operations.
     run_callback : callable or None
         Callback function for the run button action.
+    cancel_callback : callable or None
+        Callback function for the cancel button action.
+    live_callback : callable or None
+        Callback function for the live mode switch, called with its state.
+    export_callback : callable or None
+        Callback function for the "Export JSON" menu option.
     status_bar : StatusBar or None
         Reference to the status bar component.
     """
@@ -32,7 +38,12 @@ class MenuBar:
         self.menu_frame = None
         self.file_menu = None
         self.run_button = None
+        self.cancel_button = None
+        self.live_switch = None
         self.run_callback = None
+        self.cancel_callback = None
+        self.live_callback = None
+        self.export_callback = None
         self.status_bar = None
 
     def set_run_callback(self, callback: 'Callable') -> None:
@@ -50,6 +61,52 @@ class MenuBar:
         """
         self.run_callback = callback
 
+    def set_cancel_callback(self, callback: 'Callable') -> None:
+        """
+        Sets the callback function for the cancel button.
+
+        Parameters
+        ----------
+        callback : Callable
+            Function to be called when the cancel button is pressed.
+
+        Returns
+        -------
+            None
+        """
+        self.cancel_callback = callback
+
+    def set_live_callback(self, callback: 'Callable') -> None:
+        """
+        Sets the callback function for the live mode switch.
+
+        Parameters
+        ----------
+        callback : Callable
+            Function called with True when live mode is turned on and
+            False when it is turned off.
+
+        Returns
+        -------
+            None
+        """
+        self.live_callback = callback
+
+    def set_export_callback(self, callback: 'Callable') -> None:
+        """
+        Sets the callback function for the "Export JSON" menu option.
+
+        Parameters
+        ----------
+        callback : Callable
+            Function to be called when the option is selected.
+
+        Returns
+        -------
+            None
+        """
+        self.export_callback = callback
+
     def set_status_bar(self, status_bar: 'StatusBar') -> None:
         """
         Sets the reference to the status bar component.
@@ -67,7 +124,8 @@ class MenuBar:
 
     def create_menu_bar(self) -> None:
         """
-        Creates and configures the menu bar with file options and run button.
+        Creates and configures the menu bar with file options, run and
+        cancel buttons and the live mode switch.
 
         Returns
         -------
@@ -77,7 +135,7 @@ class MenuBar:
         self.menu_frame.pack(fill="x", padx=10, pady=(10, 0))
         self.file_menu = ctk.CTkOptionMenu(
             self.menu_frame,
-            values=["New", "Open", "Save", "Exit"],
+            values=["New", "Open", "Save", "Export JSON", "Exit"],
             command=self.file_menu_callback,
             width=110,
             height=30,
@@ -95,6 +153,39 @@ class MenuBar:
             command=self.run_button_callback
         )
         self.run_button.pack(side="left", padx=10, pady=2)
+        self.cancel_button = ctk.CTkButton(
+            self.menu_frame,
+            text="Cancel",
+            width=100,
+            height=30,
+            state="disabled",
+            command=self.cancel_button_callback
+        )
+        self.cancel_button.pack(side="left", padx=10, pady=2)
+        self.live_switch = ctk.CTkSwitch(
+            self.menu_frame,
+            text="Live",
+            command=self.live_switch_callback
+        )
+        self.live_switch.pack(side="left", padx=10, pady=2)
+
+    def set_running(self, running: bool) -> None:
+        """
+        Enables the cancel button while an analysis runs and disables it
+        otherwise. The run button stays enabled: a new run replaces the
+        one in flight.
+
+        Parameters
+        ----------
+        running : bool
+            Whether an analysis is in flight.
+
+        Returns
+        -------
+            None
+        """
+        if self.cancel_button:
+            self.cancel_button.configure(state="normal" if running else "disabled")
 
     def customize_dropdown(self) -> None:
         """
@@ -133,7 +224,8 @@ class MenuBar:
         Parameters
         ----------
         choice : str
-            The selected menu option ("New", "Open", "Save", or "Exit").
+            The selected menu option ("New", "Open", "Save", "Export JSON"
+            or "Exit").
 
         Returns
         -------
@@ -146,6 +238,9 @@ class MenuBar:
             self.file_handler.open_file()
         elif choice == "Save":
             self.file_handler.save_file()
+        elif choice == "Export JSON":
+            if self.export_callback:
+                self.export_callback()
         elif choice == "Exit":
             self.exit_app()
 
@@ -160,6 +255,48 @@ class MenuBar:
         if self.run_callback:
             self.run_callback()
 
+    def set_live(self, enabled: bool) -> None:
+        """
+        Shows the live mode switch on or off without calling its callback,
+        e.g. when live mode turns itself off.
+
+        Parameters
+        ----------
+        enabled : bool
+            Whether live mode is on.
+
+        Returns
+        -------
+            None
+        """
+        if self.live_switch:
+            if enabled:
+                self.live_switch.select()
+            else:
+                self.live_switch.deselect()
+
+    def live_switch_callback(self) -> None:
+        """
+        Executes the live callback function when the switch is toggled.
+
+        Returns
+        -------
+            None
+        """
+        if self.live_callback:
+            self.live_callback(bool(self.live_switch.get()))
+
+    def cancel_button_callback(self) -> None:
+        """
+        Executes the cancel callback function when the cancel button is pressed.
+
+        Returns
+        -------
+            None
+        """
+        if self.cancel_callback:
+            self.cancel_callback()
+
     def exit_app(self, forced: bool = False) -> None:
         """
         Handles application exit with optional forced closure.
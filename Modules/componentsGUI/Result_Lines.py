@@ -0,0 +1,206 @@
+from bisect import bisect_right
+from typing import Any, Dict, List, Sequence
+
+# Tuple nodes whose statement list is shown one statement per line.
+_BLOCK_KINDS = ('program', 'block')
+# Statements that may hold blocks; their other fields stay on one line.
+_COMPOUND_KINDS = frozenset(('func_def', 'if_stmt', 'else', 'else_if', 'for_stmt'))
+_NESTED_KINDS = _COMPOUND_KINDS.union(_BLOCK_KINDS)
+# Marks a line break in the pieces built by `ast_lines`; the value is the
+# change of indentation level.
+_BREAK = object()
+
+class _TokenLines:
+    """
+    Sequence of the text of each token, rendered when it is read.
+    """
+    __slots__ = ('tokens',)
+
+    def __init__(self, tokens: Sequence[Any]) -> None:
+        """
+        Initializes the sequence.
+
+        Parameters
+        ----------
+        tokens : list or TokenBuffer
+            Tokens to show.
+        """
+        self.tokens = tokens
+
+    def __len__(self) -> int:
+        return len(self.tokens)
+
+    def __getitem__(self, index: int) -> str:
+        return str(self.tokens[index])
+
+def ast_lines(ast: Any, indent: str = '    ') -> List[str]:
+    """
+    Renders a tuple AST as lines, with one statement per line in each
+    program or block, indented by nesting level. Other ASTs are rendered
+    with `str` on a single line.
+
+    Parameters
+    ----------
+    ast : any
+        AST returned by `LexerCore.process`.
+    indent : str, optional
+        Text added per nesting level, by default four spaces.
+
+    Returns
+    -------
+    list of str
+        Lines of the AST.
+    """
+    if not (isinstance(ast, tuple) and ast and ast[0] in _BLOCK_KINDS):
+        return [str(ast)]
+    lines = []
+    current = []
+    level = 0
+    # Nodes to render and text pieces, in reverse order; blocks are
+    # expanded in place, so deep trees don't use the call stack.
+    stack = [ast]
+    while stack:
+        item = stack.pop()
+        if item.__class__ is str:
+            current.append(item)
+            continue
+        if item.__class__ is tuple and len(item) == 2 and item[0] is _BREAK:
+            lines.append(''.join(current))
+            level += item[1]
+            current = [indent * level]
+            continue
+        if item.__class__ is not tuple or not item or not isinstance(item[0], str):
+            current.append(repr(item))
+            continue
+        kind = item[0]
+        if kind in _BLOCK_KINDS and len(item) == 2 and item[1]:
+            pieces = [f"({kind!r}, [", (_BREAK, 1)]
+            for position, stmt in enumerate(item[1]):
+                if position:
+                    pieces.append((_BREAK, 0))
+                pieces.append(stmt)
+                pieces.append(',')
+            pieces.extend(((_BREAK, -1), '])'))
+        elif kind in _COMPOUND_KINDS:
+            pieces = ['(', repr(kind)]
+            for field in item[1:]:
+                pieces.append(', ')
+                if field.__class__ is tuple and field and field[0] in _NESTED_KINDS:
+                    pieces.append(field)
+                else:
+                    pieces.append(repr(field))
+            pieces.append(')')
+        else:
+            current.append(repr(item))
+            continue
+        stack.extend(reversed(pieces))
+    lines.append(''.join(current))
+    return lines
+
+class ResultLines:
+    """
+    Lines of the output shown for an analysis result.
+
+    Behaves as a read-only sequence of strings, so a view can fetch only
+    the lines it shows: token lines are rendered when they are read, and
+    the AST is split into one line per statement. Building it costs time
+    proportional to the number of statements, not to the number of
+    tokens.
+
+    Attributes
+    ----------
+    sections : list
+        Sequences of lines (lists of str or `_TokenLines`), in order.
+    """
+    def __init__(self, result: Dict[str, Any]) -> None:
+        """
+        Initializes the lines of a result.
+
+        Parameters
+        ----------
+        result : dict
+            Result returned by `LexerCore.process`.
+        """
+        sections = [["", "--- TOKENS ---"], _TokenLines(result["tokens"])]
+        if result["lexer_errors"]:
+            sections.append(["", "--- LEXER ERRORS ---"])
+            sections.append([str(err) for err in result["lexer_errors"]])
+        else:
+            sections.append(["", "No lexer errors."])
+        sections.append(["", "--- AST ---"])
+        sections.append(ast_lines(result["ast"]))
+        if result["parser_errors"]:
+            sections.append(["", "--- PARSER ERRORS ---"])
+            sections.append([str(err) for err in result["parser_errors"]])
+        else:
+            sections.append(["", "No parser errors."])
+        self.sections = sections
+        self._starts = []
+        total = 0
+        for section in sections:
+            self._starts.append(total)
+            total += len(section)
+        self._length = total
+
+    def __len__(self) -> int:
+        """
+        Returns the number of lines.
+
+        Returns
+        -------
+        int
+            Number of lines.
+        """
+        return self._length
+
+    def __getitem__(self, index: int) -> str:
+        """
+        Returns one line.
+
+        Parameters
+        ----------
+        index : int
+            Position of the line, negative values count from the end.
+
+        Returns
+        -------
+        str
+            The line, without newline.
+        """
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("line index out of range")
+        section = bisect_right(self._starts, index) - 1
+        return self.sections[section][index - self._starts[section]]
+
+    def window(self, start: int, stop: int) -> List[str]:
+        """
+        Returns the lines from `start` up to `stop`, excluded.
+
+        Parameters
+        ----------
+        start : int
+            Position of the first line.
+        stop : int
+            Position after the last line.
+
+        Returns
+        -------
+        list of str
+            The lines in the range, clipped to the available lines.
+        """
+        start = max(start, 0)
+        stop = min(stop, self._length)
+        lines = []
+        if start >= stop:
+            return lines
+        section = bisect_right(self._starts, start) - 1
+        while start < stop:
+            lines_in = self.sections[section]
+            offset = start - self._starts[section]
+            count = min(len(lines_in) - offset, stop - start)
+            lines.extend(lines_in[offset + i] for i in range(count))
+            start += count
+            section += 1
+        return lines
@@ -217,3 +217,25 @@ class StatusBar:
         """
         self.set_text(f"Warning: {message}")
         self._clear_after_delay(4000)
+
+    def show_progress(self, message: str, fraction: float, width: int = 20) -> None:
+        """
+        Displays a message with a progress bar, e.g. while an analysis runs.
+
+        Parameters
+        ----------
+        message : str
+            The message to display before the bar.
+        fraction : float
+            Fraction of the work done, from 0 to 1.
+        width : int, optional
+            Number of characters of the bar, by default 20.
+
+        Returns
+        -------
+            None
+        """
+        fraction = min(max(fraction, 0.0), 1.0)
+        filled = round(fraction * width)
+        bar = "█" * filled + "░" * (width - filled)
+        self.set_text(f"{message} {bar} {fraction:.0%}")
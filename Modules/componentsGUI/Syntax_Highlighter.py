@@ -0,0 +1,307 @@
+from typing import Any
+
+from Modules.componentsLEXER.Core_Tokens import RESERVED, SYMBOLS
+from Modules.componentsLEXER.Incremental_Lexer import IncrementalLexer
+from Modules.componentsGUI.View_Watcher import ViewWatcher
+from Modules.Lexer_Live import LiveSession
+
+# Text tags used for each kind of token, with their look.
+TAG_STYLES = {
+    'syntax_keyword': {'foreground': '#569cd6'},
+    'syntax_type': {'foreground': '#4ec9b0'},
+    'syntax_constant': {'foreground': '#b5cea8'},
+    'syntax_string': {'foreground': '#ce9178'},
+    'syntax_operator': {'foreground': '#d4d4d4'},
+}
+_TYPES = ('INT', 'BOOL')
+_CONSTANTS = ('TRUE', 'FALSE', 'NUMBER')
+_TOKEN_TAGS = dict.fromkeys(RESERVED.values(), 'syntax_keyword')
+_TOKEN_TAGS.update(dict.fromkeys(_TYPES, 'syntax_type'))
+_TOKEN_TAGS.update(dict.fromkeys(_CONSTANTS, 'syntax_constant'))
+_TOKEN_TAGS.update(dict.fromkeys(('STRING', 'RAW_STRING'), 'syntax_string'))
+_TOKEN_TAGS.update(dict.fromkeys(SYMBOLS, 'syntax_operator'))
+
+class SyntaxHighlighter:
+    """
+    Colors the tokens of a text widget, using the language lexer.
+
+    Only the lines in view, plus `margin` lines above and below, carry
+    tags: when the view moves, the lines that enter it are tagged and
+    those that leave it are cleared, so the work per scroll depends on
+    the height of the view, not on the size of the text.
+
+    The text is lexed by an `IncrementalLexer`, which re-lexes only the
+    lines touched by an edit. It is also lexed lazily, `chunk_size`
+    characters at a time, only as far as the view has reached: opening
+    a large file costs no more than lexing its first page. Replacing more
+    than `chunk_size` characters at once (e.g. opening a file) drops the
+    lexing from that point on, to be done again as the view needs it; any
+    other change drops the lexing more than two chunks after it, so that
+    a keystroke never re-lexes the whole text.
+
+    Attributes
+    ----------
+    root : ctk.CTk
+        The main application window, used to schedule the updates.
+    text_area : ctk.CTkTextbox
+        The text widget to color.
+    margin : int
+        Lines above and below the view that are tagged too, so that short
+        scrolls show colored text right away.
+    chunk_size : int
+        Approximate number of characters lexed at a time.
+    watcher : ViewWatcher
+        Triggers the updates when the view may have moved.
+    lexer : IncrementalLexer
+        Tokens of the lexed part of the text.
+    text : str
+        Text of the widget at the last update.
+    """
+    def __init__(self, root: Any, text_area: Any, margin: int = 40,
+                 chunk_size: int = 16384, poll_interval: int = 250) -> None:
+        """
+        Initializes the highlighter and configures the tags of the widget.
+
+        Parameters
+        ----------
+        root : ctk.CTk
+            The main application window.
+        text_area : ctk.CTkTextbox
+            The text widget to color.
+        margin : int, optional
+            Lines tagged above and below the view, by default 40.
+        chunk_size : int, optional
+            Characters lexed at a time, by default 16384.
+        poll_interval : int, optional
+            Milliseconds between two checks of the view, by default 250.
+        """
+        self.root = root
+        self.text_area = text_area
+        self.margin = margin
+        self.chunk_size = chunk_size
+        self.lexer = IncrementalLexer()
+        self.text = ''
+        self._lexed = 0
+        # Lines [first, stop) whose tags match the lexer.
+        self._tagged = (1, 1)
+        # Whether the text changed since the lines were tagged, see `_sync`.
+        self._stale = False
+        self._dirty = False
+        for tag, options in TAG_STYLES.items():
+            text_area.tag_config(tag, **options)
+        self.watcher = ViewWatcher(root, text_area, self._refresh, poll_interval)
+
+    def text_changed(self) -> None:
+        """
+        Updates the tags after a change of the text.
+
+        Returns
+        -------
+            None
+        """
+        self._dirty = True
+        self.watcher.schedule()
+
+    def _refresh(self) -> None:
+        """
+        Brings the lexer up to date with the text, if it changed, and the
+        tags up to date with the view.
+
+        Returns
+        -------
+            None
+        """
+        if self._dirty:
+            self._dirty = False
+            self._sync(self.text_area.get("1.0", "end-1c"))
+        self._update_view()
+
+    def _sync(self, text: str) -> None:
+        """
+        Applies the change from `self.text` to `text` to the lexer and to
+        the range of tagged lines, and marks them to be tagged again.
+
+        Parameters
+        ----------
+        text : str
+            Current text of the widget.
+
+        Returns
+        -------
+            None
+        """
+        old = self.text
+        if text == old:
+            return
+        start, end, replacement = LiveSession.diff(old, text)
+        start_line, start_col = LiveSession.line_col(old, start)
+        end_line, end_col = LiveSession.line_col(old, end)
+        delta = replacement.count('\n') - (end_line - start_line)
+        # Tags move with the text in the widget, but from where the text was
+        # really inserted, which the diff can't tell when the new text
+        # repeats the text around it (e.g. pasting a line before the same
+        # line). So the tagged range is widened by the lines inserted or
+        # removed, to be cleared as it leaves the view, and every tagged
+        # line is tagged again; they are only the view and its margins.
+        first, stop = self._tagged
+        if first > end_line:
+            first, stop = first + delta, stop + delta
+        elif stop > start_line:
+            first = min(first, start_line)
+            stop = stop + delta if stop > end_line + 1 else end_line + delta + 1
+        self._tagged = (max(first - abs(delta), 1), stop + abs(delta))
+        self._stale = True
+        self.text = text
+        lexed = self._lexed
+        if start >= lexed and lexed < len(old):
+            # The change is past the lexed part: it will be lexed when needed.
+            return
+        if end > lexed or len(replacement) > self.chunk_size:
+            self._truncate(old, start)
+            return
+        limit = old.find('\n', end + 2 * self.chunk_size) + 1
+        if 0 < limit < lexed:
+            # A change of state (e.g. an opening backquote) would re-lex the
+            # rest of the text: stop well after the change instead.
+            self._truncate(old, limit)
+        self.lexer.edit(start_line, start_col, end_line, end_col, replacement)
+        self._lexed += len(replacement) - (end - start)
+
+    def _truncate(self, old: str, pos: int) -> None:
+        """
+        Drops the lexing of the text from a position on.
+
+        Parameters
+        ----------
+        old : str
+            Text the lexer holds a prefix of.
+        pos : int
+            Position in `old` where the lexed part must end; it must be
+            lexed.
+
+        Returns
+        -------
+            None
+        """
+        line, col = LiveSession.line_col(old, pos)
+        last = self.lexer.line_count()
+        self.lexer.edit(line, col, last, len(self.lexer.lines[-1].text), '')
+        self._lexed = pos
+
+    def _lex_until(self, line: int) -> None:
+        """
+        Lexes more of the text, a chunk at a time, until a line is lexed or
+        the text ends.
+
+        Parameters
+        ----------
+        line : int
+            Line that must be lexed, starting at 1.
+
+        Returns
+        -------
+            None
+        """
+        text = self.text
+        lexer = self.lexer
+        while self._lexed < len(text) and lexer.line_count() <= line:
+            end = text.find('\n', self._lexed + self.chunk_size)
+            end = len(text) if end < 0 else end + 1
+            last = lexer.line_count()
+            col = len(lexer.lines[-1].text)
+            lexer.edit(last, col, last, col, text[self._lexed:end])
+            self._lexed = end
+
+    def _lexed_lines(self) -> int:
+        """
+        Returns the number of lines whose tokens are known.
+
+        Returns
+        -------
+        int
+            Number of lines; the last lexed line is left out while the text
+            is not lexed to its end, since it may continue.
+        """
+        count = self.lexer.line_count()
+        return count if self._lexed == len(self.text) else count - 1
+
+    def _update_view(self) -> None:
+        """
+        Tags the lines in view that aren't tagged yet, or all of them after
+        a change of the text, and clears the lines that left the view.
+
+        Returns
+        -------
+            None
+        """
+        top, bottom = self.watcher.visible_lines()
+        first = max(top - self.margin, 1)
+        self._lex_until(bottom + self.margin)
+        stop = max(min(bottom + self.margin, self._lexed_lines()) + 1, first)
+        tagged_first, tagged_stop = self._tagged
+        keep_first, keep_stop = max(tagged_first, first), min(tagged_stop, stop)
+        if keep_first >= keep_stop:
+            self._clear_lines(tagged_first, tagged_stop)
+            self._tag_lines(first, stop)
+        else:
+            self._clear_lines(tagged_first, first)
+            self._clear_lines(stop, tagged_stop)
+            self._tag_lines(first, keep_first)
+            self._tag_lines(keep_stop, stop)
+            if self._stale:
+                self._tag_lines(keep_first, keep_stop)
+        self._stale = False
+        self._tagged = (first, stop)
+
+    def _clear_lines(self, first: int, stop: int) -> None:
+        """
+        Removes the token tags from a range of lines.
+
+        Parameters
+        ----------
+        first : int
+            First line of the range, starting at 1.
+        stop : int
+            Line after the range.
+
+        Returns
+        -------
+            None
+        """
+        if first < stop:
+            for tag in TAG_STYLES:
+                self.text_area.tag_remove(tag, f"{first}.0", f"{stop}.0")
+
+    def _tag_lines(self, first: int, stop: int) -> None:
+        """
+        Tags the tokens of a range of lines, replacing their tags.
+
+        Every tag is kept within its line, so clearing a range of lines
+        never leaves parts of a token behind. A raw string spanning several
+        lines is tagged line by line: a line that ends inside a raw string
+        is tagged from its last backquote (or its start) to its end.
+
+        Parameters
+        ----------
+        first : int
+            First line of the range, starting at 1.
+        stop : int
+            Line after the range; it must be lexed.
+
+        Returns
+        -------
+            None
+        """
+        if first >= stop:
+            return
+        self._clear_lines(first, stop)
+        tag_add = self.text_area.tag_add
+        lines = self.lexer.lines
+        for line in range(first, stop):
+            for tok_type, begin, end in self.lexer.line_spans(line):
+                tag = _TOKEN_TAGS.get(tok_type)
+                if tag is not None:
+                    tag_add(tag, f"{line}.{begin}", f"{line}.{end}")
+            if line < len(lines) and lines[line].state == 'raw':
+                begin = max(lines[line - 1].text.rfind('`'), 0)
+                tag_add('syntax_string', f"{line}.{begin}", f"{line}.end")
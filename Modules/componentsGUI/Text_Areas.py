@@ -1,11 +1,17 @@
+from typing import Iterable, Sequence
+
 import customtkinter as ctk
+from Modules.componentsGUI.Error_List import ErrorList
+from Modules.componentsGUI.Error_Markers import ErrorIndex, ErrorMarkers
+from Modules.componentsGUI.Syntax_Highlighter import SyntaxHighlighter
 
 class TextAreas:
     """
     Handles the creation and management of text input and output areas.
 
-    This class manages the main text editor area for code input and
-    the output area for displaying results, tokens, and errors.
+    This class manages the main text editor area for code input,
+    the output area for displaying results, tokens, and errors, and the
+    list of the errors of the last analysis.
 
     Attributes
     ----------
@@ -15,8 +21,22 @@ class TextAreas:
         The text input area for code editing.
     output_area : ctk.CTkTextbox or None
         The text output area for displaying results.
+    highlighter : SyntaxHighlighter or None
+        Colors the tokens shown in the input area.
+    error_markers : ErrorMarkers or None
+        Marks the errors of the last analysis in the input area.
+    error_list : ErrorList or None
+        Clickable list of the errors of the last analysis, shown below the
+        output area while there are errors.
+    page_size : int
+        Maximum number of output lines held by the output area; longer
+        outputs are shown one page at a time.
+    output_lines : Sequence[str] or None
+        Lines of the paged output, None when the output is not paged.
+    page_start : int
+        Position in `output_lines` of the first line shown.
     """
-    def __init__(self, root: ctk.CTk) -> None:
+    def __init__(self, root: ctk.CTk, page_size: int = 2000) -> None:
         """
         Initializes the TextAreas with reference to the root window.
 
@@ -24,11 +44,24 @@ class TextAreas:
         ----------
         root : ctk.CTk
             The main application window.
+        page_size : int, optional
+            Maximum number of output lines shown at a time, by default 2000.
         """
         self.root = root
         self.text_area = None
         self.output_area = None
+        self.highlighter = None
+        self.error_markers = None
+        self.error_list = None
         self.editor_frame = None
+        self._text_changed_callbacks = []
+        self.page_size = page_size
+        self.output_lines = None
+        self.page_start = 0
+        self.page_frame = None
+        self.page_label = None
+        self.prev_button = None
+        self.next_button = None
 
     def create_areas(self) -> None:
         """
@@ -62,6 +95,17 @@ class TextAreas:
             text_color=("black", "white")
         )
         self.output_area.grid(row=1, column=0, sticky="nsew", padx=5, pady=(0, 5))
+        self.highlighter = SyntaxHighlighter(self.root, self.text_area)
+        self.bind_text_changed(self.highlighter.text_changed)
+        self.error_markers = ErrorMarkers(self.root, self.text_area)
+        self.bind_text_changed(self.error_markers.text_changed)
+        # Error markers must win over the token colors.
+        self.text_area.tag_raise("error_marker")
+        self._create_pager()
+        self.error_list = ErrorList(self.root, self.editor_frame, self.jump_to)
+        self.error_list.create_list()
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.output_area.bind(sequence, self._scroll_pages, add="+")
         #self.output_area.bind("<Enter>", lambda e: self._bind_mousewheel(self.output_area))
         #self.output_area.bind("<Leave>", lambda e: self._unbind_mousewheel(self.output_area))
 
@@ -76,6 +120,115 @@ class TextAreas:
         """
         return self.text_area.get("1.0", ctk.END).strip()
 
+    def get_source(self) -> str:
+        """
+        Retrieves the text of the input area exactly as it is shown, so
+        that lines and columns of the analysis match the editor.
+
+        Returns
+        -------
+        str
+            The text content of the input area, without the newline Tk
+            keeps at the end.
+        """
+        return self.text_area.get("1.0", "end-1c")
+
+    def bind_text_changed(self, callback: 'Callable') -> None:
+        """
+        Calls a function every time the content of the input area changes,
+        whether it is typed, pasted or set by a file operation.
+
+        Parameters
+        ----------
+        callback : Callable
+            Function called with no arguments.
+
+        Returns
+        -------
+            None
+        """
+        if not self._text_changed_callbacks:
+            self.text_area.bind("<<Modified>>", self._text_modified, add="+")
+        self._text_changed_callbacks.append(callback)
+
+    def _text_modified(self, event: 'tk.Event') -> None:
+        """
+        Calls the functions given to `bind_text_changed`.
+
+        Parameters
+        ----------
+        event : tk.Event
+            The <<Modified>> event.
+
+        Returns
+        -------
+            None
+        """
+        # Tk only reports the first change until the flag is reset, and
+        # resetting it reports again: skip that second event.
+        if self.text_area.edit_modified():
+            self.text_area.edit_modified(False)
+            for callback in self._text_changed_callbacks:
+                callback()
+
+    def mark_errors(self, errors: Iterable) -> None:
+        """
+        Shows the errors of the text in the input area, replacing the
+        previous ones: each is underlined in the input area and listed
+        below the output area. Markers and rows are only materialized for
+        the part of the text and of the list in view.
+
+        Parameters
+        ----------
+        errors : Iterable
+            LexerError and ParseError objects of the text in the input
+            area, with 1-based columns.
+
+        Returns
+        -------
+            None
+        """
+        index = ErrorIndex(errors)
+        self.error_markers.set_errors(index)
+        self.error_list.show(index)
+        if len(index):
+            self.error_list.list_area.grid(row=3, column=0, sticky="nsew", padx=5, pady=(0, 5))
+        else:
+            self.error_list.list_area.grid_remove()
+
+    def clear_error_markers(self) -> None:
+        """
+        Removes every error marker from the input area and empties the
+        error list.
+
+        Returns
+        -------
+            None
+        """
+        self.mark_errors(())
+
+    def jump_to(self, lineno: int, col: int) -> None:
+        """
+        Moves the cursor of the input area to a position and scrolls to it.
+
+        Parameters
+        ----------
+        lineno : int
+            Line of the position, starting at 1.
+        col : int
+            Column of the position, starting at 1.
+
+        Returns
+        -------
+            None
+        """
+        index = f"{lineno}.{max(col - 1, 0)}"
+        self.text_area.mark_set("insert", index)
+        self.text_area.see(index)
+        self.text_area.focus_set()
+        self.highlighter.watcher.schedule()
+        self.error_markers.watcher.schedule()
+
     def set_text(self, text: str) -> None:
         """
         Sets the text content of the input area.
@@ -92,6 +245,27 @@ class TextAreas:
         self.text_area.delete("1.0", ctk.END)
         self.text_area.insert("1.0", text)
 
+    def _create_pager(self) -> None:
+        """
+        Creates the controls used to move through a paged output. They are
+        only shown while the output is paged.
+
+        Returns
+        -------
+            None
+        """
+        self.page_frame = ctk.CTkFrame(self.editor_frame, fg_color="transparent")
+        self.prev_button = ctk.CTkButton(
+            self.page_frame, text="◀ Prev", width=80, height=24, command=self.previous_page
+        )
+        self.prev_button.pack(side="left", padx=5)
+        self.page_label = ctk.CTkLabel(self.page_frame, text="")
+        self.page_label.pack(side="left", expand=True)
+        self.next_button = ctk.CTkButton(
+            self.page_frame, text="Next ▶", width=80, height=24, command=self.next_page
+        )
+        self.next_button.pack(side="right", padx=5)
+
     def append_to_output(self, text: str) -> None:
         """
         Appends text to the output area and scrolls to the end.
@@ -110,6 +284,161 @@ class TextAreas:
         self.output_area.configure(state="disabled")
         self.output_area.see("end")
 
+    def set_output(self, text: str) -> None:
+        """
+        Replaces the content of the output area in a single insert.
+
+        Parameters
+        ----------
+        text : str
+            The new content of the output area.
+
+        Returns
+        -------
+            None
+        """
+        self.output_area.configure(state="normal")
+        self.output_area.delete("1.0", "end")
+        self.output_area.insert("1.0", text)
+        self.output_area.configure(state="disabled")
+
+    def show_output(self, lines: Sequence[str]) -> None:
+        """
+        Replaces the output with the given lines.
+
+        Outputs of up to `page_size` lines are inserted at once and the
+        view scrolls to the end. Longer outputs are paged: only the lines
+        of the current page are inserted, and the page changes with the
+        pager buttons or by scrolling past the top or the bottom of the
+        page. Lines are read from `lines` only when their page is shown,
+        so the sequence may render them on demand (see `ResultLines`).
+
+        Parameters
+        ----------
+        lines : Sequence[str]
+            The lines to show, without newlines.
+
+        Returns
+        -------
+            None
+        """
+        self.output_lines = lines
+        if len(lines) <= self.page_size:
+            text = "\n".join(self._lines_between(0, len(lines)))
+            self._hide_pager()
+            self.set_output(text + "\n")
+            self.output_area.see("end")
+            return
+        self.page_frame.grid(row=2, column=0, sticky="ew", padx=5, pady=(0, 5))
+        self.show_page(0)
+
+    def show_page(self, start: int, at_end: bool = False) -> None:
+        """
+        Shows the page of the paged output that starts at a given line.
+
+        Parameters
+        ----------
+        start : int
+            Position of the first line of the page; it is clipped to the
+            available lines.
+        at_end : bool, optional
+            If True, the view scrolls to the end of the page instead of
+            its beginning, by default False.
+
+        Returns
+        -------
+            None
+        """
+        total = len(self.output_lines)
+        start = min(max(start, 0), max(total - self.page_size, 0))
+        stop = min(start + self.page_size, total)
+        self.page_start = start
+        self.set_output("\n".join(self._lines_between(start, stop)))
+        self.output_area.yview_moveto(1.0 if at_end else 0.0)
+        self.page_label.configure(text=f"Lines {start + 1}-{stop} of {total}")
+        self.prev_button.configure(state="normal" if start > 0 else "disabled")
+        self.next_button.configure(state="normal" if stop < total else "disabled")
+
+    def _lines_between(self, start: int, stop: int) -> list:
+        """
+        Reads a range of lines of `output_lines`.
+
+        Parameters
+        ----------
+        start : int
+            Position of the first line.
+        stop : int
+            Position after the last line.
+
+        Returns
+        -------
+        list of str
+            The lines, read with `window` when the sequence has it.
+        """
+        window = getattr(self.output_lines, "window", None)
+        if window is not None:
+            return window(start, stop)
+        return [self.output_lines[index] for index in range(start, stop)]
+
+    def next_page(self) -> None:
+        """
+        Shows the next page of the paged output, if any.
+
+        Returns
+        -------
+            None
+        """
+        if self.output_lines is not None and self.page_start + self.page_size < len(self.output_lines):
+            self.show_page(self.page_start + self.page_size)
+
+    def previous_page(self) -> None:
+        """
+        Shows the previous page of the paged output, if any, scrolled to
+        its end.
+
+        Returns
+        -------
+            None
+        """
+        if self.output_lines is not None and self.page_start > 0:
+            self.show_page(self.page_start - self.page_size, at_end=True)
+
+    def _scroll_pages(self, event: 'tk.Event') -> None:
+        """
+        Changes page when the mouse wheel scrolls past the top or the
+        bottom of the current page.
+
+        Parameters
+        ----------
+        event : tk.Event
+            The mouse wheel event.
+
+        Returns
+        -------
+            None
+        """
+        if self.output_lines is None:
+            return
+        down = event.num == 5 or getattr(event, "delta", 0) < 0
+        first, last = self.output_area.yview()
+        if down and last >= 1.0:
+            self.next_page()
+        elif not down and first <= 0.0:
+            self.previous_page()
+
+    def _hide_pager(self) -> None:
+        """
+        Leaves paged mode and hides the pager controls.
+
+        Returns
+        -------
+            None
+        """
+        self.output_lines = None
+        self.page_start = 0
+        if self.page_frame:
+            self.page_frame.grid_remove()
+
     def clear_output(self) -> None:
         """
         Clears all content from the output area.
@@ -119,6 +448,7 @@ class TextAreas:
             None
         """
         if self.output_area:
+            self._hide_pager()
             self.output_area.configure(state="normal")
             self.output_area.delete("1.0", "end")
             self.output_area.configure(state="disabled")
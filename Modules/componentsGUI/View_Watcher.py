@@ -0,0 +1,118 @@
+from typing import Any, Callable, Tuple
+
+# Events after which the visible lines may have changed.
+_VIEW_EVENTS = ("<MouseWheel>", "<Button-4>", "<Button-5>", "<KeyRelease>",
+                "<ButtonRelease-1>", "<Configure>")
+
+class ViewWatcher:
+    """
+    Calls a function when the lines shown by a text widget may have
+    changed, so that views can fill in only what is visible.
+
+    Scroll, key, click and resize events of the widget request an update,
+    which runs once Tk is idle, i.e. after the widget has applied the
+    event; several requests before then cause a single call. The view is
+    also checked every `poll_interval` milliseconds, which catches the
+    scrolls made without an event of the widget (e.g. by dragging the
+    scrollbar or by `see`).
+
+    Attributes
+    ----------
+    root : ctk.CTk
+        The main application window, used to schedule the updates.
+    widget : ctk.CTkTextbox
+        The text widget to watch.
+    callback : Callable
+        Called with no arguments on each update.
+    poll_interval : int
+        Milliseconds between two checks of the view.
+    """
+    def __init__(self, root: Any, widget: Any, callback: Callable,
+                 poll_interval: int = 250) -> None:
+        """
+        Initializes the watcher and binds the events of the widget.
+
+        Parameters
+        ----------
+        root : ctk.CTk
+            The main application window.
+        widget : ctk.CTkTextbox
+            The text widget to watch.
+        callback : Callable
+            Function called on each update.
+        poll_interval : int, optional
+            Milliseconds between two checks of the view, by default 250.
+        """
+        self.root = root
+        self.widget = widget
+        self.callback = callback
+        self.poll_interval = poll_interval
+        self._view = None
+        self._update_id = None
+        for sequence in _VIEW_EVENTS:
+            widget.bind(sequence, self.schedule, add="+")
+        self._poll_id = root.after(poll_interval, self._poll)
+
+    def schedule(self, event: 'tk.Event' = None) -> None:
+        """
+        Requests an update once Tk is idle.
+
+        Parameters
+        ----------
+        event : tk.Event, optional
+            The event that may have moved the view, if any.
+
+        Returns
+        -------
+            None
+        """
+        if self._update_id is None:
+            self._update_id = self.root.after_idle(self._update)
+
+    def visible_lines(self) -> Tuple[int, int]:
+        """
+        Returns the first and last line in view, even if partly.
+
+        Returns
+        -------
+        tuple
+            Line numbers, starting at 1.
+        """
+        top = self.widget.index("@0,0")
+        bottom = self.widget.index(f"@0,{self.widget.winfo_height()}")
+        return int(top.split('.')[0]), int(bottom.split('.')[0])
+
+    def _view_key(self) -> Tuple[str, int]:
+        """
+        Returns what identifies the current view.
+
+        Returns
+        -------
+        tuple
+            Index of the first character in view and height of the widget.
+        """
+        return self.widget.index("@0,0"), self.widget.winfo_height()
+
+    def _poll(self) -> None:
+        """
+        Requests an update if the view moved since the last one.
+
+        Returns
+        -------
+            None
+        """
+        self._poll_id = self.root.after(self.poll_interval, self._poll)
+        if self._view_key() != self._view:
+            self.schedule()
+
+    def _update(self) -> None:
+        """
+        Records the current view and calls `callback`.
+
+        Returns
+        -------
+            None
+        """
+        self._update_id = None
+        self._view = self._view_key()
+        self.callback()
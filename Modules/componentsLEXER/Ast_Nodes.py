@@ -0,0 +1,444 @@
+from typing import Any, Iterator, Union
+
+class Node:
+    """
+    Base class of the typed AST nodes.
+
+    Each subclass stands for one kind of tuple built by `LanguageParser`;
+    its `__slots__` are the tuple fields after the tag, in the same order,
+    so `Node.from_tuple` and `to_tuple` convert between both shapes.
+    Indexing and `len` behave as on the tuple (index 0 is the tag), so code
+    written for the tuple AST keeps working on nodes.
+
+    Attributes
+    ----------
+    kind : str
+        Tag of the equivalent tuple node.
+    child_fields : tuple
+        Fields that may hold nodes, or lists of them, walked by visitors.
+    span : tuple or None
+        Start position, end position, start line and end line of the node
+        when parsed with spans, see `SpannedNode`.
+    """
+    __slots__ = ('span',)
+    kind = None
+    child_fields = ()
+
+    def __init__(self, *values: Any, span: tuple = None) -> None:
+        """
+        Initializes the node with its field values.
+
+        Parameters
+        ----------
+        *values : any
+            Field values, in the order of `__slots__`.
+        span : tuple or None, optional
+            Source span of the node, by default None.
+        """
+        for name, value in zip(self.__slots__, values):
+            setattr(self, name, value)
+        self.span = span
+
+    @staticmethod
+    def from_tuple(node: Any) -> Any:
+        """
+        Converts a tuple AST (or a part of it) into nodes.
+
+        Parameters
+        ----------
+        node : any
+            Tuple node, list of nodes or plain value.
+
+        Returns
+        -------
+        any
+            The same tree with every tagged tuple replaced by its node.
+        """
+        if isinstance(node, list):
+            return [Node.from_tuple(item) for item in node]
+        if not isinstance(node, tuple):
+            return node
+        node_class = NODE_CLASSES.get(node[0]) if node and isinstance(node[0], str) else None
+        if node_class is None:
+            # Pairs of a map literal.
+            return tuple(Node.from_tuple(item) for item in node)
+        return node_class(
+            *[Node.from_tuple(item) for item in node[1:]], span=getattr(node, 'span', None)
+        )
+
+    def to_tuple(self) -> tuple:
+        """
+        Returns the node and its descendants in the tuple shape built by
+        `LanguageParser.parse`.
+
+        Returns
+        -------
+        tuple
+            The equivalent tuple node.
+        """
+        return (self.kind,) + tuple(_to_tuple(getattr(self, name)) for name in self.__slots__)
+
+    def children(self) -> Iterator['Node']:
+        """
+        Yields the direct child nodes, in source order.
+
+        Returns
+        -------
+        Iterator[Node]
+            Child nodes; None values and plain values are skipped.
+        """
+        for name in self.child_fields:
+            value = getattr(self, name)
+            if isinstance(value, Node):
+                yield value
+            elif isinstance(value, list):
+                for item in value:
+                    if isinstance(item, tuple):
+                        # Pairs of a map literal: the key is a plain string.
+                        item = item[1]
+                    if isinstance(item, Node):
+                        yield item
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        """
+        Returns the field at the given tuple index; 0 is the tag. Slices
+        return tuples and out of range indices raise IndexError, as for
+        the equivalent tuple node.
+
+        Parameters
+        ----------
+        index : int or slice
+            Index in the equivalent tuple node.
+
+        Returns
+        -------
+        any
+            The tag or the field value, or a tuple of them for a slice.
+        """
+        if isinstance(index, slice):
+            return tuple(self)[index]
+        length = len(self)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError("node index out of range")
+        if index == 0:
+            return self.kind
+        return getattr(self, self.__slots__[index - 1])
+
+    def __len__(self) -> int:
+        """
+        Returns the length of the equivalent tuple node.
+
+        Returns
+        -------
+        int
+            Number of fields plus one for the tag.
+        """
+        return len(self.__slots__) + 1
+
+    def __eq__(self, other: Any) -> bool:
+        """
+        Compares two nodes by kind and fields; spans are ignored.
+
+        Parameters
+        ----------
+        other : any
+            Object to compare with.
+
+        Returns
+        -------
+        bool
+            True if both nodes have the same class and fields.
+        """
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        """
+        Returns a representation with the node class and its fields.
+
+        Returns
+        -------
+        str
+            E.g. `BinOp(op='+', left=Ident(name='x'), right=Number(value=1))`.
+        """
+        fields = ', '.join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{self.__class__.__name__}({fields})"
+
+def _to_tuple(value: Any) -> Any:
+    """
+    Converts a field value of a node into the tuple AST shape.
+
+    Parameters
+    ----------
+    value : any
+        Node, list, map pair or plain value.
+
+    Returns
+    -------
+    any
+        The converted value.
+    """
+    if isinstance(value, Node):
+        return value.to_tuple()
+    if isinstance(value, list):
+        return [_to_tuple(item) for item in value]
+    if isinstance(value, tuple):
+        return tuple(_to_tuple(item) for item in value)
+    return value
+
+class Program(Node):
+    """Whole program: `stmts` is the list of top-level statements."""
+    __slots__ = ('stmts',)
+    kind = 'program'
+    child_fields = ('stmts',)
+
+class Package(Node):
+    """`package name`."""
+    __slots__ = ('name',)
+    kind = 'package'
+
+class VarDecl(Node):
+    """`var name type = value;`."""
+    __slots__ = ('name', 'type', 'value')
+    kind = 'var_decl'
+    child_fields = ('value',)
+
+class ShortDecl(Node):
+    """`name := value;`, also used as the init of a `for`."""
+    __slots__ = ('name', 'value')
+    kind = 'short_decl'
+    child_fields = ('value',)
+
+class Return(Node):
+    """`return value;`."""
+    __slots__ = ('value',)
+    kind = 'return'
+    child_fields = ('value',)
+
+class IfStmt(Node):
+    """`if cond body orelse`, `orelse` being an Else, an ElseIf or None."""
+    __slots__ = ('cond', 'body', 'orelse')
+    kind = 'if_stmt'
+    child_fields = ('cond', 'body', 'orelse')
+
+class Else(Node):
+    """`else body`."""
+    __slots__ = ('body',)
+    kind = 'else'
+    child_fields = ('body',)
+
+class ElseIf(Node):
+    """`else if cond body orelse`."""
+    __slots__ = ('cond', 'body', 'orelse')
+    kind = 'else_if'
+    child_fields = ('cond', 'body', 'orelse')
+
+class ForStmt(Node):
+    """`for (init; cond; post) body`, `init` and `post` may be None."""
+    __slots__ = ('init', 'cond', 'post', 'body')
+    kind = 'for_stmt'
+    child_fields = ('init', 'cond', 'post', 'body')
+
+class Assign(Node):
+    """`name = value`, the post statement of a `for`."""
+    __slots__ = ('name', 'value')
+    kind = 'assign'
+    child_fields = ('value',)
+
+class PrintStmt(Node):
+    """`print(args);`."""
+    __slots__ = ('args',)
+    kind = 'print_stmt'
+    child_fields = ('args',)
+
+class ExprStmt(Node):
+    """`expr;`."""
+    __slots__ = ('expr',)
+    kind = 'expr_stmt'
+    child_fields = ('expr',)
+
+class FuncDef(Node):
+    """`func name() body`."""
+    __slots__ = ('name', 'body')
+    kind = 'func_def'
+    child_fields = ('body',)
+
+class ImportStmt(Node):
+    """`import "path";`."""
+    __slots__ = ('path',)
+    kind = 'import_stmt'
+
+class Block(Node):
+    """`{ stmts }`."""
+    __slots__ = ('stmts',)
+    kind = 'block'
+    child_fields = ('stmts',)
+
+class Map(Node):
+    """`{ "key": value, ... }`, `items` being a list of (key, value) pairs."""
+    __slots__ = ('items',)
+    kind = 'map'
+    child_fields = ('items',)
+
+class Index(Node):
+    """`value[index]`."""
+    __slots__ = ('value', 'index')
+    kind = 'index'
+    child_fields = ('value', 'index')
+
+class TypeAssertion(Node):
+    """`value.(type)`."""
+    __slots__ = ('value', 'type')
+    kind = 'type_assertion'
+    child_fields = ('value',)
+
+class DotAccess(Node):
+    """`value.attr`."""
+    __slots__ = ('value', 'attr')
+    kind = 'dot_access'
+    child_fields = ('value',)
+
+class BinOp(Node):
+    """`left op right`."""
+    __slots__ = ('op', 'left', 'right')
+    kind = 'binop'
+    child_fields = ('left', 'right')
+
+class UnOp(Node):
+    """`op operand`."""
+    __slots__ = ('op', 'operand')
+    kind = 'unop'
+    child_fields = ('operand',)
+
+class Number(Node):
+    """Integer literal."""
+    __slots__ = ('value',)
+    kind = 'number'
+
+class Ident(Node):
+    """Identifier."""
+    __slots__ = ('name',)
+    kind = 'ident'
+
+class Bool(Node):
+    """`true` or `false`."""
+    __slots__ = ('value',)
+    kind = 'bool'
+
+class String(Node):
+    """String literal, `value` being its unescaped content."""
+    __slots__ = ('value',)
+    kind = 'string'
+
+class RawString(Node):
+    """Raw string literal."""
+    __slots__ = ('value',)
+    kind = 'raw_string'
+
+class Tuple(Node):
+    """`(first, second)`."""
+    __slots__ = ('first', 'second')
+    kind = 'tuple'
+    child_fields = ('first', 'second')
+
+class ColonExpr(Node):
+    """`left : right`."""
+    __slots__ = ('left', 'right')
+    kind = 'colon_expr'
+    child_fields = ('left', 'right')
+
+class BrackExpr(Node):
+    """`[expr]`."""
+    __slots__ = ('expr',)
+    kind = 'brack_expr'
+    child_fields = ('expr',)
+
+# Node class of each tuple tag.
+NODE_CLASSES = {node_class.kind: node_class for node_class in Node.__subclasses__()}
+
+# Version of the shape of the AST, part of `LanguageParser.grammar_version`.
+# The grammar actions are fingerprinted by their code; bump it when the AST
+# changes without them (e.g. fields of the node classes).
+AST_FORMAT_VERSION = 1
+
+class NodeVisitor:
+    """
+    Base class for walking a typed AST.
+
+    Subclasses define `visit_<ClassName>` methods (e.g. `visit_BinOp`).
+    The method for each node class is looked up once per visitor class
+    and stored in a table indexed by node class, so dispatching a node is
+    a single dictionary lookup. Nodes without a method go to
+    `generic_visit`, which visits their children.
+    """
+    _dispatch = {}
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        """
+        Builds the dispatch table of a visitor class.
+
+        Parameters
+        ----------
+        **kwargs : any
+            Passed on to `object.__init_subclass__`.
+
+        Returns
+        -------
+            None
+        """
+        super().__init_subclass__(**kwargs)
+        cls._dispatch = {
+            node_class: getattr(cls, f"visit_{node_class.__name__}", cls.generic_visit)
+            for node_class in NODE_CLASSES.values()
+        }
+
+    def visit(self, node: Node) -> Any:
+        """
+        Visits a node with the method registered for its class.
+
+        Parameters
+        ----------
+        node : Node
+            Node to visit.
+
+        Returns
+        -------
+        any
+            Whatever the visit method returns.
+        """
+        return self._dispatch[node.__class__](self, node)
+
+    def generic_visit(self, node: Node) -> None:
+        """
+        Visits every child of a node.
+
+        Parameters
+        ----------
+        node : Node
+            Node whose children are visited.
+
+        Returns
+        -------
+            None
+        """
+        visit = self.visit
+        for name in node.child_fields:
+            value = getattr(node, name)
+            if value is None:
+                continue
+            if value.__class__ is not list:
+                visit(value)
+                continue
+            for item in value:
+                if item.__class__ is tuple:
+                    # Pairs of a map literal: the key is a plain string.
+                    item = item[1]
+                if item is not None:
+                    visit(item)
+
+NodeVisitor._dispatch = {node_class: NodeVisitor.generic_visit for node_class in NODE_CLASSES.values()}
@@ -0,0 +1,60 @@
+class SpannedNode(tuple):
+    """
+    AST node that also records where it comes from in the source.
+
+    It is the same tuple the parser builds, so it compares equal to it and
+    can be used wherever the plain AST is expected; the span is kept in
+    extra attributes.
+
+    Attributes
+    ----------
+    lexpos : int
+        Position of the first character of the node.
+    end_lexpos : int
+        Position just after the last character of the node.
+    lineno : int
+        Line number where the node starts.
+    end_lineno : int
+        Line number where the node ends.
+    """
+    def __new__(cls, node: tuple, lexpos: int = None, end_lexpos: int = None,
+                lineno: int = None, end_lineno: int = None) -> 'SpannedNode':
+        """
+        Builds a SpannedNode from a plain AST node and its span.
+
+        Parameters
+        ----------
+        node : tuple
+            The AST node.
+        lexpos : int, optional
+            Position of the first character of the node.
+        end_lexpos : int, optional
+            Position just after the last character of the node.
+        lineno : int, optional
+            Line number where the node starts.
+        end_lineno : int, optional
+            Line number where the node ends.
+
+        Returns
+        -------
+        SpannedNode
+            The node with its span.
+        """
+        self = super().__new__(cls, node)
+        self.lexpos = lexpos
+        self.end_lexpos = end_lexpos
+        self.lineno = lineno
+        self.end_lineno = end_lineno
+        return self
+
+    @property
+    def span(self) -> tuple:
+        """
+        Returns the span of the node.
+
+        Returns
+        -------
+        tuple
+            Start position, end position, start line and end line.
+        """
+        return (self.lexpos, self.end_lexpos, self.lineno, self.end_lineno)
@@ -1,9 +1,16 @@
+from typing import Iterable, Iterator
+
 import ply.lex as lex
-from Modules.componentsLEXER.Position import PositionCalculator
+from Modules.componentsLEXER.Position import PositionCalculator, LineIndex
 from Modules.componentsLEXER.Core_Errors import LexerError
+from Modules.componentsLEXER.Token_Buffer import TokenBuffer
+from Modules.componentsLEXER.Symbol_Table import SymbolTable
 from Modules.componentsLEXER.Core_Tokens import ALL_TOKENS, RESERVED, SYMBOLS, IGNORE
 from Modules.componentsLEXER.Core_States import LEXER_STATES
 
+# Lexers built by PLY, keyed by the signature of the rules they were built from.
+_LEXER_CACHE = {}
+
 class BaseLexer:
     """
     Base lexical analyzer (lexer) for the programming language.
@@ -28,6 +35,9 @@ class BaseLexer:
         Characters to ignore in raw string state.
     t_comment_ignore : str
         Characters to ignore in comment state.
+    symbols : SymbolTable
+        Table interning the values of identifiers, keywords and string
+        literals, so equal values share one object and have an integer id.
     """
     states = LEXER_STATES
     tokens = ALL_TOKENS
@@ -37,10 +47,111 @@ class BaseLexer:
     t_raw_ignore = ''
     t_comment_ignore = ''
 
-    def __init__(self):
+    def __init__(self, symbols: SymbolTable = None):
+        """
+        Initializes the lexer.
+
+        Parameters
+        ----------
+        symbols : SymbolTable or None, optional
+            Table shared with other lexers or kept across runs, so symbol
+            ids stay stable between inputs. By default the lexer owns a
+            table that is emptied at the start of each run.
+        """
         self.errors = []
-        self.lexer = lex.lex(module=self)
+        self._owns_symbols = symbols is None
+        self.symbols = SymbolTable() if symbols is None else symbols
+        self._intern = self.symbols.intern
+        self.lexer = self._build_lexer()
         self._position_calc = PositionCalculator()
+        self._line_index = None
+        self._input_offset = 0
+        self._input_first_line = 1
+
+    @staticmethod
+    def _code_signature(code: 'types.CodeType') -> tuple:
+        """
+        Computes a key that identifies what a function does, regardless of
+        where it is defined.
+
+        Parameters
+        ----------
+        code : types.CodeType
+            Code of the function.
+
+        Returns
+        -------
+        tuple
+            Hashable signature of the bytecode, the names and the constants
+            of the code, nested functions included.
+        """
+        consts = []
+        for const in code.co_consts:
+            if hasattr(const, 'co_code'):
+                const = BaseLexer._code_signature(const)
+            elif isinstance(const, frozenset):
+                # Its order depends on string hashing, which changes per process.
+                const = tuple(sorted(const, key=repr))
+            consts.append(const)
+        return (code.co_code, code.co_names, tuple(consts))
+
+    @classmethod
+    def _lexer_signature(cls) -> tuple:
+        """
+        Computes a key that identifies the lexing rules of the class.
+
+        Rule functions are keyed by name, regex and code, in definition
+        order since PLY tries them in that order; string rules are keyed by
+        their pattern. Moving the rules within the file doesn't change it.
+
+        Returns
+        -------
+        tuple
+            Hashable signature of the tokens, states and `t_` rules.
+        """
+        functions = []
+        strings = []
+        for name in dir(cls):
+            if not name.startswith('t_'):
+                continue
+            rule = getattr(cls, name)
+            if callable(rule):
+                functions.append(rule)
+            else:
+                strings.append((name, rule))
+        functions.sort(key=lambda rule: rule.__code__.co_firstlineno)
+        rules = tuple(
+            (rule.__name__, rule.__doc__, cls._code_signature(rule.__code__))
+            for rule in functions
+        )
+        return (tuple(cls.tokens), tuple(cls.states), rules, tuple(strings))
+
+    def _build_lexer(self) -> lex.Lexer:
+        """
+        Returns a PLY lexer bound to this instance.
+
+        The master regexes are compiled once per process and per set of
+        rules; later instances get a clone of the cached lexer with its
+        rule functions rebound to `self`.
+
+        Returns
+        -------
+        lex.Lexer
+            Lexer ready to receive input.
+        """
+        signature = self._lexer_signature()
+        template = _LEXER_CACHE.get(signature)
+        if template is None:
+            template = lex.lex(module=self)
+            _LEXER_CACHE[signature] = template
+        lexer = template.clone(self)
+        # `clone` does not rebind the EOF handlers of each state.
+        lexer.lexstateeoff = {
+            state: getattr(self, func.__name__)
+            for state, func in template.lexstateeoff.items()
+        }
+        lexer.begin('INITIAL')
+        return lexer
 
     def tokenize(self, text: str) -> list:
         """
@@ -56,16 +167,225 @@ class BaseLexer:
         list
             List of tokens generated from the input text.
         """
+        return list(self.iter_tokens(text))
+
+    def tokenize_compact(self, text: str) -> TokenBuffer:
+        """
+        Tokenizes the input text into a compact `TokenBuffer`.
+
+        Parameters
+        ----------
+        text : str
+            The source code to be tokenized.
+
+        Returns
+        -------
+        TokenBuffer
+            Buffer with the tokens generated from the input text.
+        """
+        buffer = TokenBuffer.from_tokens(self.iter_tokens(text), text)
+        buffer.end_lineno = self.lexer.lineno
+        return buffer
+
+    def iter_tokens(self, text: str) -> Iterator[lex.LexToken]:
+        """
+        Tokenizes the input text, yielding each token as soon as it is produced.
+
+        Parameters
+        ----------
+        text : str
+            The source code to be tokenized.
+
+        Returns
+        -------
+        Iterator[lex.LexToken]
+            Tokens generated from the input text.
+        """
         self.errors.clear()
-        self.lexer.input(text)
-        tokens = []
+        self._reset_lexer(text)
+        token = self.lexer.token
         while True:
-            tokk = self.lexer.token()
+            tokk = token()
             if not tokk:
                 break
-            tokens.append(tokk)
-        return tokens
-    
+            yield tokk
+
+    def iter_file_tokens(self, path: str, chunk_size: int = 1 << 16,
+                         encoding: str = 'utf-8') -> Iterator[lex.LexToken]:
+        """
+        Tokenizes a file reading it in chunks, so memory stays bounded by the
+        chunk size instead of the file size.
+
+        Parameters
+        ----------
+        path : str
+            Path of the file to tokenize.
+        chunk_size : int, optional
+            Number of characters read from the file at a time, by default 64K.
+        encoding : str, optional
+            Encoding of the file, by default 'utf-8'.
+
+        Returns
+        -------
+        Iterator[lex.LexToken]
+            Tokens generated from the file, see `iter_chunk_tokens`.
+        """
+        with open(path, 'r', encoding=encoding) as f:
+            yield from self.iter_chunk_tokens(iter(lambda: f.read(chunk_size), ''))
+
+    def iter_chunk_tokens(self, chunks: Iterable[str]) -> Iterator[lex.LexToken]:
+        """
+        Tokenizes text that arrives in pieces, yielding tokens lazily.
+
+        Chunks are cut at their last newline and every complete group of
+        lines is lexed on its own. No token crosses a newline in the
+        initial state and comments and strings only carry lexer state, so
+        the lexer simply continues with the next group. A raw string that
+        is still open carries its lines over to the next group. EOF
+        handlers are only enabled for the last group. Tokens and errors
+        keep absolute positions, and the result is the same as
+        `tokenize` on the joined text, except that error context only
+        shows lines of the group where the error was found.
+
+        Parameters
+        ----------
+        chunks : Iterable[str]
+            Consecutive pieces of the source code.
+
+        Returns
+        -------
+        Iterator[lex.LexToken]
+            Tokens generated from the text.
+        """
+        self.errors.clear()
+        self._reset_lexer('')
+        lexer = self.lexer
+        eof_handlers = lexer.lexstateeoff
+        lexer.lexstateeoff = {}
+        lexer.begin('INITIAL')
+        carry, skip, offset, first_line = [], 0, 0, 1
+        parts = []
+        try:
+            for chunk in chunks:
+                cut = chunk.rfind('\n') + 1
+                if not cut:
+                    parts.append(chunk)
+                    continue
+                parts.append(chunk[:cut])
+                lines = ''.join(parts)
+                parts = [chunk[cut:]]
+                if carry and '`' not in lines:
+                    # The raw string is still open and the lines can only
+                    # be part of it: the carry is joined once it ends.
+                    carry.append(lines)
+                    continue
+                rest, skip, offset, first_line = yield from self._lex_segment(
+                    ''.join(carry), lines, skip, offset, first_line
+                )
+                carry = [rest] if rest else []
+            lexer.lexstateeoff = eof_handlers
+            lexer.begin(lexer.current_state())
+            yield from self._lex_segment(''.join(carry), ''.join(parts), skip, offset, first_line)
+        finally:
+            lexer.lexstateeoff = eof_handlers
+
+    def _lex_segment(self, carry: str, text: str, skip: int, offset: int,
+                     first_line: int) -> Iterator[lex.LexToken]:
+        """
+        Lexes one group of lines for `iter_chunk_tokens`.
+
+        Parameters
+        ----------
+        carry : str
+            Lines of the previous group holding an unfinished raw string,
+            already consumed by the lexer.
+        text : str
+            New lines to lex.
+        skip : int
+            Characters at the start of `text` that a rule of the previous
+            group already skipped.
+        offset : int
+            Absolute position of the first character of `carry + text`.
+        first_line : int
+            Line number of the first line of `carry + text`.
+
+        Returns
+        -------
+        Iterator[lex.LexToken]
+            Tokens of the group, with absolute positions. The generator
+            returns the carry, skip, offset and first line for the next group.
+        """
+        lexer = self.lexer
+        lexdata = carry + text
+        lexer.input(lexdata)
+        lexer.lexpos = len(carry) + skip
+        self._input_offset = offset
+        self._input_first_line = first_line
+        token = lexer.token
+        while True:
+            tokk = token()
+            if not tokk:
+                break
+            tokk.lexpos += offset
+            yield tokk
+        # Once the input is exhausted PLY leaves lexpos one past the end, or
+        # further if a rule skipped characters beyond it.
+        skip = max(0, lexer.lexpos - len(lexdata) - 1)
+        consumed = len(lexdata)
+        if lexer.current_state() == 'raw':
+            consumed = lexdata.rfind('\n', 0, lexer.raw_start) + 1
+            lexer.raw_start -= consumed
+        return (
+            lexdata[consumed:],
+            skip,
+            offset + consumed,
+            first_line + lexdata.count('\n', 0, consumed)
+        )
+
+    def _reset_lexer(self, text: str) -> None:
+        """
+        Feeds new input to the lexer and restores its initial state.
+
+        PLY only resets the read position on `input`, so the line counter,
+        the active state and the comment nesting level are reset here to
+        keep consecutive runs independent from each other.
+
+        Parameters
+        ----------
+        text : str
+            The source code to be tokenized.
+
+        Returns
+        -------
+            None
+        """
+        self.lexer.input(text)
+        self.lexer.lineno = 1
+        self.lexer.comment_level = 0
+        self.lexer.begin('INITIAL')
+        if self._owns_symbols:
+            self.symbols.clear()
+        self._line_index = None
+        self._input_offset = 0
+        self._input_first_line = 1
+
+    def _get_line_index(self) -> LineIndex:
+        """
+        Returns the line table of the current input, building it on first use.
+
+        The table is shared by every error reported for the same input, so
+        the text is scanned once no matter how many errors are found.
+
+        Returns
+        -------
+        LineIndex
+            Line table for `self.lexer.lexdata`.
+        """
+        lexdata = self.lexer.lexdata
+        if self._line_index is None or self._line_index.text is not lexdata:
+            self._line_index = LineIndex(lexdata, self._input_offset, self._input_first_line)
+        return self._line_index
+
     def get_errors(self) -> list:
         """
         Returns a copy of the current lexer errors.
@@ -79,7 +399,8 @@ class BaseLexer:
 
     def add_lexer_error(self, lineno: int, lexpos: int, message: str) -> None:
         """
-        Adds a lexer error with position information and context.
+        Adds a lexer error with position information. The context text
+        is rendered lazily by the error itself.
 
         Parameters
         ----------
@@ -94,13 +415,18 @@ class BaseLexer:
         -------
             None
         """
-        col = self._position_calc.calculate_column(self.lexer.lexdata, lexpos)
-        context = self._position_calc.get_position_context(self.lexer.lexdata, lexpos)
-        self.errors.append(LexerError(lineno, col, message, context))
+        line_index = self._get_line_index()
+        lexpos += self._input_offset
+        col = self._position_calc.calculate_column(self.lexer.lexdata, lexpos, line_index=line_index)
+        self.errors.append(LexerError(
+            lineno, col, message, lexpos=lexpos, line_index=line_index
+        ))
 
     def t_IDENT(self, t):
         r'[A-Za-z_][A-Za-z0-9_]*'
-        t.type = self.reserved.get(t.value, 'IDENT')
+        # PLY slices a new string for every match: share one per name.
+        t.value = value = self._intern(t.value)
+        t.type = self.reserved.get(value, 'IDENT')
         return t
 
     def t_NUMBER(self, t):
@@ -140,7 +466,7 @@ class BaseLexer:
         t.lexer.lineno += len(t.value)
 
     def t_comment_anything(self, t):
-        r'[^\*/]+'
+        r'[^\*/\n]+'
         pass
 
     def t_comment_error(self, t):
@@ -157,24 +483,24 @@ class BaseLexer:
 
     def t_STRING(self, t):
         r'["\']'
-        t.lexer.string = ''
+        t.lexer.string_parts = []
+        t.lexer.string_start = t.lexpos
         t.lexer.quote = t.value
         t.lexer.begin('str')
 
     def t_str_end(self, t):
         r'["\']'
         if t.value == t.lexer.quote:
-            t.value = t.lexer.string
+            t.value = self._intern(''.join(t.lexer.string_parts))
             t.type = 'STRING'
             t.lexer.begin('INITIAL')
             return t
         else:
-            t.lexer.string += t.value
+            t.lexer.string_parts.append(t.value)
 
     def t_str_escaped_quote(self, t):
         r'\\"|\\\''
-        quote = t.value[1]
-        t.lexer.string += quote
+        t.lexer.string_parts.append(t.value[1])
 
     def t_str_newline(self, t):
         r'\n'
@@ -184,7 +510,7 @@ class BaseLexer:
 
     def t_str_content(self, t):
         r'[^"\n\\\']+'
-        t.lexer.string += t.value
+        t.lexer.string_parts.append(t.value)
 
     def t_str_error(self, t):
         self.add_lexer_error(t.lineno, t.lexpos, f"Illegal character in string: {t.value[0]!r}")
@@ -192,19 +518,19 @@ class BaseLexer:
 
     def t_RAW_STRING(self, t):
         r'`'
-        t.lexer.raw = ''
+        t.lexer.raw_start = t.lexpos + 1
         t.lexer.begin('raw')
 
     def t_raw_end(self, t):
         r'`'
-        t.value = t.lexer.raw
+        t.value = self._intern(t.lexer.lexdata[t.lexer.raw_start:t.lexpos])
         t.type = 'RAW_STRING'
         t.lexer.begin('INITIAL')
         return t
 
     def t_raw_content(self, t):
         r'[^`]+'
-        t.lexer.raw += t.value
+        pass
 
     def t_raw_eof(self, t):
         self.add_lexer_error(t.lexer.lineno, t.lexpos, "EOF in raw string")
@@ -1,22 +1,20 @@
+from Modules.componentsLEXER.Position import PositionCalculator, LineIndex
 
-class LexerError:
+class _SourceError:
     """
-    Represents an error encountered during lexical analysis.
+    Base of the errors located in the input, holding their position and
+    their context text.
 
-    Attributes
-    ----------
-    lineno : int
-        Line number where the error occurred.
-    col : int
-        Column number where the error occurred.
-    message : str
-        Description of the error.
-    context : str or None, optional
-        Additional context information about the error, by default None.
+    The context text is rendered on first access from the error offset
+    and the line table of the input, so errors that are only counted or
+    located never pay for it.
     """
-    def __init__(self, lineno: int, col: int, message: str, context: str = None) -> None:
+    __slots__ = ('lineno', 'col', 'message', 'lexpos', '_line_index', '_context')
+
+    def __init__(self, lineno: int, col: int, message: str, context: str = None,
+                 lexpos: int = None, line_index: LineIndex = None) -> None:
         """
-        Initializes a LexerError with position and error information.
+        Initializes the error with its position and message.
 
         Parameters
         ----------
@@ -28,12 +26,61 @@ class LexerError:
             Description of the error.
         context : str or None, optional
             Additional context information, by default None.
+        lexpos : int or None, optional
+            Absolute position of the error, used to render the context
+            lazily, by default None.
+        line_index : LineIndex or None, optional
+            Line table of the input, used to render the context lazily,
+            by default None.
         """
         self.lineno = lineno
         self.col = col
         self.message = message
-        self.context = context
-    
+        self.lexpos = lexpos
+        self._line_index = line_index
+        self._context = context
+
+    @property
+    def context(self) -> str:
+        """
+        Returns the context text, rendering it on first access.
+
+        Returns
+        -------
+        str or None
+            Lines around the error with a pointer to the column.
+        """
+        if self._context is None and self._line_index is not None:
+            self._context = PositionCalculator.get_position_context(
+                self._line_index.text, self.lexpos, line_index=self._line_index
+            )
+            self._line_index = None
+        return self._context
+
+    @context.setter
+    def context(self, value: str) -> None:
+        self._context = value
+        self._line_index = None
+
+class LexerError(_SourceError):
+    """
+    Represents an error encountered during lexical analysis.
+
+    Attributes
+    ----------
+    lineno : int
+        Line number where the error occurred.
+    col : int
+        Column number where the error occurred.
+    message : str
+        Description of the error.
+    lexpos : int or None
+        Absolute position of the error in the input, by default None.
+    context : str or None, optional
+        Additional context information about the error, by default None.
+    """
+    __slots__ = ()
+
     def __str__(self) -> str:
         """
         Returns a formatted string representation of the lexer error.
@@ -47,7 +94,7 @@ class LexerError:
             return f"Linea {self.lineno}, Col {self.col}: {self.message}\n{self.context}"
         return f"Linea {self.lineno}, Col {self.col}: {self.message}"
 
-class ParseError:
+class ParseError(_SourceError):
     """
     Represents an error encountered during syntactic analysis (parsing).
 
@@ -61,10 +108,15 @@ class ParseError:
         Description of the error.
     value : any or None, optional
         The value that caused the error, by default None.
+    lexpos : int or None
+        Absolute position of the error in the input, by default None.
     context : str or None, optional
         Additional context information about the error, by default None.
     """
-    def __init__(self, lineno: int, col: int, message: str, value: any = None, context: str = None) -> None:
+    __slots__ = ('value',)
+
+    def __init__(self, lineno: int, col: int, message: str, value: any = None, context: str = None,
+                 lexpos: int = None, line_index: LineIndex = None) -> None:
         """
         Initializes a ParseError with position, error information, and optional value.
 
@@ -80,12 +132,15 @@ class ParseError:
             The value that caused the error, by default None.
         context : str or None, optional
             Additional context information, by default None.
+        lexpos : int or None, optional
+            Absolute position of the error, used to render the context
+            lazily, by default None.
+        line_index : LineIndex or None, optional
+            Line table of the input, used to render the context lazily,
+            by default None.
         """
-        self.lineno = lineno
-        self.col = col
-        self.message = message
-        self.value =value
-        self.context = context
+        super().__init__(lineno, col, message, context, lexpos, line_index)
+        self.value = value
 
     def __str__(self) -> str:
         """
@@ -102,3 +157,11 @@ class ParseError:
         if self.context:
             base += f"\n{self.context}"
         return base
+
+class AnalysisCancelled(Exception):
+    """
+    Raised by a progress callback to stop an analysis that is no longer
+    needed, e.g. because the user cancelled it or started a newer one.
+    The exception goes through `LanguageParser.parse` and
+    `LexerCore.process` untouched, and no result is cached.
+    """
@@ -42,6 +42,8 @@ RESERVED = {
 
 ALL_TOKENS = TOKENS + tuple(RESERVED.values())
 
+TOKEN_CODES = {name: code for code, name in enumerate(ALL_TOKENS)}
+
 SYMBOLS = {
     'GTE': r'>=',
     'LTE': r'<=',
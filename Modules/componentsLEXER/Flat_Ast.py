@@ -0,0 +1,667 @@
+from array import array
+from typing import Any, Iterator
+
+from Modules.componentsLEXER.Ast_Nodes import Node, NODE_CLASSES
+from Modules.componentsLEXER.Ast_Span import SpannedNode
+
+# Kinds of the flat nodes: the structural ones first, then one per AST tag.
+KIND_NAMES = ('list', 'pair', 'value', 'none') + tuple(NODE_CLASSES)
+KIND_CODES = {name: code for code, name in enumerate(KIND_NAMES)}
+LIST, PAIR, VALUE, NONE = range(4)
+
+def _payload_field(node_class: type) -> int:
+    """
+    Returns the field of a node class stored as the payload of its flat
+    nodes: the first one that never holds a node, such as the name of a
+    declaration, an operator or a literal value.
+
+    Parameters
+    ----------
+    node_class : type
+        Subclass of `Node`.
+
+    Returns
+    -------
+    int or None
+        Index of the field after the tag, or None if every field may
+        hold nodes.
+    """
+    for index, name in enumerate(node_class.__slots__):
+        if name not in node_class.child_fields:
+            return index
+    return None
+
+_PAYLOAD_FIELDS = {
+    KIND_CODES[kind]: _payload_field(node_class)
+    for kind, node_class in NODE_CLASSES.items()
+    if _payload_field(node_class) is not None
+}
+# Kinds whose only field is always a list: its items are stored as the
+# children of the node itself.
+_LIST_KINDS = frozenset(KIND_CODES[kind] for kind in ('program', 'block', 'print_stmt', 'map'))
+
+class FlatRef:
+    """
+    Reference to a node already stored in a `FlatAst`, used in place of
+    the node while the tree is being built.
+
+    Attributes
+    ----------
+    index : int
+        Index of the node in the FlatAst.
+    """
+    __slots__ = ('index',)
+
+    def __init__(self, index: int) -> None:
+        """
+        Initializes a reference to the node at `index`.
+
+        Parameters
+        ----------
+        index : int
+            Index of the node in the FlatAst.
+        """
+        self.index = index
+
+class FlatAst:
+    """
+    AST stored in flat arrays instead of nested objects.
+
+    Every node takes a kind code from `KIND_CODES`, the index of its first
+    child and of its next sibling (-1 if none) and the index of its
+    payload in the `values` table (-1 if none). Values are deduplicated,
+    so repeated names and operators are stored once. Spans, when the tree
+    has them, go in four more columns.
+
+    The first field of a node that never holds a node (a name, an
+    operator, a literal value) is its payload. The other fields become
+    children: nodes, 'list' nodes for lists, 'value' nodes for plain
+    values and 'none' nodes for None. Statement lists, print arguments
+    and map entries are the children of their node directly, map entries
+    being 'pair' nodes with the key as payload. Nodes are stored children
+    first, so the root is the last one.
+
+    Attributes
+    ----------
+    kinds : array
+        Kind code of each node.
+    first_child : array
+        Index of the first child of each node.
+    next_sibling : array
+        Index of the next sibling of each node.
+    payloads : array
+        Index in `values` of the payload of each node.
+    lexposs, end_lexposs, linenos, end_linenos : array
+        Span of each node; empty if the tree has no spans. Positions are
+        64-bit integers so inputs over 2 GiB fit.
+    values : list
+        Distinct payload values.
+    root : int
+        Index of the root node, -1 for an empty tree.
+    """
+    def __init__(self, spans: bool = False) -> None:
+        """
+        Initializes an empty FlatAst.
+
+        Parameters
+        ----------
+        spans : bool, optional
+            Whether node spans are stored, by default False.
+        """
+        self.spans = spans
+        self.kinds = array('B')
+        self.first_child = array('i')
+        self.next_sibling = array('i')
+        self.payloads = array('i')
+        self.lexposs = array('q')
+        self.end_lexposs = array('q')
+        self.linenos = array('i')
+        self.end_linenos = array('i')
+        self.values = []
+        self._value_ids = {}
+        self.root = -1
+
+    def __len__(self) -> int:
+        """
+        Returns the number of stored nodes.
+
+        Returns
+        -------
+        int
+            Number of nodes.
+        """
+        return len(self.kinds)
+
+    def _value_id(self, value: Any) -> int:
+        """
+        Returns the index of a value in `values`, adding it if needed.
+
+        Parameters
+        ----------
+        value : any
+            Plain value.
+
+        Returns
+        -------
+        int
+            Index of the value.
+        """
+        # Keyed by type too, so that e.g. 1, True and '1' stay apart.
+        key = (value.__class__, value)
+        value_id = self._value_ids.get(key)
+        if value_id is None:
+            value_id = len(self.values)
+            self._value_ids[key] = value_id
+            self.values.append(value)
+        return value_id
+
+    def _append(self, kind: int, children: list, payload: int = -1, span: tuple = None) -> int:
+        """
+        Stores a node whose children are already stored.
+
+        Parameters
+        ----------
+        kind : int
+            Kind code of the node.
+        children : list of int
+            Indices of the children, in order.
+        payload : int, optional
+            Index of the payload in `values`, by default none.
+        span : tuple or None, optional
+            Start position, end position, start line and end line.
+
+        Returns
+        -------
+        int
+            Index of the new node.
+        """
+        index = len(self.kinds)
+        next_sibling = self.next_sibling
+        for child, sibling in zip(children, children[1:]):
+            next_sibling[child] = sibling
+        self.kinds.append(kind)
+        self.first_child.append(children[0] if children else -1)
+        next_sibling.append(-1)
+        self.payloads.append(payload)
+        if self.spans:
+            span = span or (-1, -1, -1, -1)
+            self.lexposs.append(span[0])
+            self.end_lexposs.append(span[1])
+            self.linenos.append(span[2])
+            self.end_linenos.append(span[3])
+        return index
+
+    def _add_field(self, value: Any) -> int:
+        """
+        Stores a field of a node and returns the index of its flat node.
+
+        Parameters
+        ----------
+        value : any
+            A FlatRef, a list, None or a plain value.
+
+        Returns
+        -------
+        int
+            Index of the node standing for the field.
+        """
+        if value.__class__ is FlatRef:
+            return value.index
+        if value is None:
+            return self._append(NONE, [])
+        if value.__class__ is list:
+            return self._append(LIST, self._add_items(value))
+        return self._append(VALUE, [], self._value_id(value))
+
+    def _add_items(self, items: list) -> list:
+        """
+        Stores the items of a list field.
+
+        Parameters
+        ----------
+        items : list
+            FlatRef objects, or (key, FlatRef) pairs of a map literal.
+
+        Returns
+        -------
+        list of int
+            Indices of the nodes standing for the items.
+        """
+        indices = []
+        for item in items:
+            if item.__class__ is tuple:
+                key, item = item
+                indices.append(self._append(PAIR, [self._add_field(item)], self._value_id(key)))
+            else:
+                indices.append(self._add_field(item))
+        return indices
+
+    def add_node(self, kind: str, fields: tuple, span: tuple = None) -> FlatRef:
+        """
+        Stores an AST node whose child nodes are already stored.
+
+        Parameters
+        ----------
+        kind : str
+            Tag of the node, e.g. 'binop'.
+        fields : tuple
+            Fields of the node after the tag: FlatRef objects for nodes,
+            lists of them (or of (key, FlatRef) pairs), None or plain values.
+        span : tuple or None, optional
+            Source span of the node, by default None.
+
+        Returns
+        -------
+        FlatRef
+            Reference to the stored node.
+        """
+        code = KIND_CODES[kind]
+        payload = -1
+        field = _PAYLOAD_FIELDS.get(code)
+        if field is not None:
+            value = fields[field]
+            if value is not None:
+                payload = self._value_id(value)
+            fields = fields[:field] + fields[field + 1:]
+        if code in _LIST_KINDS:
+            children = self._add_items(fields[0])
+        else:
+            children = [self._add_field(value) for value in fields]
+        return FlatRef(self._append(code, children, payload, span))
+
+    @classmethod
+    def from_columns(cls, kinds: array, first_child: array, next_sibling: array, payloads: array,
+                     values: list, root: int, spans: tuple = None) -> 'FlatAst':
+        """
+        Builds a FlatAst from already filled columns, e.g. when loading a
+        stored result.
+
+        Parameters
+        ----------
+        kinds : array
+            Kind code of each node.
+        first_child : array
+            Index of the first child of each node.
+        next_sibling : array
+            Index of the next sibling of each node.
+        payloads : array
+            Index in `values` of the payload of each node.
+        values : list
+            Payload values.
+        root : int
+            Index of the root node.
+        spans : tuple or None, optional
+            Arrays of start positions, end positions, start lines and end
+            lines, by default None for a tree without spans.
+
+        Returns
+        -------
+        FlatAst
+            The tree.
+        """
+        flat = cls(spans=spans is not None)
+        if spans is not None:
+            flat.lexposs, flat.end_lexposs, flat.linenos, flat.end_linenos = spans
+        flat.__setstate__({
+            'kinds': kinds, 'first_child': first_child, 'next_sibling': next_sibling,
+            'payloads': payloads, 'values': values, 'root': root
+        })
+        return flat
+
+    @classmethod
+    def from_tree(cls, tree: Any) -> 'FlatAst':
+        """
+        Builds a FlatAst from a tuple or `Node` AST, without recursion.
+
+        Parameters
+        ----------
+        tree : tuple, Node or None
+            AST returned by `LanguageParser.parse`.
+
+        Returns
+        -------
+        FlatAst
+            The same tree in flat arrays, with spans if the tree has them.
+        """
+        flat = cls(spans=getattr(tree, 'span', None) is not None)
+        if tree is None:
+            return flat
+        # Post-order: each task either converts an object, pushing its
+        # result, or builds a container from the results of its items.
+        results = []
+        tasks = [('convert', tree, False)]
+        while tasks:
+            task = tasks.pop()
+            action = task[0]
+            if action == 'convert':
+                # `in_map` is set for the items list of a map literal and
+                # for its items, which are (key, value) pairs.
+                _, obj, in_map = task
+                if isinstance(obj, Node):
+                    fields = [getattr(obj, name) for name in obj.__slots__]
+                    tasks.append(('node', obj.kind, len(fields), obj.span))
+                    in_map = obj.kind == 'map'
+                elif isinstance(obj, list):
+                    fields = obj
+                    tasks.append(('list', len(fields)))
+                elif isinstance(obj, tuple) and in_map:
+                    fields = obj[1:]
+                    tasks.append(('pair', obj[0]))
+                    in_map = False
+                elif isinstance(obj, tuple):
+                    fields = obj[1:]
+                    tasks.append(('node', obj[0], len(fields), getattr(obj, 'span', None)))
+                    in_map = obj[0] == 'map'
+                else:
+                    results.append(obj)
+                    continue
+                for field in reversed(fields):
+                    tasks.append(('convert', field, in_map))
+            elif action == 'node':
+                _, kind, count, span = task
+                fields = tuple(results[len(results) - count:])
+                del results[len(results) - count:]
+                results.append(flat.add_node(kind, fields, span))
+            elif action == 'list':
+                count = task[1]
+                items = results[len(results) - count:]
+                del results[len(results) - count:]
+                results.append(items)
+            else:
+                results.append((task[1], results.pop()))
+        flat.root = results[0].index
+        return flat
+
+    def kind_of(self, index: int) -> str:
+        """
+        Returns the kind name of a node.
+
+        Parameters
+        ----------
+        index : int
+            Index of the node.
+
+        Returns
+        -------
+        str
+            An AST tag such as 'binop', or 'list', 'pair', 'value', 'none'.
+        """
+        return KIND_NAMES[self.kinds[index]]
+
+    def value_of(self, index: int) -> Any:
+        """
+        Returns the payload of a node.
+
+        Parameters
+        ----------
+        index : int
+            Index of the node.
+
+        Returns
+        -------
+        any
+            The payload value, or None if the node has none.
+        """
+        payload = self.payloads[index]
+        return self.values[payload] if payload >= 0 else None
+
+    def span_of(self, index: int) -> tuple:
+        """
+        Returns the span of a node.
+
+        Parameters
+        ----------
+        index : int
+            Index of the node.
+
+        Returns
+        -------
+        tuple or None
+            Start position, end position, start line and end line, or None
+            if spans are not stored or the node has none.
+        """
+        if not self.spans or self.lexposs[index] < 0:
+            return None
+        return (self.lexposs[index], self.end_lexposs[index], self.linenos[index], self.end_linenos[index])
+
+    def children(self, index: int) -> Iterator[int]:
+        """
+        Yields the children of a node, in order.
+
+        Parameters
+        ----------
+        index : int
+            Index of the node.
+
+        Returns
+        -------
+        Iterator[int]
+            Indices of the children.
+        """
+        child = self.first_child[index]
+        next_sibling = self.next_sibling
+        while child >= 0:
+            yield child
+            child = next_sibling[child]
+
+    def _field(self, index: int) -> Any:
+        """
+        Returns the field a child node stands for, see `iter_fields`.
+
+        Parameters
+        ----------
+        index : int
+            Index of the child node.
+
+        Returns
+        -------
+        any
+            The plain value for 'value' and 'none' nodes, else a FlatRef.
+        """
+        kind = self.kinds[index]
+        if kind == VALUE:
+            return self.value_of(index)
+        if kind == NONE:
+            return None
+        return FlatRef(index)
+
+    def iter_fields(self, index: int) -> Iterator[Any]:
+        """
+        Yields the items of a node as `to_tuple` would build them, one
+        level at a time: the tag and fields of an AST node, the items of a
+        list, or the key and value of a map entry. Nested nodes are given
+        as FlatRef objects and lists as iterators over their items, so a
+        tree can be walked (e.g. encoded) without rebuilding it.
+
+        Parameters
+        ----------
+        index : int
+            Index of the node.
+
+        Returns
+        -------
+        Iterator[any]
+            Plain values, FlatRef objects and list iterators.
+        """
+        kind = self.kinds[index]
+        children = self.children(index)
+        if kind == LIST:
+            for child in children:
+                yield self._field(child)
+            return
+        if kind == PAIR:
+            yield self.value_of(index)
+            yield self._field(next(children))
+            return
+        name = KIND_NAMES[kind]
+        yield name
+        payload_field = _PAYLOAD_FIELDS.get(kind)
+        for field in range(len(NODE_CLASSES[name].__slots__)):
+            if field == payload_field:
+                yield self.value_of(index)
+            elif kind in _LIST_KINDS:
+                yield (self._field(child) for child in children)
+            else:
+                yield self._field(next(children))
+
+    def walk_preorder(self, index: int = None) -> Iterator[int]:
+        """
+        Yields a node and its descendants, parents before children.
+
+        Parameters
+        ----------
+        index : int, optional
+            Node where the walk starts, by default the root.
+
+        Returns
+        -------
+        Iterator[int]
+            Indices of the nodes.
+        """
+        if index is None:
+            index = self.root
+        if index < 0:
+            return
+        first_child = self.first_child
+        next_sibling = self.next_sibling
+        stack = [index]
+        while stack:
+            node = stack.pop()
+            yield node
+            children = []
+            child = first_child[node]
+            while child >= 0:
+                children.append(child)
+                child = next_sibling[child]
+            children.reverse()
+            stack.extend(children)
+
+    def walk_postorder(self, index: int = None) -> Iterator[int]:
+        """
+        Yields a node and its descendants, children before parents.
+
+        Parameters
+        ----------
+        index : int, optional
+            Node where the walk starts, by default the root.
+
+        Returns
+        -------
+        Iterator[int]
+            Indices of the nodes.
+        """
+        if index is None:
+            index = self.root
+        if index < 0:
+            return
+        first_child = self.first_child
+        next_sibling = self.next_sibling
+        # Each entry holds a node and the next child of it to visit.
+        stack = [(index, first_child[index])]
+        while stack:
+            node, child = stack[-1]
+            if child < 0:
+                stack.pop()
+                yield node
+                continue
+            stack[-1] = (node, next_sibling[child])
+            stack.append((child, first_child[child]))
+
+    def to_tuple(self, index: int = None, spans: bool = False) -> Any:
+        """
+        Rebuilds the tuple AST of a node, without recursion.
+
+        Parameters
+        ----------
+        index : int, optional
+            Node to rebuild, by default the root.
+        spans : bool, optional
+            If True, nodes with a span are rebuilt as `SpannedNode`, as
+            `LanguageParser.parse` does with `spans`, by default False.
+
+        Returns
+        -------
+        any
+            The tuple AST (None for an empty tree).
+        """
+        if index is None:
+            index = self.root
+        if index < 0:
+            return None
+        kinds = self.kinds
+        first_child = self.first_child
+        next_sibling = self.next_sibling
+        payloads = self.payloads
+        values = self.values
+        # Each entry holds a node, its next child to rebuild and the fields
+        # rebuilt so far.
+        stack = [[index, first_child[index], []]]
+        while True:
+            entry = stack[-1]
+            child = entry[1]
+            if child >= 0:
+                entry[1] = next_sibling[child]
+                kind = kinds[child]
+                if kind == VALUE:
+                    entry[2].append(values[payloads[child]])
+                elif kind == NONE:
+                    entry[2].append(None)
+                else:
+                    stack.append([child, first_child[child], []])
+                continue
+            stack.pop()
+            node, _, fields = entry
+            kind = kinds[node]
+            if kind == LIST:
+                value = fields
+            elif kind == PAIR:
+                value = (self.value_of(node), fields[0])
+            elif kind == VALUE:
+                value = self.value_of(node)
+            elif kind == NONE:
+                value = None
+            else:
+                if kind in _LIST_KINDS:
+                    fields = [fields]
+                field = _PAYLOAD_FIELDS.get(kind)
+                if field is not None:
+                    fields.insert(field, self.value_of(node))
+                value = (KIND_NAMES[kind], *fields)
+                span = self.span_of(node) if spans else None
+                if span is not None:
+                    value = SpannedNode(value, *span)
+            if not stack:
+                return value
+            stack[-1][2].append(value)
+
+    def __getstate__(self) -> dict:
+        """
+        Returns the state to pickle, without the value lookup table, which
+        is rebuilt from `values` on load.
+
+        Returns
+        -------
+        dict
+            Attributes of the tree.
+        """
+        state = self.__dict__.copy()
+        del state['_value_ids']
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        """
+        Restores a pickled tree and rebuilds its value lookup table.
+
+        Parameters
+        ----------
+        state : dict
+            Attributes returned by `__getstate__`.
+
+        Returns
+        -------
+            None
+        """
+        self.__dict__.update(state)
+        self._value_ids = {
+            (value.__class__, value): value_id for value_id, value in enumerate(self.values)
+        }
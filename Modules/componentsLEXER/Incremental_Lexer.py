@@ -0,0 +1,573 @@
+from bisect import bisect_right
+from typing import Iterator, List, Tuple
+
+import ply.lex as lex
+from Modules.componentsLEXER.Base_Lexer import BaseLexer
+from Modules.componentsLEXER.Symbol_Table import SymbolTable
+from Modules.componentsLEXER.Core_Errors import LexerError
+from Modules.componentsLEXER.Position import LineIndex
+
+class LexLine:
+    """
+    Lexing result of one physical line of an `IncrementalLexer` document.
+
+    Positions and line numbers are stored relative to the line, so lines
+    after an edit stay valid without being touched.
+
+    Attributes
+    ----------
+    text : str
+        Text of the line, including its trailing newline if any.
+    state : str
+        Lexer state at the start of the line ('INITIAL', 'comment', 'raw').
+    comment_level : int
+        Nesting level of multiline comments at the start of the line.
+    skip : int
+        Characters at the start of the line already skipped by a rule of
+        the previous line.
+    newlines : int
+        How much the lexer line counter advanced over the line.
+    tokens : list of tuple
+        (type, value, position in the line, line counter offset) of each
+        token whose position falls in the line.
+    string_starts : list of int
+        Position in the line of the opening quote of each STRING token, in
+        order; the tokens themselves are reported at their closing quote.
+    errors : list of tuple
+        (line counter offset, column, message, position in the line) of
+        each error reported while lexing the line.
+    """
+    __slots__ = ('text', 'state', 'comment_level', 'skip', 'newlines', 'tokens',
+                 'string_starts', 'errors')
+
+    def __init__(self, text: str, state: str, comment_level: int, skip: int) -> None:
+        """
+        Initializes a LexLine with its text and starting lexer state.
+
+        Parameters
+        ----------
+        text : str
+            Text of the line.
+        state : str
+            Lexer state at the start of the line.
+        comment_level : int
+            Comment nesting level at the start of the line.
+        skip : int
+            Characters already skipped at the start of the line.
+        """
+        self.text = text
+        self.state = state
+        self.comment_level = comment_level
+        self.skip = skip
+        self.newlines = 0
+        self.tokens = []
+        self.string_starts = []
+        self.errors = []
+
+    def same_start(self, state: str, comment_level: int, skip: int) -> bool:
+        """
+        Tells whether lexing the line from the given state reproduces it.
+
+        A line starting inside a raw string never matches, because the raw
+        string value depends on the lines before it.
+
+        Parameters
+        ----------
+        state : str
+            Lexer state at the start of the line.
+        comment_level : int
+            Comment nesting level at the start of the line.
+        skip : int
+            Characters already skipped at the start of the line.
+
+        Returns
+        -------
+        bool
+            True if the stored result is still valid.
+        """
+        return (
+            state != 'raw'
+            and self.state == state
+            and self.comment_level == comment_level
+            and self.skip == skip
+        )
+
+class DocumentTokens:
+    """
+    Read-only sequence of the tokens of an `IncrementalLexer` document as
+    they were when the sequence was built.
+
+    Building it takes time proportional to the number of lines; a token
+    becomes a `LexToken` only when it is read. Edits replace the `LexLine`
+    objects they touch instead of changing them, so the sequence is not
+    affected by later edits.
+    """
+    __slots__ = ('_lines', '_ends', '_offsets', '_linenos')
+
+    def __init__(self, lines: List[LexLine]) -> None:
+        """
+        Initializes the sequence from the lines of a document.
+
+        Parameters
+        ----------
+        lines : list of LexLine
+            Lines of the document, in order.
+        """
+        self._lines = list(lines)
+        self._ends = []
+        self._offsets = []
+        self._linenos = []
+        count, offset, lineno = 0, 0, 1
+        for line in self._lines:
+            self._offsets.append(offset)
+            self._linenos.append(lineno)
+            count += len(line.tokens)
+            self._ends.append(count)
+            offset += len(line.text)
+            lineno += line.newlines
+
+    def _token(self, line_index: int, entry: tuple) -> lex.LexToken:
+        """
+        Builds the token of a line entry, with absolute positions.
+
+        Parameters
+        ----------
+        line_index : int
+            Index of the line holding the token.
+        entry : tuple
+            (type, value, position in the line, line counter offset).
+
+        Returns
+        -------
+        lex.LexToken
+            The token.
+        """
+        tok = lex.LexToken()
+        tok.type, tok.value = entry[0], entry[1]
+        tok.lineno = self._linenos[line_index] + entry[3]
+        tok.lexpos = self._offsets[line_index] + entry[2]
+        return tok
+
+    def __len__(self) -> int:
+        """
+        Returns the number of tokens.
+
+        Returns
+        -------
+        int
+            Number of tokens.
+        """
+        return self._ends[-1] if self._ends else 0
+
+    def __getitem__(self, index: int) -> lex.LexToken:
+        """
+        Returns the token at `index`.
+
+        Parameters
+        ----------
+        index : int
+            Position of the token, negative values count from the end.
+
+        Returns
+        -------
+        lex.LexToken
+            The token.
+        """
+        size = len(self)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("token index out of range")
+        line_index = bisect_right(self._ends, index)
+        start = self._ends[line_index - 1] if line_index else 0
+        return self._token(line_index, self._lines[line_index].tokens[index - start])
+
+    def __iter__(self) -> Iterator[lex.LexToken]:
+        """
+        Iterates over the tokens.
+
+        Returns
+        -------
+        Iterator[lex.LexToken]
+            The tokens, in order.
+        """
+        for line_index, line in enumerate(self._lines):
+            for entry in line.tokens:
+                yield self._token(line_index, entry)
+
+class IncrementalLexer(BaseLexer):
+    """
+    Lexer that keeps the token stream of a document up to date across edits.
+
+    The document is lexed line by line and the lexer state at the start of
+    each line is stored with the tokens of that line. No token crosses a
+    newline in the initial state and comments only carry their nesting
+    level, so any line that does not start inside a raw string is a safe
+    restart point. An edit re-lexes from the last restart point before it
+    and stops at the first line after it whose starting state matches the
+    stored one; every other line is kept as is. The materialized tokens
+    and errors are the same as `tokenize` on the whole text.
+
+    Values are interned in the symbol table as they are lexed, so values
+    that left the document (e.g. each prefix of a name being typed) stay
+    in it. A table owned by the lexer is rebuilt from the tokens of the
+    document whenever it doubles in size, which keeps it proportional to
+    the document; a table passed by the caller is never rebuilt and grows
+    until the caller clears it.
+
+    Attributes
+    ----------
+    lines : list of LexLine
+        Lexing result of each physical line of the document.
+    SYMBOLS_REBUILD_MIN : int
+        Size below which the owned symbol table is never rebuilt.
+    """
+    SYMBOLS_REBUILD_MIN = 4096
+    def __init__(self, text: str = '', symbols: SymbolTable = None) -> None:
+        """
+        Initializes the IncrementalLexer and lexes the initial text.
+
+        Parameters
+        ----------
+        text : str, optional
+            Initial text of the document, by default empty.
+        symbols : SymbolTable or None, optional
+            Symbol table used by the lexer, see `BaseLexer`. By default the
+            lexer owns one, kept across edits, emptied by `set_text` and
+            rebuilt when it doubles in size.
+        """
+        super().__init__(symbols)
+        self.lines = []
+        self._symbols_limit = self.SYMBOLS_REBUILD_MIN
+        self._interned_types = frozenset(('IDENT', 'STRING', 'RAW_STRING', *self.reserved.values()))
+        self.set_text(text)
+
+    @staticmethod
+    def _split_lines(text: str) -> List[str]:
+        """
+        Splits text into lines that keep their newline.
+
+        Parameters
+        ----------
+        text : str
+            Text to split.
+
+        Returns
+        -------
+        list of str
+            Lines of the text; the last one has no newline and may be empty.
+        """
+        lines = text.split('\n')
+        last = lines.pop()
+        lines = [line + '\n' for line in lines]
+        lines.append(last)
+        return lines
+
+    def set_text(self, text: str) -> None:
+        """
+        Replaces the whole document and lexes it.
+
+        Parameters
+        ----------
+        text : str
+            New text of the document.
+
+        Returns
+        -------
+            None
+        """
+        self.lines = []
+        if self._owns_symbols:
+            self.symbols.clear()
+        self._relex(0, self._split_lines(text), 0)
+        self._symbols_limit = max(2 * len(self.symbols), self.SYMBOLS_REBUILD_MIN)
+
+    def edit(self, start_line: int, start_col: int, end_line: int, end_col: int,
+             text: str) -> Tuple[int, int]:
+        """
+        Replaces a range of the document and re-lexes the affected lines.
+
+        Lines and columns follow the Tk convention used by the text areas:
+        lines start at 1 and columns at 0.
+
+        Parameters
+        ----------
+        start_line : int
+            Line where the replaced range begins.
+        start_col : int
+            Column where the replaced range begins.
+        end_line : int
+            Line where the replaced range ends.
+        end_col : int
+            Column where the replaced range ends (exclusive).
+        text : str
+            Text inserted in place of the range.
+
+        Returns
+        -------
+        tuple
+            First and last line (1-based, in the edited document) that were
+            lexed again.
+        """
+        lines = self.lines
+        first, last = start_line - 1, end_line - 1
+        head = lines[first].text[:start_col]
+        tail = lines[last].text[end_col:]
+        new_texts = self._split_lines(head + text + tail)
+        if last + 1 < len(lines):
+            # The tail kept its newline, so the piece after it is not a line.
+            new_texts.pop()
+        restart = first
+        while restart > 0 and lines[restart].state == 'raw':
+            restart -= 1
+        texts = [line.text for line in lines[restart:first]] + new_texts
+        end = self._relex(restart, texts, last + 1)
+        if self._owns_symbols and len(self.symbols) >= self._symbols_limit:
+            self._rebuild_symbols()
+        return restart + 1, end
+
+    def _rebuild_symbols(self) -> None:
+        """
+        Replaces the content of the owned symbol table with the values of
+        the tokens of the document. Tokens keep their value objects, which
+        become the interned ones again.
+
+        Returns
+        -------
+            None
+        """
+        symbols = self.symbols
+        symbols.clear()
+        intern = symbols.intern
+        interned_types = self._interned_types
+        for line in self.lines:
+            for tok_type, value, _, _ in line.tokens:
+                if tok_type in interned_types:
+                    intern(value)
+        self._symbols_limit = max(2 * len(symbols), self.SYMBOLS_REBUILD_MIN)
+
+    def _relex(self, restart: int, texts: List[str], resume: int) -> int:
+        """
+        Lexes new lines in place of `self.lines[restart:resume]`, then keeps
+        lexing the old lines that follow until one starts in the same state
+        as before.
+
+        Parameters
+        ----------
+        restart : int
+            Index of the first line to lex; it starts in its stored state.
+        texts : list of str
+            Texts of the lines replacing `self.lines[restart:resume]`.
+        resume : int
+            Index of the first old line after the replaced ones.
+
+        Returns
+        -------
+        int
+            Number of lines up to the last one lexed, i.e. its 1-based line.
+        """
+        old = self.lines
+        lexer = self.lexer
+        if restart < len(old):
+            start = old[restart]
+            state, comment_level, skip = start.state, start.comment_level, start.skip
+        else:
+            state, comment_level, skip = 'INITIAL', 0, 0
+        eof_handlers = lexer.lexstateeoff
+        lexer.lexstateeoff = {}
+        lexer.begin(state)
+        lexer.comment_level = comment_level
+        self.errors.clear()
+        carry = ''
+        new_lines = []
+        total = restart + len(texts) + len(old) - resume
+        try:
+            index = 0
+            while True:
+                if index < len(texts):
+                    text = texts[index]
+                else:
+                    if resume == len(old):
+                        break
+                    line = old[resume]
+                    if not carry and line.same_start(lexer.current_state(), lexer.comment_level, skip):
+                        break
+                    text = line.text
+                    resume += 1
+                new_line = LexLine(text, lexer.current_state(), lexer.comment_level, skip)
+                if restart + len(new_lines) == total - 1:
+                    lexer.lexstateeoff = eof_handlers
+                    lexer.begin(lexer.current_state())
+                carry, skip = self._lex_line(new_line, carry)
+                new_lines.append(new_line)
+                index += 1
+        finally:
+            lexer.lexstateeoff = eof_handlers
+            self.errors.clear()
+        old[restart:resume] = new_lines
+        return restart + len(new_lines)
+
+    def _lex_line(self, line: LexLine, carry: str) -> Tuple[str, int]:
+        """
+        Lexes one line, storing its tokens and errors relative to the line.
+
+        Parameters
+        ----------
+        line : LexLine
+            Line to lex, holding its text and starting state.
+        carry : str
+            Previous lines holding an unfinished raw string.
+
+        Returns
+        -------
+        tuple
+            The carry and skip for the next line, see `BaseLexer._lex_segment`.
+        """
+        lexer = self.lexer
+        lexer.lineno = 0
+        errors = self.errors
+        first_error = len(errors)
+        offset = -len(carry)
+        segment = self._lex_segment(carry, line.text, line.skip, offset, 1)
+        tokens = line.tokens
+        try:
+            while True:
+                tok = next(segment)
+                tokens.append((tok.type, tok.value, tok.lexpos, tok.lineno))
+                if tok.type == 'STRING':
+                    line.string_starts.append(lexer.string_start + offset)
+        except StopIteration as stop:
+            carry, skip = stop.value[:2]
+        line.newlines = lexer.lineno
+        line.errors = [
+            (err.lineno, err.col, err.message, err.lexpos) for err in errors[first_error:]
+        ]
+        del errors[first_error:]
+        return carry, skip
+
+    def text(self) -> str:
+        """
+        Returns the current text of the document.
+
+        Returns
+        -------
+        str
+            Text of the document.
+        """
+        return ''.join(line.text for line in self.lines)
+
+    def line_count(self) -> int:
+        """
+        Returns the number of lines in the document.
+
+        Returns
+        -------
+        int
+            Number of lines, including an empty last line after a final newline.
+        """
+        return len(self.lines)
+
+    def line_tokens(self, line: int) -> List[tuple]:
+        """
+        Returns the tokens whose position falls in a line.
+
+        Parameters
+        ----------
+        line : int
+            Line number, starting at 1.
+
+        Returns
+        -------
+        list of tuple
+            (type, value, column) of each token, columns starting at 0.
+        """
+        return [(tok_type, value, col) for tok_type, value, col, _ in self.lines[line - 1].tokens]
+
+    def line_spans(self, line: int) -> List[tuple]:
+        """
+        Returns the columns of the text of each token whose position falls
+        in a line.
+
+        Parameters
+        ----------
+        line : int
+            Line number, starting at 1.
+
+        Returns
+        -------
+        list of tuple
+            (type, start column, end column) of each token, columns starting
+            at 0 and the end excluded. A raw string that began on a previous
+            line starts at column 0.
+        """
+        lex_line = self.lines[line - 1]
+        string_starts = iter(lex_line.string_starts)
+        spans = []
+        for tok_type, value, pos, _ in lex_line.tokens:
+            if tok_type == 'STRING':
+                start, end = next(string_starts), pos + 1
+            elif tok_type == 'RAW_STRING':
+                start, end = max(pos - len(value) - 1, 0), pos + 1
+            else:
+                start, end = pos, pos + len(str(value))
+            spans.append((tok_type, start, end))
+        return spans
+
+    def get_tokens(self) -> List[lex.LexToken]:
+        """
+        Returns the tokens of the whole document with absolute positions.
+
+        Returns
+        -------
+        list
+            Tokens equal to those of `tokenize` on the document text.
+        """
+        tokens = []
+        offset, lineno = 0, 1
+        for line in self.lines:
+            for tok_type, value, pos, line_offset in line.tokens:
+                tok = lex.LexToken()
+                tok.type = tok_type
+                tok.value = value
+                tok.lineno = lineno + line_offset
+                tok.lexpos = offset + pos
+                tokens.append(tok)
+            offset += len(line.text)
+            lineno += line.newlines
+        return tokens
+
+    def tokens_view(self) -> DocumentTokens:
+        """
+        Returns the tokens of the whole document without building them,
+        see `DocumentTokens`.
+
+        Returns
+        -------
+        DocumentTokens
+            Tokens equal to those of `get_tokens`.
+        """
+        return DocumentTokens(self.lines)
+
+    def get_errors(self) -> list:
+        """
+        Returns the lexer errors of the whole document.
+
+        Returns
+        -------
+        list
+            List of LexerError objects, equal to those of `tokenize` on the
+            document text.
+        """
+        errors = []
+        line_index = None
+        offset, lineno = 0, 1
+        for line in self.lines:
+            for line_offset, col, message, pos in line.errors:
+                if line_index is None:
+                    line_index = LineIndex(self.text())
+                errors.append(LexerError(
+                    lineno + line_offset, col, message, lexpos=offset + pos, line_index=line_index
+                ))
+            offset += len(line.text)
+            lineno += line.newlines
+        return errors
@@ -0,0 +1,343 @@
+from typing import List
+
+import ply.lex as lex
+from Modules.componentsLEXER.Incremental_Lexer import IncrementalLexer
+from Modules.componentsLEXER.Language_Parser import LanguageParser
+from Modules.componentsLEXER.Core_Errors import ParseError
+from Modules.componentsLEXER.Position import LineIndex
+
+class ParseChunk:
+    """
+    Group of whole lines of an `IncrementalParser` document holding one or
+    more consecutive top-level statements.
+
+    Attributes
+    ----------
+    line_count : int
+        Number of lines in the chunk.
+    stmts : list
+        Top-level statements parsed from the chunk.
+    errors : list of tuple
+        (line counter offset, column, message, value, position) of each
+        syntax error, relative to the first line of the chunk. A chunk
+        with errors holds a whole region that failed to parse.
+    """
+    __slots__ = ('line_count', 'stmts', 'errors')
+
+    def __init__(self, line_count: int, stmts: list, errors: list = None) -> None:
+        """
+        Initializes a ParseChunk.
+
+        Parameters
+        ----------
+        line_count : int
+            Number of lines in the chunk.
+        stmts : list
+            Top-level statements parsed from the chunk.
+        errors : list of tuple, optional
+            Syntax errors of the chunk, by default none.
+        """
+        self.line_count = line_count
+        self.stmts = stmts
+        self.errors = errors or []
+
+class IncrementalParser:
+    """
+    Parser that keeps the AST of a document up to date across edits.
+
+    The document is split in chunks of whole lines, each holding the
+    top-level statements that start and end in it. After an edit, only
+    the chunks overlapping the re-lexed lines are parsed again; the
+    statements of every other chunk are spliced back into the new
+    `("program", [...])` tree as the same objects.
+
+    A region is widened when its result could depend on its neighbours:
+    when it starts with a token that can't start a statement (such as
+    `else`), when it is followed by one, or when it fails at its end. For
+    documents without syntax errors the tree is the same as
+    `LanguageParser.parse`. Otherwise each error is kept in the region it
+    was found in, instead of discarding everything parsed before it.
+
+    Attributes
+    ----------
+    lexer : IncrementalLexer
+        Tokens of the document, kept up to date line by line.
+    parser : LanguageParser
+        Parser used for the re-parsed regions.
+    chunks : list of ParseChunk
+        Chunks covering every line of the document, in order.
+    ast : tuple or None
+        Current AST of the document.
+    """
+    def __init__(self, text: str = '') -> None:
+        """
+        Initializes the IncrementalParser and parses the initial text.
+
+        Parameters
+        ----------
+        text : str, optional
+            Initial text of the document, by default empty.
+        """
+        self.lexer = IncrementalLexer()
+        self.parser = LanguageParser()
+        # Tokens with an action in the initial state are those that can
+        # start a statement.
+        self._start_tokens = frozenset(self.parser.parser.action[0])
+        self.chunks = []
+        self.ast = None
+        self.set_text(text)
+
+    def set_text(self, text: str) -> tuple:
+        """
+        Replaces the whole document and parses it.
+
+        Parameters
+        ----------
+        text : str
+            New text of the document.
+
+        Returns
+        -------
+        tuple or None
+            The AST of the document.
+        """
+        self.lexer.set_text(text)
+        self.chunks = []
+        self._reparse(0, 0, 0, self.lexer.line_count())
+        return self.ast
+
+    def edit(self, start_line: int, start_col: int, end_line: int, end_col: int,
+             text: str) -> tuple:
+        """
+        Replaces a range of the document and updates the AST.
+
+        Lines start at 1 and columns at 0, as in `IncrementalLexer.edit`.
+
+        Parameters
+        ----------
+        start_line : int
+            Line where the replaced range begins.
+        start_col : int
+            Column where the replaced range begins.
+        end_line : int
+            Line where the replaced range ends.
+        end_col : int
+            Column where the replaced range ends (exclusive).
+        text : str
+            Text inserted in place of the range.
+
+        Returns
+        -------
+        tuple or None
+            The AST of the document.
+        """
+        old_count = self.lexer.line_count()
+        first, last = self.lexer.edit(start_line, start_col, end_line, end_col, text)
+        delta = self.lexer.line_count() - old_count
+        # Lines [first - 1, last - delta) of the old document were replaced.
+        changed_start, changed_end = first - 1, last - delta
+        chunk_start = chunk_end = None
+        line = 0
+        for index, chunk in enumerate(self.chunks):
+            end = line + chunk.line_count
+            if chunk_start is None and end > changed_start:
+                chunk_start, line_start = index, line
+            if end >= changed_end:
+                chunk_end, line_end = index + 1, end
+                break
+            line = end
+        self._reparse(chunk_start, chunk_end, line_start, line_end + delta)
+        return self.ast
+
+    def _fragment_tokens(self, line_start: int, line_end: int) -> tuple:
+        """
+        Builds the tokens of a range of lines, relative to its first line.
+
+        Parameters
+        ----------
+        line_start : int
+            Index of the first line.
+        line_end : int
+            Index after the last line.
+
+        Returns
+        -------
+        tuple
+            Text of the lines, their tokens, the line index of each token
+            and the line counter at the end of the range.
+        """
+        tokens, token_lines = [], []
+        offset, lineno = 0, 0
+        lines = self.lexer.lines[line_start:line_end]
+        for index, line in enumerate(lines):
+            for tok_type, value, pos, line_offset in line.tokens:
+                tok = lex.LexToken()
+                tok.type = tok_type
+                tok.value = value
+                tok.lineno = lineno + line_offset
+                tok.lexpos = offset + pos
+                tokens.append(tok)
+                token_lines.append(index)
+            offset += len(line.text)
+            lineno += line.newlines
+        return ''.join(line.text for line in lines), tokens, token_lines, lineno
+
+    def _first_token(self, chunk_index: int, line: int) -> str:
+        """
+        Returns the type of the first token of a chunk.
+
+        Parameters
+        ----------
+        chunk_index : int
+            Index of the chunk.
+        line : int
+            Index of the first line of the chunk.
+
+        Returns
+        -------
+        str or None
+            Token type, or None if the chunk has no tokens.
+        """
+        for text_line in self.lexer.lines[line:line + self.chunks[chunk_index].line_count]:
+            if text_line.tokens:
+                return text_line.tokens[0][0]
+        return None
+
+    def _reparse(self, chunk_start: int, chunk_end: int, line_start: int, line_end: int) -> None:
+        """
+        Parses the lines replacing `self.chunks[chunk_start:chunk_end]`,
+        widening the region as needed, and rebuilds the AST.
+
+        Parameters
+        ----------
+        chunk_start : int
+            Index of the first replaced chunk.
+        chunk_end : int
+            Index after the last replaced chunk.
+        line_start : int
+            Index of the first line of the region.
+        line_end : int
+            Index after the last line of the region.
+
+        Returns
+        -------
+            None
+        """
+        chunks = self.chunks
+        start_tokens = self._start_tokens
+        while True:
+            text, tokens, token_lines, end_lineno = self._fragment_tokens(line_start, line_end)
+            if chunk_start > 0 and (not tokens or tokens[0].type not in start_tokens):
+                # It may continue the statement before it (e.g. `else`), or
+                # it only holds comments, which go with a statement.
+                chunk_start -= 1
+                line_start -= chunks[chunk_start].line_count
+                continue
+            if not tokens and chunk_end < len(chunks):
+                line_end += chunks[chunk_end].line_count
+                chunk_end += 1
+                continue
+            ast, starts = self.parser.parse_fragment(text, tokens, end_lineno)
+            errors = self.parser.get_errors()
+            stmts = ast[1] if ast else []
+            if errors:
+                at_end = any(err.lexpos == len(text) for err in errors)
+                if at_end and chunk_end < len(chunks):
+                    # Failed for lack of input: take in twice as many chunks.
+                    for _ in range(max(1, chunk_end - chunk_start)):
+                        if chunk_end == len(chunks):
+                            break
+                        line_end += chunks[chunk_end].line_count
+                        chunk_end += 1
+                    continue
+                new_chunks = [ParseChunk(line_end - line_start, stmts, [
+                    (err.lineno, err.col, err.message, err.value, err.lexpos) for err in errors
+                ])]
+            else:
+                if (chunk_end < len(chunks)
+                        and self._first_token(chunk_end, line_end) not in start_tokens):
+                    line_end += chunks[chunk_end].line_count
+                    chunk_end += 1
+                    continue
+                new_chunks = self._split_chunks(stmts, starts, tokens, token_lines, line_end - line_start)
+            break
+        chunks[chunk_start:chunk_end] = new_chunks
+        program = [stmt for chunk in chunks for stmt in chunk.stmts]
+        self.ast = ("program", program) if program else None
+
+    @staticmethod
+    def _split_chunks(stmts: list, starts: List[int], tokens: list, token_lines: List[int],
+                      line_count: int) -> List[ParseChunk]:
+        """
+        Splits a parsed region into chunks at the lines where one statement
+        ends and the next one starts.
+
+        Parameters
+        ----------
+        stmts : list
+            Top-level statements of the region.
+        starts : list of int
+            Position where each statement starts.
+        tokens : list
+            Tokens of the region.
+        token_lines : list of int
+            Line index of each token in the region.
+        line_count : int
+            Number of lines in the region.
+
+        Returns
+        -------
+        list of ParseChunk
+            Chunks covering the whole region.
+        """
+        token_index = {tok.lexpos: index for index, tok in enumerate(tokens)}
+        chunks = []
+        chunk_line, chunk_stmts = 0, []
+        for stmt, start in zip(stmts, starts):
+            index = token_index[start]
+            if chunk_stmts and token_lines[index - 1] < token_lines[index]:
+                line = token_lines[index]
+                chunks.append(ParseChunk(line - chunk_line, chunk_stmts))
+                chunk_line, chunk_stmts = line, []
+            chunk_stmts.append(stmt)
+        chunks.append(ParseChunk(line_count - chunk_line, chunk_stmts))
+        return chunks
+
+    def get_tokens(self) -> list:
+        """
+        Returns the tokens of the whole document.
+
+        Returns
+        -------
+        list
+            Tokens with absolute positions, see `IncrementalLexer.get_tokens`.
+        """
+        return self.lexer.get_tokens()
+
+    def get_errors(self) -> list:
+        """
+        Returns the lexer and syntax errors of the document, in the order
+        they appear in the text, as `LanguageParser.get_errors` does.
+
+        Returns
+        -------
+        list
+            List of LexerError and ParseError objects.
+        """
+        errors = [(err.lexpos, 0, err) for err in self.lexer.get_errors()]
+        if any(chunk.errors for chunk in self.chunks):
+            lines = self.lexer.lines
+            line_index = LineIndex(self.lexer.text())
+            offset, lineno, line = 0, 1, 0
+            for chunk in self.chunks:
+                for line_offset, col, message, value, pos in chunk.errors:
+                    errors.append((offset + pos, 1, ParseError(
+                        lineno + line_offset, col, message, value,
+                        lexpos=offset + pos, line_index=line_index
+                    )))
+                for text_line in lines[line:line + chunk.line_count]:
+                    offset += len(text_line.text)
+                    lineno += text_line.newlines
+                line += chunk.line_count
+        errors.sort(key=lambda item: item[:2])
+        return [err for _, _, err in errors]
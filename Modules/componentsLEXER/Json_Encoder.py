@@ -0,0 +1,331 @@
+import json
+from json.encoder import encode_basestring, encode_basestring_ascii
+from types import GeneratorType
+from typing import Any, Dict, Iterable, TextIO
+
+from Modules.componentsLEXER.Ast_Nodes import Node
+from Modules.componentsLEXER.Core_Errors import ParseError
+from Modules.componentsLEXER.Core_Tokens import ALL_TOKENS
+from Modules.componentsLEXER.Flat_Ast import FlatAst, FlatRef
+from Modules.componentsLEXER.Token_Buffer import TokenBuffer
+
+# Marks the end of the items of a container being written.
+_END = object()
+# Tuple nodes that may hold a whole program, written item by item; any
+# other node is bounded by the size of a statement.
+_STREAMED_KINDS = frozenset(('program', 'block', 'func_def', 'if_stmt', 'else', 'else_if', 'for_stmt'))
+
+class ResultJsonEncoder:
+    """
+    Writes analysis results as JSON to a text file object, incrementally.
+
+    The output is the same as `json.dumps` over the result with each token
+    turned into a dictionary of its type, value, line number and position,
+    and each error into one of its kind ('lexer' or 'parser'), line,
+    column, message and, for parser errors with one, value. But nothing is
+    built in memory besides a small write buffer: tokens and errors are
+    written as they are read, and the AST is walked with an explicit
+    stack, so deep trees don't hit the recursion limit. Each distinct token value is encoded only once.
+    Tuple, `Node` and `FlatAst` trees give the same output.
+
+    Attributes
+    ----------
+    out : TextIO
+        File object the JSON is written to.
+    ensure_ascii : bool
+        Whether non-ASCII characters are escaped, as in `json.dumps`.
+    buffer_size : int
+        Number of pieces gathered before they are written to `out`.
+    """
+    def __init__(self, out: TextIO, ensure_ascii: bool = False, buffer_size: int = 4096) -> None:
+        """
+        Initializes the encoder.
+
+        Parameters
+        ----------
+        out : TextIO
+            File object the JSON is written to.
+        ensure_ascii : bool, optional
+            Whether non-ASCII characters are escaped, by default False.
+        buffer_size : int, optional
+            Number of pieces gathered before each write, by default 4096.
+        """
+        self.out = out
+        self.ensure_ascii = ensure_ascii
+        self.buffer_size = buffer_size
+        self._encode_str = encode_basestring_ascii if ensure_ascii else encode_basestring
+        self._pieces = []
+        self._type_names = [self._encode_str(name) for name in ALL_TOKENS]
+        self._encode_tree = json.JSONEncoder(ensure_ascii=ensure_ascii, check_circular=False).encode
+
+    def _write(self, text: str) -> None:
+        """
+        Adds a piece of output, writing the buffer when it is full.
+
+        Parameters
+        ----------
+        text : str
+            Piece of JSON text.
+
+        Returns
+        -------
+            None
+        """
+        pieces = self._pieces
+        pieces.append(text)
+        if len(pieces) >= self.buffer_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Writes the buffered output to `out`.
+
+        Returns
+        -------
+            None
+        """
+        if self._pieces:
+            self.out.write(''.join(self._pieces))
+            self._pieces.clear()
+
+    def _scalar(self, value: Any) -> str:
+        """
+        Encodes a plain value.
+
+        Parameters
+        ----------
+        value : str, int, float, bool or None
+            Value to encode.
+
+        Returns
+        -------
+        str or None
+            The JSON text, or None if the value is not a plain value.
+        """
+        if value is None:
+            return 'null'
+        if value is True:
+            return 'true'
+        if value is False:
+            return 'false'
+        if isinstance(value, str):
+            return self._encode_str(value)
+        if isinstance(value, int):
+            return int.__repr__(value)
+        if isinstance(value, float):
+            return float.__repr__(value)
+        return None
+
+    def write_value(self, value: Any) -> None:
+        """
+        Writes a value: a plain value, a dict with string keys, a list,
+        tuple or iterator (as an array), or an AST.
+
+        Parameters
+        ----------
+        value : any
+            Value to write.
+
+        Returns
+        -------
+            None
+        """
+        write = self._write
+        scalar = self._scalar
+        flat = None
+        # Each entry holds the iterator over the items of an open
+        # container, whether no item was written yet, the closing text and
+        # whether the items are (key, value) pairs.
+        stack = [[iter((value,)), True, '', False]]
+        while stack:
+            entry = stack[-1]
+            item = next(entry[0], _END)
+            if item is _END:
+                stack.pop()
+                write(entry[2])
+                continue
+            if entry[1]:
+                entry[1] = False
+            else:
+                write(', ')
+            if entry[3]:
+                key, item = item
+                if not isinstance(key, str):
+                    raise TypeError(f"keys must be str, not {type(key).__name__}")
+                write(self._encode_str(key) + ': ')
+            text = scalar(item)
+            if text is not None:
+                write(text)
+                continue
+            if item.__class__ is tuple and item and item[0] not in _STREAMED_KINDS:
+                # Expressions and simple statements are small: let the C
+                # encoder of `json` write them in one go. Pairs holding
+                # `Node` objects and very deep expressions are walked below.
+                try:
+                    write(self._encode_tree(item))
+                    continue
+                except (TypeError, RecursionError):
+                    pass
+            if isinstance(item, FlatAst):
+                if item.root < 0:
+                    write('null')
+                    continue
+                flat, item = item, FlatRef(item.root)
+            if isinstance(item, dict):
+                write('{')
+                stack.append([iter(item.items()), True, '}', True])
+            elif item.__class__ is FlatRef:
+                write('[')
+                stack.append([flat.iter_fields(item.index), True, ']', False])
+            elif isinstance(item, Node):
+                write('[')
+                fields = (getattr(item, name) for name in item.__slots__)
+                stack.append([iter((item.kind, *fields)), True, ']', False])
+            elif isinstance(item, (list, tuple, GeneratorType)):
+                write('[')
+                stack.append([iter(item), True, ']', False])
+            else:
+                raise TypeError(f"Object of type {type(item).__name__} is not JSON serializable")
+
+    def write_tokens(self, tokens: Iterable[Any]) -> None:
+        """
+        Writes a token stream as an array of objects with type, value,
+        line number and position.
+
+        Parameters
+        ----------
+        tokens : list or TokenBuffer
+            Tokens to write.
+
+        Returns
+        -------
+            None
+        """
+        write = self._write
+        separator = '['
+        if isinstance(tokens, TokenBuffer):
+            type_names = self._type_names
+            values = [self._scalar(value) for value in tokens.values]
+            for code, value_id, lineno, lexpos in zip(
+                    tokens.types, tokens.value_ids, tokens.linenos, tokens.lexposs):
+                write(f'{separator}{{"type": {type_names[code]}, "value": {values[value_id]}, '
+                      f'"lineno": {lineno}, "lexpos": {lexpos}}}')
+                separator = ', '
+        else:
+            type_names = dict(zip(ALL_TOKENS, self._type_names))
+            values = {}
+            for tok in tokens:
+                value = tok.value
+                key = (value.__class__, value)
+                text = values.get(key)
+                if text is None:
+                    text = values[key] = self._scalar(value)
+                    if text is None:
+                        raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+                write(f'{separator}{{"type": {type_names[tok.type]}, "value": {text}, '
+                      f'"lineno": {tok.lineno}, "lexpos": {tok.lexpos}}}')
+                separator = ', '
+        write(']' if separator == ', ' else '[]')
+
+    def write_errors(self, errors: Iterable[Any]) -> None:
+        """
+        Writes LexerError and ParseError objects as an array of objects
+        with kind, line, column, message and, for parser errors with a
+        value, the value.
+
+        Parameters
+        ----------
+        errors : list
+            Errors to write.
+
+        Returns
+        -------
+            None
+        """
+        write = self._write
+        write('[')
+        first = True
+        for err in errors:
+            if not first:
+                write(', ')
+            first = False
+            is_parse_error = isinstance(err, ParseError)
+            kind = "parser" if is_parse_error else "lexer"
+            write(f'{{"kind": "{kind}", "lineno": {err.lineno}, "col": {err.col}, "message": ')
+            write(self._encode_str(err.message))
+            if is_parse_error and err.value is not None:
+                write(', "value": ')
+                self.write_value(err.value)
+            write('}')
+        write(']')
+
+    def write_result(self, result: Dict[str, Any]) -> None:
+        """
+        Writes an analysis result as one JSON object, with the keys of
+        `LexerCore.process` after the 'path' key, if any. Results holding
+        an 'error' key (files that couldn't be read) are written as is.
+
+        Parameters
+        ----------
+        result : dict
+            Result returned by `LexerCore.process` or
+            `BatchAnalyzer.analyze_file`.
+
+        Returns
+        -------
+            None
+        """
+        if "error" in result:
+            self.write_value(result)
+            return
+        write = self._write
+        write('{')
+        if "path" in result:
+            write('"path": ')
+            self.write_value(result["path"])
+            write(', ')
+        write('"tokens": ')
+        self.write_tokens(result["tokens"])
+        write(', "ast": ')
+        self.write_value(result["ast"])
+        write(', "lexer_errors": ')
+        self.write_errors(result["lexer_errors"])
+        write(', "parser_errors": ')
+        self.write_errors(result["parser_errors"])
+        write('}')
+
+    def write_json(self, result: Dict[str, Any]) -> None:
+        """
+        Writes an analysis result as a JSON document and flushes it.
+
+        Parameters
+        ----------
+        result : dict
+            Result to write, see `write_result`.
+
+        Returns
+        -------
+            None
+        """
+        self.write_result(result)
+        self._write('\n')
+        self.flush()
+
+    def write_jsonl(self, results: Iterable[Dict[str, Any]]) -> None:
+        """
+        Writes analysis results as JSON Lines, one result per line, each
+        one flushed as soon as it is written.
+
+        Parameters
+        ----------
+        results : Iterable[dict]
+            Results to write, see `write_result`.
+
+        Returns
+        -------
+            None
+        """
+        for result in results:
+            self.write_result(result)
+            self._write('\n')
+            self.flush()
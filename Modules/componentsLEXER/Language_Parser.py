@@ -1,8 +1,18 @@
+import hashlib
+
 import ply.yacc as yacc
 from Modules.componentsLEXER.Base_Lexer import BaseLexer
+from Modules.componentsLEXER.Symbol_Table import SymbolTable
+from Modules.componentsLEXER.Ast_Span import SpannedNode
+from Modules.componentsLEXER.Ast_Nodes import AST_FORMAT_VERSION, NODE_CLASSES
+from Modules.componentsLEXER.Flat_Ast import FlatAst
 from Modules.componentsLEXER.Core_Errors import ParseError
+from Modules.componentsLEXER.Token_Buffer import TokenBuffer
 from Modules.componentsLEXER.Core_States import PARSER_PRECEDENCE
 
+# LALR tables built by PLY, keyed by the signature of the grammar.
+_PARSER_CACHE = {}
+
 class LanguageParser(BaseLexer):
     """
     Handles syntactic analysis (parsing) of the source code using PLY.
@@ -16,13 +26,203 @@ class LanguageParser(BaseLexer):
         Operator precedence rules for the parser.
     parser : yacc.YaccParser
         The PLY parser instance.
+    mode_parsers : dict
+        Parsers for the `spans`, `nodes` and `flat` modes of `parse`, keyed
+        by (spans, nodes, flat) and built on first use.
+    PROGRESS_TOKENS : int
+        Number of tokens between two calls of the `progress` callback of
+        `parse`.
     """
     precedence = PARSER_PRECEDENCE
-    def __init__(self):
-        super().__init__()
-        self.parser = yacc.yacc(module=self, start='program', debug=False)
+    start = 'program'
+    PROGRESS_TOKENS = 2048
+    def __init__(self, symbols: SymbolTable = None):
+        """
+        Initializes the parser and its lexer.
+
+        Parameters
+        ----------
+        symbols : SymbolTable or None, optional
+            Symbol table used by the lexer, see `BaseLexer`, by default
+            one owned by the parser.
+        """
+        super().__init__(symbols)
+        self.parser = self._build_parser()
+        self.mode_parsers = {}
+        self._stmt_starts = None
+        self._flat = None
+
+    @classmethod
+    def _grammar_signature(cls) -> tuple:
+        """
+        Computes a key that identifies the grammar of the class.
+
+        Returns
+        -------
+        tuple
+            Hashable signature of the start symbol, precedence, tokens and
+            the docstrings and code of the `p_` rules.
+        """
+        rules = []
+        for name in dir(cls):
+            if name.startswith('p_') and name != 'p_error':
+                rule = getattr(cls, name)
+                rules.append((name, rule.__doc__, cls._code_signature(rule.__code__)))
+        return (cls.start, tuple(cls.precedence), tuple(cls.tokens), tuple(rules))
+
+    @classmethod
+    def _methods_signature(cls) -> tuple:
+        """
+        Computes a key that identifies the code of every method of the
+        class and its bases, such as `p_error` and the helpers called by
+        the rules, which decide the errors and the AST but not the LALR
+        tables.
+
+        Returns
+        -------
+        tuple
+            Hashable signature of the class name, name and code of each
+            method.
+        """
+        methods = []
+        for klass in cls.__mro__[:-1]:
+            for name, member in sorted(vars(klass).items()):
+                if isinstance(member, property):
+                    member = member.fget
+                code = getattr(getattr(member, '__func__', member), '__code__', None)
+                if code is not None:
+                    methods.append((klass.__name__, name, cls._code_signature(code)))
+        return tuple(methods)
+
+    @classmethod
+    def grammar_version(cls) -> str:
+        """
+        Returns a fingerprint of the lexing rules and the grammar.
+
+        It changes whenever tokens, reserved words, states, lexer rules,
+        precedence, grammar productions, the code of any method of the
+        lexer and parser classes or the AST format version change, so it
+        can be used to invalidate cached analysis results. Edits that only
+        move code within the files (comments, blank lines) keep it.
+
+        The signatures keying the lexers and LALR tables built by PLY are
+        narrower, since those only depend on the rules.
+
+        Returns
+        -------
+        str
+            Hexadecimal digest of the lexer, grammar and method signatures.
+        """
+        signature = repr((
+            cls._lexer_signature(), cls._grammar_signature(), cls._methods_signature(),
+            sorted(cls.reserved.items()), AST_FORMAT_VERSION
+        ))
+        return hashlib.sha256(signature.encode('utf-8')).hexdigest()
+
+    def _build_parser(self) -> yacc.LRParser:
+        """
+        Returns a PLY parser whose grammar actions are bound to this instance.
+
+        The grammar is reflected and its LALR tables are built (or read
+        from `parsetab`) once per process; later instances reuse the
+        cached tables and only rebind the production callables.
+
+        Returns
+        -------
+        yacc.LRParser
+            Parser ready to be fed by `self.lexer`.
+        """
+        signature = self._grammar_signature()
+        if signature not in _PARSER_CACHE:
+            parser = yacc.yacc(module=self, start=self.start, debug=False)
+            _PARSER_CACHE[signature] = (parser.action, parser.goto, parser.productions)
+            return parser
+        return self._parser_from_tables(lambda func: func)
+
+    def _get_mode_parser(self, spans: bool, nodes: bool, flat: bool = False) -> yacc.LRParser:
+        """
+        Returns the parser for the given `parse` mode, building it on first use.
 
-    def parse(self, text: str) -> any:
+        Every grammar action is wrapped so that, after it runs, tuple nodes
+        are turned into typed `Node` objects (`nodes`) or stored in the
+        `FlatAst` being built (`flat`), and the span of the symbol is
+        computed from the spans of its children and stored on the node
+        (`spans`).
+
+        Parameters
+        ----------
+        spans : bool
+            Whether nodes record their source span. The parser then expects
+            tokens annotated by `_spanning_token_func`.
+        nodes : bool
+            Whether nodes are built as `Node` objects instead of tuples.
+        flat : bool, optional
+            Whether nodes are stored in `self._flat` as soon as they are
+            built, leaving a `FlatRef` in their place, by default False.
+
+        Returns
+        -------
+        yacc.LRParser
+            Parser whose actions build the requested AST.
+        """
+        key = (spans, nodes, flat)
+        parser = self.mode_parsers.get(key)
+        if parser is not None:
+            return parser
+
+        def wrap(func):
+            def action(p):
+                func(p)
+                node = p[0]
+                span = None
+                if spans:
+                    children = [child.span for child in p.slice[1:] if getattr(child, 'span', None)]
+                    if children:
+                        span = (children[0][0], children[-1][1], children[0][2], children[-1][3])
+                        p.slice[0].span = span
+                if type(node) is not tuple:
+                    return
+                if flat:
+                    p[0] = self._flat.add_node(node[0], node[1:], span)
+                elif nodes:
+                    p[0] = NODE_CLASSES[node[0]](*node[1:], span=span)
+                elif span is not None:
+                    p[0] = SpannedNode(node, *span)
+            return action
+        parser = self._parser_from_tables(wrap)
+        self.mode_parsers[key] = parser
+        return parser
+
+    def _parser_from_tables(self, wrap: 'Callable') -> yacc.LRParser:
+        """
+        Builds a parser from the cached LALR tables of the grammar.
+
+        Parameters
+        ----------
+        wrap : Callable
+            Applied to each bound grammar action before it is installed.
+
+        Returns
+        -------
+        yacc.LRParser
+            Parser whose actions are bound to this instance.
+        """
+        action, goto, productions = _PARSER_CACHE[self._grammar_signature()]
+        table = yacc.LRTable()
+        table.lr_action = action
+        table.lr_goto = goto
+        table.lr_productions = [
+            yacc.MiniProduction(prod.str, prod.name, prod.len, prod.func, prod.file, prod.line)
+            for prod in productions
+        ]
+        table.bind_callables({
+            prod.func: wrap(getattr(self, prod.func))
+            for prod in table.lr_productions if prod.func
+        })
+        return yacc.LRParser(table, self.p_error)
+
+    def parse(self, text: str, tokens: list = None, spans: bool = False,
+              nodes: bool = False, flat: bool = False, progress: 'Callable' = None) -> any:
         """
         Parses the input text and returns the Abstract Syntax Tree (AST).
 
@@ -30,6 +230,25 @@ class LanguageParser(BaseLexer):
         ----------
         text : str
             The source code to be parsed.
+        tokens : list or TokenBuffer, optional
+            If given, every token pulled by the parser is appended to it,
+            so the token stream is captured in the same pass that builds
+            the AST, by default None.
+        spans : bool, optional
+            If True, every node is a `SpannedNode` carrying its start and
+            end position and line, by default False.
+        nodes : bool, optional
+            If True, the AST is built from typed `Node` objects instead of
+            tuples, by default False.
+        flat : bool, optional
+            If True, the AST is returned as a `FlatAst`; each node is moved
+            into it as soon as it is reduced, so the tree never exists as
+            objects. Takes precedence over `nodes`, by default False.
+        progress : Callable or None, optional
+            If given, called every `PROGRESS_TOKENS` tokens with the
+            position reached by the lexer and the length of the input.
+            It may raise `AnalysisCancelled` to stop the analysis, by
+            default None.
 
         Returns
         -------
@@ -37,11 +256,185 @@ class LanguageParser(BaseLexer):
             The Abstract Syntax Tree representing the parsed program.
         """
         self.errors.clear()
-        return self.parser.parse(text, lexer=self.lexer)
+        self._reset_lexer(text)
+        get_token = self.lexer.token
+        if tokens is not None:
+            get_token = self._recording_token_func(tokens)
+        parser = self.parser
+        if spans or nodes or flat:
+            parser = self._get_mode_parser(spans, nodes and not flat, flat)
+        if spans:
+            get_token = self._spanning_token_func(get_token)
+        if progress is not None:
+            get_token = self._progress_token_func(get_token, progress, len(text))
+        if not flat:
+            return parser.parse(lexer=self.lexer, tokenfunc=get_token)
+        self._flat = FlatAst(spans=spans)
+        try:
+            root = parser.parse(lexer=self.lexer, tokenfunc=get_token)
+        finally:
+            flat_ast, self._flat = self._flat, None
+        if root is None:
+            return None
+        flat_ast.root = root.index
+        return flat_ast
+
+    def parse_buffer(self, buffer: TokenBuffer) -> any:
+        """
+        Parses an already tokenized input stored in a `TokenBuffer`.
+
+        Only parser errors are reported, since lexing is not repeated.
+
+        Parameters
+        ----------
+        buffer : TokenBuffer
+            Tokens to parse, with the source text they come from.
+
+        Returns
+        -------
+        any
+            The Abstract Syntax Tree representing the parsed program.
+        """
+        self.errors.clear()
+        self._reset_lexer(buffer.text or '')
+        if buffer.end_lineno is not None:
+            self.lexer.lineno = buffer.end_lineno
+        tokens = buffer.iter_lextokens()
+        return self.parser.parse(lexer=self.lexer, tokenfunc=lambda: next(tokens, None))
+
+    def parse_fragment(self, text: str, tokens: list, end_lineno: int) -> tuple:
+        """
+        Parses a list of tokens taken from a piece of a larger input.
+
+        Symbol positions are tracked, so the position where each top-level
+        statement starts is reported along with the AST.
+
+        Parameters
+        ----------
+        text : str
+            Source text of the piece, used to report errors.
+        tokens : list
+            Tokens of the piece, with positions relative to `text`.
+        end_lineno : int
+            Line counter of the lexer at the end of the piece.
+
+        Returns
+        -------
+        tuple
+            The AST (or None) and the list of positions where its top-level
+            statements start.
+        """
+        self.errors.clear()
+        self._reset_lexer(text)
+        self.lexer.lineno = end_lineno
+        feed = iter(tokens)
+        self._stmt_starts = {}
+        try:
+            ast = self.parser.parse(
+                lexer=self.lexer, tokenfunc=lambda: next(feed, None), tracking=True
+            )
+            starts = self._stmt_starts.get(id(ast[1]), []) if ast else []
+        finally:
+            self._stmt_starts = None
+        return ast, starts
+
+    def _recording_token_func(self, tokens: list) -> 'Callable':
+        """
+        Builds a token function for yacc that records each token it returns.
+
+        Parameters
+        ----------
+        tokens : list
+            List where the produced tokens are appended.
+
+        Returns
+        -------
+        Callable
+            Function with the same contract as `lexer.token`.
+        """
+        next_token = self.lexer.token
+        append = tokens.append
+
+        def token():
+            tok = next_token()
+            if tok is not None:
+                append(tok)
+            return tok
+        return token
+
+    def _progress_token_func(self, next_token: 'Callable', progress: 'Callable',
+                             total: int) -> 'Callable':
+        """
+        Builds a token function for yacc that reports progress every
+        `PROGRESS_TOKENS` tokens.
+
+        Parameters
+        ----------
+        next_token : Callable
+            Function returning the next token.
+        progress : Callable
+            Called with the position reached by the lexer and `total`.
+        total : int
+            Length of the input.
+
+        Returns
+        -------
+        Callable
+            Function with the same contract as `lexer.token`.
+        """
+        lexer = self.lexer
+        every = self.PROGRESS_TOKENS
+        count = 0
+
+        def token():
+            nonlocal count
+            count += 1
+            if count == every:
+                count = 0
+                progress(lexer.lexpos, total)
+            return next_token()
+        return token
+
+    def _spanning_token_func(self, next_token: 'Callable') -> 'Callable':
+        """
+        Builds a token function for yacc that sets the `span` of each token.
+
+        String tokens are reported at their closing quote, so their start
+        is taken from the lexer (or from the length of a raw string).
+
+        Parameters
+        ----------
+        next_token : Callable
+            Function returning the next token.
+
+        Returns
+        -------
+        Callable
+            Function with the same contract as `lexer.token`.
+        """
+        lexer = self.lexer
+
+        def token():
+            tok = next_token()
+            if tok is None:
+                return None
+            end_lineno = tok.lineno
+            if tok.type == 'STRING':
+                start, end = lexer.string_start, tok.lexpos + 1
+            elif tok.type == 'RAW_STRING':
+                start, end = tok.lexpos - len(tok.value) - 1, tok.lexpos + 1
+                end_lineno += tok.value.count('\n')
+            else:
+                start = tok.lexpos
+                end = start + len(str(tok.value))
+            tok.span = (start, end, tok.lineno, end_lineno)
+            return tok
+        return token
 
     def add_parser_error(self, lineno: int, lexpos: int, message: str, value: any = None) -> None:
         """
-        Adds a parser error with position information and context.
+        Adds a parser error with position information. The context text
+        is rendered lazily by the error itself.
 
         Parameters
         ----------
@@ -58,9 +451,12 @@ class LanguageParser(BaseLexer):
         -------
             None
         """
-        col = self._position_calc.calculate_column(self.lexer.lexdata, lexpos)
-        context = self._position_calc.get_position_context(self.lexer.lexdata, lexpos)
-        self.errors.append(ParseError(lineno, col, message, value, context))
+        line_index = self._get_line_index()
+        lexpos += self._input_offset
+        col = self._position_calc.calculate_column(self.lexer.lexdata, lexpos, line_index=line_index)
+        self.errors.append(ParseError(
+            lineno, col, message, value, lexpos=lexpos, line_index=line_index
+        ))
 
     def p_program(self, p):
         '''program : stmt_list'''
@@ -69,7 +465,17 @@ class LanguageParser(BaseLexer):
     def p_stmt_list(self, p):
         '''stmt_list : stmt_list stmt
                      | stmt'''
-        p[0] = p[1] + [p[2]] if len(p) == 3 else [p[1]]
+        if len(p) == 3:
+            p[1].append(p[2])
+            p[0] = p[1]
+        else:
+            p[0] = [p[1]]
+        if self._stmt_starts is not None:
+            # Filled by `parse_fragment`, keyed by the list being built.
+            if len(p) == 3:
+                self._stmt_starts[id(p[0])].append(p.lexpos(2))
+            else:
+                self._stmt_starts[id(p[0])] = [p.lexpos(1)]
 
     def p_stmt_package(self, p):
         '''stmt : PACKAGE IDENT'''
@@ -149,7 +555,11 @@ class LanguageParser(BaseLexer):
     def p_expr_list(self, p):
         '''expr_list : expr
                      | expr_list COMMA expr'''
-        p[0] = [p[1]] if len(p) == 2 else p[1] + [p[3]]
+        if len(p) == 2:
+            p[0] = [p[1]]
+        else:
+            p[1].append(p[3])
+            p[0] = p[1]
 
     def p_expr_map(self, p):
         '''expr : LBRACE kv_list RBRACE'''
@@ -161,7 +571,8 @@ class LanguageParser(BaseLexer):
         if len(p) == 4:
             p[0] = [(p[1], p[3])]
         else:
-            p[0] = p[1] + [(p[3], p[5])]
+            p[1].append((p[3], p[5]))
+            p[0] = p[1]
 
     def p_expr_index(self, p):
         '''expr : expr LBRACK expr RBRACK'''
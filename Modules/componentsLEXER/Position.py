@@ -1,3 +1,112 @@
+from bisect import bisect_right
+
+
+class LineIndex:
+    """
+    Table of line start offsets built once for an input text.
+
+    Lookups of line and column for an absolute position are done with
+    a binary search over the table, so each one costs O(log n) instead
+    of rescanning the text.
+
+    Attributes
+    ----------
+    text : str
+        The text the index was built for.
+    line_starts : list of int
+        Offset in `text` where each line begins, the first one being 0.
+    offset : int
+        Absolute position of the first character of `text`.
+    first_line : int
+        Line number of the first line of `text`.
+    """
+    def __init__(self, text: str, offset: int = 0, first_line: int = 1) -> None:
+        """
+        Builds the line table for the given text.
+
+        Parameters
+        ----------
+        text : str
+            The complete input text being analyzed.
+        offset : int, optional
+            Absolute position of `text` when it is a piece of a larger
+            input, by default 0.
+        first_line : int, optional
+            Line number of the first line of `text`, by default 1.
+        """
+        self.text = text
+        self.offset = offset
+        self.first_line = first_line
+        starts = [0]
+        find = text.find
+        pos = find('\n')
+        while pos >= 0:
+            starts.append(pos + 1)
+            pos = find('\n', pos + 1)
+        self.line_starts = starts
+
+    def __len__(self) -> int:
+        """
+        Returns the number of lines in the text.
+
+        Returns
+        -------
+        int
+            Number of lines, including an empty last line after a final newline.
+        """
+        return len(self.line_starts)
+
+    def line_of(self, lexpos: int) -> int:
+        """
+        Returns the 0-based line index containing a position.
+
+        Parameters
+        ----------
+        lexpos : int
+            The absolute position in the text.
+
+        Returns
+        -------
+        int
+            The 0-based index of the line within `text`.
+        """
+        return bisect_right(self.line_starts, lexpos - self.offset) - 1
+
+    def column(self, lexpos: int) -> int:
+        """
+        Returns the 1-based column of a position.
+
+        Parameters
+        ----------
+        lexpos : int
+            The absolute position in the text.
+
+        Returns
+        -------
+        int
+            The column number (1-based) at the given position.
+        """
+        return lexpos - self.offset - self.line_starts[self.line_of(lexpos)] + 1
+
+    def line_text(self, line: int) -> str:
+        """
+        Returns the text of a line without its trailing newline.
+
+        Parameters
+        ----------
+        line : int
+            The 0-based line index.
+
+        Returns
+        -------
+        str
+            Content of the line.
+        """
+        start = self.line_starts[line]
+        if line + 1 < len(self.line_starts):
+            return self.text[start:self.line_starts[line + 1] - 1]
+        return self.text[start:]
+
 
 class PositionCalculator:
     """
@@ -7,7 +116,7 @@ class PositionCalculator:
     and context display in the lexer and parser.
     """
     @staticmethod
-    def calculate_column(lexer_data: str, lexpos: int) -> int:
+    def calculate_column(lexer_data: str, lexpos: int, line_index: LineIndex = None) -> int:
         """
         Calculates the column number for a given position in the text.
 
@@ -17,19 +126,24 @@ class PositionCalculator:
             The complete input text being analyzed.
         lexpos : int
             The absolute position in the text.
+        line_index : LineIndex, optional
+            Prebuilt line table for `lexer_data`, by default None.
 
         Returns
         -------
         int
             The column number (1-based) at the given position.
         """
+        if line_index is not None:
+            return line_index.column(lexpos)
         last_nl = lexer_data.rfind('\n', 0, lexpos)
         if last_nl < 0:
             return lexpos + 1
         return (lexpos - last_nl)
 
     @staticmethod
-    def get_position_context(lexer_data: str, lexpos: int, context_lines: int = 2) -> str:
+    def get_position_context(lexer_data: str, lexpos: int, context_lines: int = 2,
+                             line_index: LineIndex = None) -> str:
         """
         Generates contextual text around a specific position for error reporting.
 
@@ -41,6 +155,9 @@ class PositionCalculator:
             The absolute position in the text.
         context_lines : int, optional
             Number of lines to include before and after the error line, by default 2.
+        line_index : LineIndex, optional
+            Prebuilt line table for `lexer_data`. When omitted a new one is
+            built, which costs a full scan of the text, by default None.
 
         Returns
         -------
@@ -48,15 +165,16 @@ class PositionCalculator:
             A formatted string showing the context around the position with line numbers
             and a pointer to the specific column.
         """
-        lines = lexer_data.split('\n')
-        line_num = lexer_data.count('\n', 0, lexpos)
+        if line_index is None:
+            line_index = LineIndex(lexer_data)
+        line_num = line_index.line_of(lexpos)
         start_line = max(0, line_num - context_lines)
-        end_line = min(len(lines), line_num + context_lines + 1)
+        end_line = min(len(line_index), line_num + context_lines + 1)
         context = []
         for i in range(start_line, end_line):
             prefix = ">>> " if i == line_num else "    "
-            context.append(f"{prefix}{i+1}: {lines[i]}")
+            context.append(f"{prefix}{i+line_index.first_line}: {line_index.line_text(i)}")
             if i == line_num:
-                col = PositionCalculator.calculate_column(lexer_data, lexpos)
+                col = line_index.column(lexpos)
                 context.append(" " * (col+6) + "^")
         return '\n'.join(context)
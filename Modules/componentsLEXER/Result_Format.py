@@ -0,0 +1,834 @@
+import mmap
+import struct
+from array import array
+from itertools import accumulate
+from typing import Any, BinaryIO, Dict, List, Tuple
+
+from Modules.componentsLEXER.Ast_Nodes import Node
+from Modules.componentsLEXER.Core_Errors import LexerError, ParseError
+from Modules.componentsLEXER.Core_Tokens import ALL_TOKENS
+from Modules.componentsLEXER.Flat_Ast import FlatAst, KIND_NAMES
+from Modules.componentsLEXER.Position import LineIndex
+from Modules.componentsLEXER.Token_Buffer import TokenBuffer
+
+MAGIC = b'BLXR'
+FORMAT_VERSION = 1
+
+# File header: magic, format version, reserved, number of sections. It is
+# followed by one directory entry per section: id, reserved, offset and
+# length. Sections start at offsets aligned to 8 bytes.
+_HEADER = struct.Struct('<4sHHI')
+_ENTRY = struct.Struct('<IIQQ')
+STRINGS, TEXT, TOKENS, AST, ERRORS = range(1, 6)
+
+# Shape of the tokens and of the AST in the stored result.
+_TOKENS_LIST, _TOKENS_BUFFER = range(2)
+_AST_NONE, _AST_TUPLE, _AST_NODES, _AST_FLAT = range(4)
+# Type tags of the values in the string table.
+_STR, _INT, _TRUE, _FALSE, _NONE = range(5)
+# Flags of each stored error.
+_IN_PARSER_ERRORS, _IN_LEXER_ERRORS, _IS_PARSE_ERROR = 1, 2, 4
+
+def _zigzag(value: int) -> int:
+    """
+    Maps a signed integer to an unsigned one, small magnitudes first.
+
+    Parameters
+    ----------
+    value : int
+        Signed integer.
+
+    Returns
+    -------
+    int
+        0, -1, 1, -2, ... mapped to 0, 1, 2, 3, ...
+    """
+    return value << 1 if value >= 0 else (-value << 1) - 1
+
+def _put_varint(out: bytearray, value: int) -> None:
+    """
+    Appends an unsigned integer as a varint: 7 bits per byte, low bits
+    first, the high bit set on every byte but the last.
+
+    Parameters
+    ----------
+    out : bytearray
+        Buffer to append to.
+    value : int
+        Non-negative integer.
+
+    Returns
+    -------
+        None
+    """
+    while value > 0x7f:
+        out.append((value & 0x7f) | 0x80)
+        value >>= 7
+    out.append(value)
+
+def _put_column(out: bytearray, values: List[int]) -> None:
+    """
+    Appends a column of unsigned integers: its size in bytes, then every
+    value as a varint.
+
+    Parameters
+    ----------
+    out : bytearray
+        Buffer to append to.
+    values : list of int
+        Non-negative integers.
+
+    Returns
+    -------
+        None
+    """
+    if not values or max(values) < 0x80:
+        # Every varint takes one byte, which is the value itself.
+        data = bytes(values)
+    else:
+        data = bytearray()
+        for value in values:
+            _put_varint(data, value)
+    _put_varint(out, len(data))
+    out += data
+
+def _deltas(values: List[int]) -> List[int]:
+    """
+    Returns the zigzag-encoded difference of each value with the previous one.
+
+    Parameters
+    ----------
+    values : list of int
+        Integers, usually growing, such as token positions.
+
+    Returns
+    -------
+    list of int
+        Small non-negative integers.
+    """
+    previous = 0
+    deltas = []
+    for value in values:
+        deltas.append(_zigzag(value - previous))
+        previous = value
+    return deltas
+
+class _Cursor:
+    """
+    Reads varints and columns from a section of a stored result.
+
+    Attributes
+    ----------
+    data : memoryview
+        Bytes of the section.
+    pos : int
+        Position of the next byte to read.
+    """
+    def __init__(self, data: memoryview) -> None:
+        """
+        Initializes a cursor at the start of a section.
+
+        Parameters
+        ----------
+        data : memoryview
+            Bytes of the section.
+        """
+        self.data = data
+        self.pos = 0
+
+    def varint(self) -> int:
+        """
+        Reads one varint.
+
+        Returns
+        -------
+        int
+            The decoded integer.
+        """
+        data = self.data
+        value = shift = 0
+        while True:
+            byte = data[self.pos]
+            self.pos += 1
+            value |= (byte & 0x7f) << shift
+            if byte < 0x80:
+                return value
+            shift += 7
+
+    def column(self, count: int) -> List[int]:
+        """
+        Reads a column written by `_put_column`.
+
+        Parameters
+        ----------
+        count : int
+            Number of values in the column.
+
+        Returns
+        -------
+        list of int
+            The decoded integers.
+        """
+        size = self.varint()
+        chunk = bytes(self.data[self.pos:self.pos + size])
+        self.pos += size
+        if size == count:
+            return list(chunk)
+        values = []
+        append = values.append
+        value = shift = 0
+        for byte in chunk:
+            if byte < 0x80:
+                append(value | (byte << shift))
+                value = shift = 0
+            else:
+                value |= (byte & 0x7f) << shift
+                shift += 7
+        return values
+
+    def signed_column(self, count: int) -> List[int]:
+        """
+        Reads a column of zigzag-encoded integers.
+
+        Parameters
+        ----------
+        count : int
+            Number of values in the column.
+
+        Returns
+        -------
+        list of int
+            The decoded signed integers.
+        """
+        return [(value >> 1) ^ -(value & 1) for value in self.column(count)]
+
+    def delta_column(self, count: int) -> List[int]:
+        """
+        Reads a column written from `_deltas`.
+
+        Parameters
+        ----------
+        count : int
+            Number of values in the column.
+
+        Returns
+        -------
+        list of int
+            The original integers.
+        """
+        return list(accumulate(self.signed_column(count)))
+
+class ResultWriter:
+    """
+    Writes analysis results in a compact, versioned binary format.
+
+    A stored result is a short header, a directory of sections and the
+    sections themselves: a string table with every distinct identifier,
+    literal and message, the source text, the tokens, the AST and the
+    errors. Each section can be located and decoded on its own, so a
+    memory-mapped file only pays for what is read. Kinds, positions and
+    string ids are stored in columns of varints, positions as differences
+    with the previous one. Token types and AST kinds are stored with the
+    table of their names, so files stay readable if codes are renumbered.
+    """
+    def __init__(self) -> None:
+        """
+        Initializes a ResultWriter.
+        """
+        self._strings = []
+        self._string_ids = {}
+
+    def _string_id(self, value: Any) -> int:
+        """
+        Returns the id of a value in the string table, adding it if needed.
+
+        Parameters
+        ----------
+        value : str, int, bool or None
+            Value to store.
+
+        Returns
+        -------
+        int
+            Index of the value in the table.
+        """
+        # Keyed by type too, so that e.g. 1, True and '1' stay apart.
+        key = (value.__class__, value)
+        string_id = self._string_ids.get(key)
+        if string_id is None:
+            if value is not None and not isinstance(value, (str, int)):
+                raise TypeError(f"cannot store value of type {type(value).__name__}")
+            string_id = len(self._strings)
+            self._string_ids[key] = string_id
+            self._strings.append(value)
+        return string_id
+
+    def dumps(self, result: Dict[str, Any], text: str = None) -> bytes:
+        """
+        Encodes an analysis result.
+
+        Parameters
+        ----------
+        result : dict
+            Result returned by `LexerCore.process`.
+        text : str, optional
+            Source text of the result. It is stored so that error contexts
+            can be rendered after loading; by default the text of a
+            `TokenBuffer`, if any. Without it, contexts are rendered and
+            stored as text.
+
+        Returns
+        -------
+        bytes
+            The encoded result.
+        """
+        self._strings = []
+        self._string_ids = {}
+        tokens = result.get("tokens")
+        if text is None and isinstance(tokens, TokenBuffer):
+            text = tokens.text
+        sections = []
+        if text is not None:
+            sections.append((TEXT, text.encode('utf-8')))
+        if tokens is not None:
+            sections.append((TOKENS, self._encode_tokens(tokens)))
+        sections.append((AST, self._encode_ast(result.get("ast"))))
+        sections.append((ERRORS, self._encode_errors(
+            result.get("parser_errors", []), result.get("lexer_errors", []), text is not None
+        )))
+        # Encoded last, once every section has added its values.
+        sections.insert(0, (STRINGS, self._encode_strings()))
+
+        out = bytearray(_HEADER.pack(MAGIC, FORMAT_VERSION, 0, len(sections)))
+        offset = len(out) + _ENTRY.size * len(sections)
+        for section_id, data in sections:
+            offset += -offset % 8
+            out += _ENTRY.pack(section_id, 0, offset, len(data))
+            offset += len(data)
+        for _, data in sections:
+            out += bytes(-len(out) % 8)
+            out += data
+        return bytes(out)
+
+    def dump(self, result: Dict[str, Any], fp: BinaryIO, text: str = None) -> None:
+        """
+        Encodes an analysis result and writes it to a binary file object.
+
+        Parameters
+        ----------
+        result : dict
+            Result returned by `LexerCore.process`.
+        fp : BinaryIO
+            File object open for binary writing.
+        text : str, optional
+            Source text of the result, see `dumps`.
+
+        Returns
+        -------
+            None
+        """
+        fp.write(self.dumps(result, text))
+
+    def _encode_strings(self) -> bytes:
+        """
+        Encodes the string table: the type tag of each value, then the
+        integers, then the length of each string and all of them as one
+        UTF-8 block.
+
+        Returns
+        -------
+        bytes
+            The STRINGS section.
+        """
+        tags, ints, lengths, texts = [], [], [], []
+        for value in self._strings:
+            if value is None:
+                tags.append(_NONE)
+            elif value is True:
+                tags.append(_TRUE)
+            elif value is False:
+                tags.append(_FALSE)
+            elif isinstance(value, int):
+                tags.append(_INT)
+                ints.append(_zigzag(value))
+            else:
+                tags.append(_STR)
+                lengths.append(len(value))
+                texts.append(value)
+        out = bytearray()
+        _put_varint(out, len(tags))
+        _put_column(out, tags)
+        _put_column(out, ints)
+        _put_column(out, lengths)
+        blob = ''.join(texts).encode('utf-8')
+        _put_varint(out, len(blob))
+        out += blob
+        return bytes(out)
+
+    def _encode_names(self, out: bytearray, names: tuple) -> None:
+        """
+        Appends a table of names, such as token types, as string ids.
+
+        Parameters
+        ----------
+        out : bytearray
+            Buffer to append to.
+        names : tuple of str
+            Names indexed by code.
+
+        Returns
+        -------
+            None
+        """
+        _put_varint(out, len(names))
+        _put_column(out, [self._string_id(name) for name in names])
+
+    def _encode_tokens(self, tokens: Any) -> bytes:
+        """
+        Encodes a token stream.
+
+        Parameters
+        ----------
+        tokens : list or TokenBuffer
+            Tokens of the result.
+
+        Returns
+        -------
+        bytes
+            The TOKENS section.
+        """
+        if not isinstance(tokens, TokenBuffer):
+            shape = _TOKENS_LIST
+            end_lineno = None
+            tokens = TokenBuffer.from_tokens(tokens)
+        else:
+            shape = _TOKENS_BUFFER
+            end_lineno = tokens.end_lineno
+        ids = [self._string_id(value) for value in tokens.values]
+        out = bytearray()
+        _put_varint(out, shape)
+        _put_varint(out, 0 if end_lineno is None else end_lineno + 1)
+        self._encode_names(out, ALL_TOKENS)
+        _put_varint(out, len(tokens))
+        _put_column(out, list(tokens.types))
+        _put_column(out, _deltas(tokens.linenos))
+        _put_column(out, _deltas(tokens.lexposs))
+        _put_column(out, [ids[value_id] for value_id in tokens.value_ids])
+        return bytes(out)
+
+    def _encode_ast(self, ast: Any) -> bytes:
+        """
+        Encodes an AST in the layout of `FlatAst`. Links to other nodes are
+        stored as distances, which are small because children are stored
+        just before their parent.
+
+        Parameters
+        ----------
+        ast : tuple, Node, FlatAst or None
+            AST of the result.
+
+        Returns
+        -------
+        bytes
+            The AST section.
+        """
+        out = bytearray()
+        if ast is None:
+            _put_varint(out, _AST_NONE)
+            return bytes(out)
+        if isinstance(ast, FlatAst):
+            shape, flat = _AST_FLAT, ast
+        else:
+            shape = _AST_NODES if isinstance(ast, Node) else _AST_TUPLE
+            flat = FlatAst.from_tree(ast)
+        ids = [self._string_id(value) + 1 for value in flat.values]
+        _put_varint(out, shape)
+        _put_varint(out, int(flat.spans))
+        self._encode_names(out, KIND_NAMES)
+        _put_varint(out, len(flat))
+        _put_varint(out, flat.root + 1)
+        _put_column(out, list(flat.kinds))
+        # Fields stored by the node itself (e.g. the type of a `var`) come
+        # after the nodes they follow, so distances may be negative.
+        _put_column(out, [
+            _zigzag(index - child) if child >= 0 else 0 for index, child in enumerate(flat.first_child)
+        ])
+        _put_column(out, [
+            _zigzag(sibling - index) if sibling >= 0 else 0
+            for index, sibling in enumerate(flat.next_sibling)
+        ])
+        _put_column(out, [ids[payload] if payload >= 0 else 0 for payload in flat.payloads])
+        if flat.spans:
+            _put_column(out, [lexpos + 1 for lexpos in flat.lexposs])
+            _put_column(out, [_zigzag(end - start) for start, end in zip(flat.lexposs, flat.end_lexposs)])
+            _put_column(out, [lineno + 1 for lineno in flat.linenos])
+            _put_column(out, [_zigzag(end - start) for start, end in zip(flat.linenos, flat.end_linenos)])
+        return bytes(out)
+
+    def _encode_errors(self, parser_errors: list, lexer_errors: list, has_text: bool) -> bytes:
+        """
+        Encodes the errors of a result. Each one is stored once, with flags
+        telling which lists it belongs to.
+
+        Parameters
+        ----------
+        parser_errors : list
+            All the errors of the result, in order.
+        lexer_errors : list
+            The lexer errors among them.
+        has_text : bool
+            Whether the source text is stored. If not, contexts are
+            rendered now and stored as text.
+
+        Returns
+        -------
+        bytes
+            The ERRORS section.
+        """
+        in_lexer = {id(err) for err in lexer_errors}
+        errors = [(err, _IN_PARSER_ERRORS) for err in parser_errors]
+        in_parser = {id(err) for err in parser_errors}
+        errors += [(err, 0) for err in lexer_errors if id(err) not in in_parser]
+        flags, linenos, cols, messages, lexposs, values, contexts = [], [], [], [], [], [], []
+        for err, flag in errors:
+            if id(err) in in_lexer:
+                flag |= _IN_LEXER_ERRORS
+            value = None
+            if isinstance(err, ParseError):
+                flag |= _IS_PARSE_ERROR
+                value = err.value
+            flags.append(flag)
+            linenos.append(err.lineno)
+            cols.append(err.col)
+            messages.append(self._string_id(err.message))
+            lexposs.append(0 if err.lexpos is None else err.lexpos + 1)
+            values.append(0 if value is None else self._string_id(value) + 1)
+            context = None
+            if not has_text or err.lexpos is None:
+                context = err.context
+            contexts.append(0 if context is None else self._string_id(context) + 1)
+        out = bytearray()
+        _put_varint(out, len(errors))
+        for column in (flags, linenos, cols, messages, lexposs, values, contexts):
+            _put_column(out, column)
+        return bytes(out)
+
+class ResultReader:
+    """
+    Reads analysis results written by `ResultWriter`.
+
+    Sections are decoded on demand, so e.g. only the tokens of a stored
+    result can be loaded. `open` maps a file into memory instead of
+    reading it whole.
+    """
+    def __init__(self, data: Any) -> None:
+        """
+        Initializes a ResultReader over an encoded result.
+
+        Parameters
+        ----------
+        data : bytes-like
+            Encoded result: bytes, bytearray, memoryview or mmap.
+        """
+        self._data = memoryview(data)
+        self._mmap = None
+        if len(self._data) < _HEADER.size:
+            raise ValueError("not an analysis result: data too short")
+        magic, version, _, count = _HEADER.unpack_from(self._data, 0)
+        if magic != MAGIC:
+            raise ValueError("not an analysis result: bad magic number")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"unsupported analysis result format version {version}")
+        if len(self._data) < _HEADER.size + count * _ENTRY.size:
+            raise ValueError("not an analysis result: data truncated")
+        self._sections = {}
+        for index in range(count):
+            section_id, _, offset, length = _ENTRY.unpack_from(
+                self._data, _HEADER.size + index * _ENTRY.size
+            )
+            if offset + length > len(self._data):
+                raise ValueError("not an analysis result: data truncated")
+            self._sections[section_id] = (offset, length)
+        self._strings = None
+
+    @classmethod
+    def open(cls, path: str) -> 'ResultReader':
+        """
+        Opens a stored result by mapping the file into memory.
+
+        Parameters
+        ----------
+        path : str
+            Path of the file.
+
+        Returns
+        -------
+        ResultReader
+            Reader over the mapped file; call `close` to release it.
+        """
+        with open(path, 'rb') as file:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        reader = cls(mapped)
+        reader._mmap = mapped
+        return reader
+
+    def close(self) -> None:
+        """
+        Releases the data, unmapping the file if it was opened with `open`.
+
+        Returns
+        -------
+            None
+        """
+        self._data.release()
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def __enter__(self) -> 'ResultReader':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def has_section(self, section_id: int) -> bool:
+        """
+        Tells whether a section is stored.
+
+        Parameters
+        ----------
+        section_id : int
+            One of STRINGS, TEXT, TOKENS, AST, ERRORS.
+
+        Returns
+        -------
+        bool
+            True if the section is present.
+        """
+        return section_id in self._sections
+
+    def _cursor(self, section_id: int) -> _Cursor:
+        """
+        Returns a cursor at the start of a section.
+
+        Parameters
+        ----------
+        section_id : int
+            Section to read.
+
+        Returns
+        -------
+        _Cursor
+            Cursor over the section bytes.
+        """
+        offset, length = self._sections[section_id]
+        return _Cursor(self._data[offset:offset + length])
+
+    def strings(self) -> list:
+        """
+        Returns the string table, decoding it on first use.
+
+        Returns
+        -------
+        list
+            Stored values, indexed by string id.
+        """
+        if self._strings is not None:
+            return self._strings
+        cursor = self._cursor(STRINGS)
+        count = cursor.varint()
+        tags = cursor.column(count)
+        ints = iter(cursor.signed_column(tags.count(_INT)))
+        lengths = iter(cursor.column(tags.count(_STR)))
+        size = cursor.varint()
+        blob = bytes(cursor.data[cursor.pos:cursor.pos + size]).decode('utf-8')
+        strings = []
+        pos = 0
+        for tag in tags:
+            if tag == _STR:
+                length = next(lengths)
+                strings.append(blob[pos:pos + length])
+                pos += length
+            elif tag == _INT:
+                strings.append(next(ints))
+            else:
+                strings.append({_TRUE: True, _FALSE: False, _NONE: None}[tag])
+        self._strings = strings
+        return strings
+
+    def _decode_names(self, cursor: _Cursor, names: tuple) -> List[int]:
+        """
+        Reads a table of names and maps its codes to the current ones.
+
+        Parameters
+        ----------
+        cursor : _Cursor
+            Cursor at the start of the table.
+        names : tuple of str
+            Current names indexed by code.
+
+        Returns
+        -------
+        list of int or None
+            Current code of each stored code, or None if they are the same.
+        """
+        strings = self.strings()
+        stored = [strings[string_id] for string_id in cursor.column(cursor.varint())]
+        if tuple(stored) == names:
+            return None
+        codes = {name: code for code, name in enumerate(names)}
+        missing = [name for name in stored if name not in codes]
+        if missing:
+            raise ValueError(f"unknown names in analysis result: {', '.join(missing)}")
+        return [codes[name] for name in stored]
+
+    def text(self) -> str:
+        """
+        Returns the stored source text.
+
+        Returns
+        -------
+        str or None
+            The text, or None if it was not stored.
+        """
+        if TEXT not in self._sections:
+            return None
+        offset, length = self._sections[TEXT]
+        return bytes(self._data[offset:offset + length]).decode('utf-8')
+
+    def tokens(self) -> Any:
+        """
+        Decodes the stored tokens.
+
+        Returns
+        -------
+        list, TokenBuffer or None
+            The tokens in the shape they were stored with, or None.
+        """
+        if TOKENS not in self._sections:
+            return None
+        cursor = self._cursor(TOKENS)
+        shape = cursor.varint()
+        end_lineno = cursor.varint() - 1
+        codes = self._decode_names(cursor, ALL_TOKENS)
+        count = cursor.varint()
+        types = cursor.column(count)
+        if codes is not None:
+            types = [codes[code] for code in types]
+        buffer = TokenBuffer.from_columns(
+            array('B', types),
+            array('i', cursor.delta_column(count)),
+            array('q', cursor.delta_column(count)),
+            array('i', cursor.column(count)),
+            self.strings(),
+            text=self.text() if shape == _TOKENS_BUFFER else None,
+            end_lineno=None if end_lineno < 0 else end_lineno
+        )
+        if shape == _TOKENS_LIST:
+            return list(buffer.iter_lextokens())
+        return buffer
+
+    def ast(self) -> Any:
+        """
+        Decodes the stored AST.
+
+        Returns
+        -------
+        tuple, Node, FlatAst or None
+            The AST in the shape it was stored with, with the same spans.
+        """
+        cursor = self._cursor(AST)
+        shape = cursor.varint()
+        if shape == _AST_NONE:
+            return None
+        has_spans = cursor.varint()
+        codes = self._decode_names(cursor, KIND_NAMES)
+        count = cursor.varint()
+        root = cursor.varint() - 1
+        kinds = cursor.column(count)
+        if codes is not None:
+            kinds = [codes[code] for code in kinds]
+        first_child = [
+            index - distance if distance else -1
+            for index, distance in enumerate(cursor.signed_column(count))
+        ]
+        next_sibling = [
+            index + distance if distance else -1
+            for index, distance in enumerate(cursor.signed_column(count))
+        ]
+        spans = None
+        payloads = cursor.column(count)
+        if has_spans:
+            lexposs = [lexpos - 1 for lexpos in cursor.column(count)]
+            end_lexposs = [start + length for start, length in zip(lexposs, cursor.signed_column(count))]
+            linenos = [lineno - 1 for lineno in cursor.column(count)]
+            end_linenos = [start + length for start, length in zip(linenos, cursor.signed_column(count))]
+            spans = (
+                array('q', lexposs), array('q', end_lexposs),
+                array('i', linenos), array('i', end_linenos)
+            )
+        flat = FlatAst.from_columns(
+            array('B', kinds), array('i', first_child), array('i', next_sibling),
+            # Payload ids are stored one up, so that 0 means none.
+            array('i', [payload - 1 for payload in payloads]), self.strings(), root, spans
+        )
+        if shape == _AST_FLAT:
+            return flat
+        tree = flat.to_tuple(spans=bool(has_spans))
+        return Node.from_tuple(tree) if shape == _AST_NODES else tree
+
+    def errors(self) -> Tuple[list, list]:
+        """
+        Decodes the stored errors. Their contexts are rendered from the
+        stored text on first access, as for freshly built errors.
+
+        Returns
+        -------
+        tuple
+            The parser errors (all of them) and the lexer errors.
+        """
+        cursor = self._cursor(ERRORS)
+        count = cursor.varint()
+        flags, linenos, cols, messages, lexposs, values, contexts = [
+            cursor.column(count) for _ in range(7)
+        ]
+        strings = self.strings()
+        line_index = None
+        if count and TEXT in self._sections:
+            line_index = LineIndex(self.text())
+        parser_errors, lexer_errors = [], []
+        for flag, lineno, col, message, lexpos, value, context in zip(
+                flags, linenos, cols, messages, lexposs, values, contexts):
+            lexpos = lexpos - 1 if lexpos else None
+            context = strings[context - 1] if context else None
+            if flag & _IS_PARSE_ERROR:
+                err = ParseError(
+                    lineno, col, strings[message], strings[value - 1] if value else None,
+                    context, lexpos=lexpos, line_index=line_index
+                )
+            else:
+                err = LexerError(
+                    lineno, col, strings[message], context, lexpos=lexpos, line_index=line_index
+                )
+            if flag & _IN_PARSER_ERRORS:
+                parser_errors.append(err)
+            if flag & _IN_LEXER_ERRORS:
+                lexer_errors.append(err)
+        return parser_errors, lexer_errors
+
+    def result(self) -> Dict[str, Any]:
+        """
+        Decodes the whole stored result.
+
+        Returns
+        -------
+        dict
+            The result, with the same keys as `LexerCore.process`.
+        """
+        parser_errors, lexer_errors = self.errors()
+        return {
+            "tokens": self.tokens(),
+            "ast": self.ast(),
+            "lexer_errors": lexer_errors,
+            "parser_errors": parser_errors
+        }
@@ -0,0 +1,183 @@
+from itertools import islice
+from typing import Iterator
+
+class _Interned(dict):
+    """
+    Dictionary mapping each symbol to itself, adding unknown keys on lookup.
+    """
+    def __missing__(self, value: str) -> str:
+        """
+        Adds a new symbol.
+
+        Parameters
+        ----------
+        value : str
+            Value that is not in the table yet.
+
+        Returns
+        -------
+        str
+            The value itself, which becomes the shared object.
+        """
+        self[value] = value
+        return value
+
+class SymbolTable:
+    """
+    Interning table for identifier and literal values.
+
+    `intern` returns the first object seen for each distinct string, so
+    equal identifiers and string literals produced by the lexer share a
+    single object instead of holding one slice of the input per
+    occurrence. Every symbol also has an integer id, its position in
+    order of appearance, which later passes can compare or use as an
+    index instead of the string itself. Ids are assigned lazily, so the
+    lexer only pays for a dictionary lookup per token.
+
+    Attributes
+    ----------
+    intern : callable
+        Returns the shared object equal to a string, adding the string if
+        it is new. It is the lookup of the underlying dictionary, so a
+        known value is interned without any Python-level call.
+    """
+    def __init__(self) -> None:
+        """
+        Initializes an empty SymbolTable.
+        """
+        self._objects = _Interned()
+        self._symbols = []
+        self._ids = {}
+        self.intern = self._objects.__getitem__
+
+    def _sync(self) -> None:
+        """
+        Assigns ids to the symbols interned since the last call.
+
+        `_symbols` holds the symbols synced so far, and new symbols are the
+        last ones of the dictionary, so they are read from its end: the
+        work depends on the number of new symbols, not on the table size.
+
+        Returns
+        -------
+            None
+        """
+        symbols = self._symbols
+        synced = len(symbols)
+        new = len(self._objects) - synced
+        if not new:
+            return
+        added = list(islice(reversed(self._objects), new))
+        added.reverse()
+        ids = self._ids
+        for symbol_id, value in enumerate(added, synced):
+            ids[value] = symbol_id
+        symbols.extend(added)
+
+    def id_of(self, value: str) -> int:
+        """
+        Returns the id of a symbol, adding it if it is new.
+
+        Parameters
+        ----------
+        value : str
+            Identifier or literal value.
+
+        Returns
+        -------
+        int
+            Id of the symbol.
+        """
+        self._sync()
+        symbol_id = self._ids.get(value)
+        if symbol_id is None:
+            self.intern(value)
+            self._sync()
+            symbol_id = self._ids[value]
+        return symbol_id
+
+    def get_id(self, value: str, default: int = -1) -> int:
+        """
+        Returns the id of a symbol without adding it.
+
+        Parameters
+        ----------
+        value : str
+            Identifier or literal value.
+        default : int, optional
+            Value returned for unknown symbols, by default -1.
+
+        Returns
+        -------
+        int
+            Id of the symbol, or `default`.
+        """
+        self._sync()
+        return self._ids.get(value, default)
+
+    def symbol(self, symbol_id: int) -> str:
+        """
+        Returns the symbol with the given id.
+
+        Parameters
+        ----------
+        symbol_id : int
+            Id returned by `id_of`.
+
+        Returns
+        -------
+        str
+            The interned object.
+        """
+        self._sync()
+        return self._symbols[symbol_id]
+
+    def clear(self) -> None:
+        """
+        Removes every symbol; ids start again from 0.
+
+        Returns
+        -------
+            None
+        """
+        self._objects.clear()
+        self._symbols.clear()
+        self._ids.clear()
+
+    def __len__(self) -> int:
+        """
+        Returns the number of distinct symbols.
+
+        Returns
+        -------
+        int
+            Number of symbols.
+        """
+        return len(self._objects)
+
+    def __contains__(self, value: str) -> bool:
+        """
+        Tells whether a value was interned.
+
+        Parameters
+        ----------
+        value : str
+            Value to look up.
+
+        Returns
+        -------
+        bool
+            True if the value is in the table.
+        """
+        return value in self._objects
+
+    def __iter__(self) -> Iterator[str]:
+        """
+        Iterates over the symbols in id order.
+
+        Returns
+        -------
+        Iterator[str]
+            Interned objects.
+        """
+        return iter(self._objects)
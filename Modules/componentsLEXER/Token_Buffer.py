@@ -0,0 +1,310 @@
+from array import array
+from typing import Iterable, Iterator
+
+import ply.lex as lex
+from Modules.componentsLEXER.Core_Tokens import ALL_TOKENS, TOKEN_CODES
+
+class TokenView:
+    """
+    Lightweight read-only view of a single token stored in a `TokenBuffer`.
+
+    Exposes the same attributes as a PLY `LexToken` and renders the same
+    way, so it can be used wherever tokens are only read.
+
+    Attributes
+    ----------
+    type : str
+        Token type.
+    value : any
+        Token value.
+    lineno : int
+        Line number of the token.
+    lexpos : int
+        Absolute position of the token in the input.
+    """
+    __slots__ = ('_buffer', '_index')
+
+    def __init__(self, buffer: 'TokenBuffer', index: int) -> None:
+        """
+        Initializes a view of the token at `index`.
+
+        Parameters
+        ----------
+        buffer : TokenBuffer
+            Buffer holding the token.
+        index : int
+            Position of the token in the buffer.
+        """
+        self._buffer = buffer
+        self._index = index
+
+    @property
+    def type(self) -> str:
+        return ALL_TOKENS[self._buffer.types[self._index]]
+
+    @property
+    def value(self) -> any:
+        return self._buffer.values[self._buffer.value_ids[self._index]]
+
+    @property
+    def lineno(self) -> int:
+        return self._buffer.linenos[self._index]
+
+    @property
+    def lexpos(self) -> int:
+        return self._buffer.lexposs[self._index]
+
+    def __str__(self) -> str:
+        """
+        Returns the same representation as a PLY `LexToken`.
+
+        Returns
+        -------
+        str
+            Token type, value, line number and position.
+        """
+        return f"LexToken({self.type},{self.value!r},{self.lineno},{self.lexpos})"
+
+    __repr__ = __str__
+
+class TokenBuffer:
+    """
+    Compact struct-of-arrays storage for a token stream.
+
+    Each token takes a type code from `TOKEN_CODES` and three integer
+    columns for line, position and value id. Values are deduplicated in a
+    side table, so repeated identifiers, keywords and symbols are stored
+    once. Indexing and iteration return `TokenView` objects created on
+    demand.
+
+    Attributes
+    ----------
+    text : str or None
+        Source text the tokens come from, used to report parser errors.
+    end_lineno : int or None
+        Line counter of the lexer at the end of the input.
+    types : array
+        Type code of each token.
+    linenos : array
+        Line number of each token.
+    lexposs : array
+        Absolute position of each token, as 64-bit integers so inputs over
+        2 GiB fit.
+    value_ids : array
+        Index of each token value in `values`.
+    values : list
+        Distinct token values.
+    """
+    def __init__(self, text: str = None) -> None:
+        """
+        Initializes an empty TokenBuffer.
+
+        Parameters
+        ----------
+        text : str or None, optional
+            Source text the tokens come from, by default None.
+        """
+        self.text = text
+        self.end_lineno = None
+        self.types = array('B')
+        self.linenos = array('i')
+        self.lexposs = array('q')
+        self.value_ids = array('i')
+        self.values = []
+        self._value_ids = {}
+
+    @classmethod
+    def from_tokens(cls, tokens: Iterable[lex.LexToken], text: str = None) -> 'TokenBuffer':
+        """
+        Builds a TokenBuffer from a token stream.
+
+        Parameters
+        ----------
+        tokens : Iterable[lex.LexToken]
+            Tokens to store.
+        text : str or None, optional
+            Source text the tokens come from, by default None.
+
+        Returns
+        -------
+        TokenBuffer
+            Buffer holding the tokens.
+        """
+        buffer = cls(text)
+        buffer.extend(tokens)
+        return buffer
+
+    @classmethod
+    def from_columns(cls, types: array, linenos: array, lexposs: array, value_ids: array,
+                     values: list, text: str = None, end_lineno: int = None) -> 'TokenBuffer':
+        """
+        Builds a TokenBuffer from already filled columns, e.g. when loading
+        a stored result.
+
+        Parameters
+        ----------
+        types : array
+            Type code of each token.
+        linenos : array
+            Line number of each token.
+        lexposs : array
+            Absolute position of each token.
+        value_ids : array
+            Index of each token value in `values`.
+        values : list
+            Distinct token values.
+        text : str or None, optional
+            Source text the tokens come from, by default None.
+        end_lineno : int or None, optional
+            Line counter of the lexer at the end of the input, by default None.
+
+        Returns
+        -------
+        TokenBuffer
+            Buffer holding the tokens.
+        """
+        buffer = cls.__new__(cls)
+        buffer.__setstate__({
+            'text': text, 'end_lineno': end_lineno, 'types': types, 'linenos': linenos,
+            'lexposs': lexposs, 'value_ids': value_ids, 'values': values
+        })
+        return buffer
+
+    def append(self, tok: lex.LexToken) -> None:
+        """
+        Stores a token at the end of the buffer.
+
+        Parameters
+        ----------
+        tok : lex.LexToken
+            Token to store; any object with `type`, `value`, `lineno` and
+            `lexpos` works.
+
+        Returns
+        -------
+            None
+        """
+        value = tok.value
+        # Keyed by type too, so that e.g. 1 and '1' stay apart.
+        key = (value.__class__, value)
+        value_id = self._value_ids.get(key)
+        if value_id is None:
+            value_id = len(self.values)
+            self._value_ids[key] = value_id
+            self.values.append(value)
+        self.types.append(TOKEN_CODES[tok.type])
+        self.linenos.append(tok.lineno)
+        self.lexposs.append(tok.lexpos)
+        self.value_ids.append(value_id)
+
+    def extend(self, tokens: Iterable[lex.LexToken]) -> None:
+        """
+        Stores every token of a stream at the end of the buffer.
+
+        Parameters
+        ----------
+        tokens : Iterable[lex.LexToken]
+            Tokens to store.
+
+        Returns
+        -------
+            None
+        """
+        append = self.append
+        for tok in tokens:
+            append(tok)
+
+    def __len__(self) -> int:
+        """
+        Returns the number of tokens stored.
+
+        Returns
+        -------
+        int
+            Number of tokens.
+        """
+        return len(self.types)
+
+    def __getitem__(self, index: int) -> TokenView:
+        """
+        Returns a view of the token at `index`.
+
+        Parameters
+        ----------
+        index : int
+            Position of the token, negative values count from the end.
+
+        Returns
+        -------
+        TokenView
+            View of the token.
+        """
+        size = len(self.types)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("token index out of range")
+        return TokenView(self, index)
+
+    def __iter__(self) -> Iterator[TokenView]:
+        """
+        Iterates over views of the stored tokens.
+
+        Returns
+        -------
+        Iterator[TokenView]
+            Views of the tokens, in order.
+        """
+        for index in range(len(self.types)):
+            yield TokenView(self, index)
+
+    def iter_lextokens(self) -> Iterator[lex.LexToken]:
+        """
+        Yields the tokens as fresh PLY `LexToken` objects, e.g. to feed yacc,
+        which needs tokens it can annotate.
+
+        Returns
+        -------
+        Iterator[lex.LexToken]
+            Tokens of the buffer, in order.
+        """
+        values = self.values
+        for code, lineno, lexpos, value_id in zip(self.types, self.linenos, self.lexposs, self.value_ids):
+            tok = lex.LexToken()
+            tok.type = ALL_TOKENS[code]
+            tok.value = values[value_id]
+            tok.lineno = lineno
+            tok.lexpos = lexpos
+            yield tok
+
+    def __getstate__(self) -> dict:
+        """
+        Returns the state to pickle, without the value lookup table, which
+        is rebuilt from `values` on load.
+
+        Returns
+        -------
+        dict
+            Attributes of the buffer.
+        """
+        state = self.__dict__.copy()
+        del state['_value_ids']
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        """
+        Restores a pickled buffer and rebuilds its value lookup table.
+
+        Parameters
+        ----------
+        state : dict
+            Attributes returned by `__getstate__`.
+
+        Returns
+        -------
+            None
+        """
+        self.__dict__.update(state)
+        self._value_ids = {
+            (value.__class__, value): value_id for value_id, value in enumerate(self.values)
+        }
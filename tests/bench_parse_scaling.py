@@ -0,0 +1,53 @@
+# Regression benchmark: parse time per statement must stay flat as the
+# number of statements grows, i.e. parsing stays linear in the input.
+#
+# Run from the repository root (the largest size takes about a minute):
+#
+#     python -m tests.bench_parse_scaling
+#     python -m tests.bench_parse_scaling --max 100000
+#
+# Exits with status 1 if the time per statement of the largest input is
+# more than `--tolerance` times the best one of the smaller inputs.
+import argparse
+import gc
+import sys
+import time
+
+from Modules.componentsLEXER.Language_Parser import LanguageParser
+
+SIZES = (1000, 10000, 100000, 1000000)
+
+def build_source(statements):
+    return 'package main\nfunc main() {\n' + '    x := 1 + 2;\n' * statements + '}\n'
+
+def parse_time(parser, source):
+    gc.collect()
+    start = time.perf_counter()
+    ast = parser.parse(source)
+    elapsed = time.perf_counter() - start
+    if parser.get_errors() or ast is None:
+        raise SystemExit("benchmark input did not parse")
+    return elapsed
+
+def main(argv=None):
+    args = argparse.ArgumentParser(description="Checks that parse time stays linear in the input size.")
+    args.add_argument('--max', type=int, default=SIZES[-1], help="Largest number of statements.")
+    args.add_argument('--tolerance', type=float, default=2.0,
+                      help="Allowed growth of the time per statement.")
+    args = args.parse_args(argv)
+    parser = LanguageParser()
+    parser.parse(build_source(10))
+    per_statement = []
+    for size in (size for size in SIZES if size <= args.max):
+        # Small inputs are repeated to smooth out the noise.
+        elapsed = min(parse_time(parser, build_source(size)) for _ in range(max(1, 10000 // size)))
+        per_statement.append(elapsed / size)
+        print(f"{size:>9} statements: {elapsed:8.3f} s, {elapsed / size * 1e6:6.1f} us/statement")
+    if len(per_statement) < 2:
+        return 0
+    ratio = per_statement[-1] / min(per_statement[:-1])
+    print(f"largest / best smaller: {ratio:.2f} (tolerance {args.tolerance})")
+    return 0 if ratio <= args.tolerance else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
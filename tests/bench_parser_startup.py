@@ -0,0 +1,62 @@
+# Benchmark of the time to build a parser: the first `LanguageParser()` of
+# a process against the later ones, which reuse the cached lexer and LALR
+# tables, and a fresh process with and without the `parsetab` module PLY
+# writes next to the parser.
+#
+# Run from the repository root:
+#
+#     python -m tests.bench_parser_startup
+#
+# Exits with status 1 if a second instance is not at least `--speedup`
+# times faster than the first one.
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+import Modules.componentsLEXER.Language_Parser as language_parser
+from Modules.componentsLEXER.Language_Parser import LanguageParser
+
+PARSETAB = os.path.join(os.path.dirname(language_parser.__file__), 'parsetab.py')
+
+# Times the first parser of a fresh process, and prints it in seconds.
+_FRESH_PROCESS = '''
+import time
+start = time.perf_counter()
+from Modules.componentsLEXER.Language_Parser import LanguageParser
+LanguageParser()
+print(time.perf_counter() - start)
+'''
+
+def build_time():
+    start = time.perf_counter()
+    LanguageParser()
+    return time.perf_counter() - start
+
+def fresh_process_time(keep_parsetab):
+    if not keep_parsetab and os.path.exists(PARSETAB):
+        os.remove(PARSETAB)
+    output = subprocess.run(
+        [sys.executable, '-c', _FRESH_PROCESS], check=True, capture_output=True, text=True
+    ).stdout
+    return float(output.split()[-1])
+
+def main(argv=None):
+    args = argparse.ArgumentParser(description="Measures the time to build a parser.")
+    args.add_argument('--repeat', type=int, default=5, help="Runs of each fresh process case.")
+    args.add_argument('--speedup', type=float, default=10.0,
+                      help="Minimum speedup of a second instance over the first.")
+    args = args.parse_args(argv)
+    first = build_time()
+    second = min(build_time() for _ in range(20))
+    print(f"first instance:  {first * 1000:8.2f} ms")
+    print(f"second instance: {second * 1000:8.2f} ms")
+    without = min(fresh_process_time(False) for _ in range(args.repeat))
+    with_parsetab = min(fresh_process_time(True) for _ in range(args.repeat))
+    print(f"fresh process without parsetab: {without * 1000:8.2f} ms")
+    print(f"fresh process with parsetab:    {with_parsetab * 1000:8.2f} ms")
+    return 0 if first >= args.speedup * second else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,97 @@
+import random
+import unittest
+
+from Modules.componentsLEXER.Base_Lexer import BaseLexer
+from Modules.componentsLEXER.Incremental_Lexer import IncrementalLexer
+
+SOURCE = '''/* Example 2
+   Code between /* nested */ comments should be ignored
+*/
+package main
+
+func main() {
+    flag := true;
+    peoples := {
+        "age": 30,
+        "name": "Ana"
+    };
+    raw := `multi
+line`;
+    if peoples["age"] >= 18 {
+        print("[+] Of legal age");
+    }
+    x := 3 @ 4;
+}
+'''
+
+# Pieces of the random edits: newlines, quotes, comment delimiters and
+# characters the lexer rejects.
+SNIPPETS = ['a', '1', ' ', '\n', '"', "'", '`', '/*', '*/', '/', '*', '#', '//', '\\',
+            'x := 2', '{', '}', '(', ')', 'if', '@', '\n\n', 'func f() {\n}\n']
+
+def token_rows(tokens):
+    return [(tok.type, tok.value, tok.lineno, tok.lexpos) for tok in tokens]
+
+def error_rows(errors):
+    return [(err.lineno, err.col, err.message, err.lexpos, err.context) for err in errors]
+
+def line_col(text, pos):
+    """Returns the line (from 1) and column (from 0) of a position."""
+    return text.count('\n', 0, pos) + 1, pos - (text.rfind('\n', 0, pos) + 1)
+
+class IncrementalLexerTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.reference = BaseLexer()
+
+    def edit(self, document, text, start, end, new):
+        document.edit(*line_col(text, start), *line_col(text, end), new)
+        return text[:start] + new + text[end:]
+
+    def assertMatchesFull(self, document, text):
+        self.assertEqual(document.text(), text)
+        tokens = token_rows(self.reference.tokenize(text))
+        errors = error_rows(self.reference.get_errors())
+        self.assertEqual(token_rows(document.get_tokens()), tokens)
+        self.assertEqual(error_rows(document.get_errors()), errors)
+
+    def test_initial_text(self):
+        for text in (SOURCE, '', '`unmatched\n\nraw', '/* open\n/* nested */\n', '"a\nb"'):
+            with self.subTest(text=text[:20]):
+                self.assertMatchesFull(IncrementalLexer(text), text)
+
+    def test_unmatched_backquote(self):
+        document, text = IncrementalLexer(SOURCE), SOURCE
+        start = SOURCE.index('package')
+        text = self.edit(document, text, start, start, '`')
+        self.assertMatchesFull(document, text)
+        text = self.edit(document, text, start, start + 1, '')
+        self.assertMatchesFull(document, text)
+
+    def test_cross_line_edits(self):
+        document, text = IncrementalLexer(SOURCE), SOURCE
+        start, end = SOURCE.index('*/'), SOURCE.index('flag')
+        text = self.edit(document, text, start, end, '')
+        self.assertMatchesFull(document, text)
+        start, end = text.index('multi'), text.index('if')
+        text = self.edit(document, text, start, end, 'a\n/* b\n')
+        self.assertMatchesFull(document, text)
+
+    def test_random_edits(self):
+        rng = random.Random(3)
+        for case in range(300):
+            if case % 3:
+                text = ''.join(rng.choice(SNIPPETS) for _ in range(rng.randint(0, 30)))
+            else:
+                text = SOURCE
+            document = IncrementalLexer(text)
+            for _ in range(5):
+                start = rng.randint(0, len(text))
+                end = min(len(text), start + rng.choice([0, 1, 3, 10, 40]))
+                new = ''.join(rng.choice(SNIPPETS) for _ in range(rng.randint(0, 3)))
+                text = self.edit(document, text, start, end, new)
+                with self.subTest(case=case):
+                    self.assertMatchesFull(document, text)
+
+if __name__ == '__main__':
+    unittest.main()
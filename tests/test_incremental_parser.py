@@ -0,0 +1,108 @@
+import random
+import unittest
+
+from Modules.componentsLEXER.Core_Errors import ParseError
+from Modules.componentsLEXER.Incremental_Parser import IncrementalParser
+from Modules.componentsLEXER.Language_Parser import LanguageParser
+
+# Top-level statements the random documents are made of.
+STATEMENTS = ['x := 1;\n', 'y := x + 2;\n', 'func f() {\n  a := 1;\n  return a;\n}\n',
+              'if x > 1 {\n print(x);\n}\n', 'else {\n y := 2;\n}\n', 'package main\n',
+              'import "fmt";\n', '/* c\n */\n', 'for (i := 0; i < 3; i = i + 1) { print(i); }\n',
+              '{ z := 3; }\n', '`raw\nstr`;\n', '"s";\n']
+
+# Pieces of the random edits, most of which break the statement they land in.
+SNIPPETS = ['x', '1', ';', '{', '}', '\n', ' ', 'else', 'if', '(', ')', ':=', '"', '`',
+            '/*', '*/', '@', 'func g() {', '}\n', 'y := 2;', 'print(1);']
+
+def error_rows(errors):
+    return [(type(err), err.lineno, err.col, err.message, err.lexpos) for err in errors]
+
+def line_col(text, pos):
+    """Returns the line (from 1) and column (from 0) of a position."""
+    return text.count('\n', 0, pos) + 1, pos - (text.rfind('\n', 0, pos) + 1)
+
+class IncrementalParserTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.reference = LanguageParser()
+
+    def edit(self, document, text, start, end, new):
+        document.edit(*line_col(text, start), *line_col(text, end), new)
+        return text[:start] + new + text[end:]
+
+    def assertMatchesFull(self, document, text):
+        """
+        Compares with a full parse. With syntax errors, only the lexer errors
+        must match: the incremental parser keeps each syntax error in the
+        region it was found in.
+        """
+        self.assertEqual(document.lexer.text(), text)
+        ast = self.reference.parse(text)
+        errors = self.reference.get_errors()
+        if any(isinstance(err, ParseError) for err in errors):
+            lexer_errors = [err for err in errors if not isinstance(err, ParseError)]
+            document_errors = [err for err in document.get_errors() if not isinstance(err, ParseError)]
+            self.assertEqual(error_rows(document_errors), error_rows(lexer_errors))
+            self.assertTrue(any(isinstance(err, ParseError) for err in document.get_errors()))
+        else:
+            self.assertEqual(document.ast, ast)
+            self.assertEqual(error_rows(document.get_errors()), error_rows(errors))
+
+    def test_break_and_fix(self):
+        text = ''.join(STATEMENTS[:4]) + STATEMENTS[4] + 'z := `a\nb`;\n'
+        document = IncrementalParser(text)
+        self.assertMatchesFull(document, text)
+        for new in ('{', '`', '/*', '@', 'else'):
+            start = text.index('print')
+            with self.subTest(new=new):
+                text = self.edit(document, text, start, start, new)
+                self.assertMatchesFull(document, text)
+                text = self.edit(document, text, start, start + len(new), '')
+                self.assertMatchesFull(document, text)
+
+    def test_cross_line_edits(self):
+        text = ''.join(STATEMENTS)
+        document = IncrementalParser(text)
+        start, end = text.index('a := 1'), text.index('print(x)')
+        text = self.edit(document, text, start, end, 'b := 2;\n}\nif x {\n')
+        self.assertMatchesFull(document, text)
+        start, end = text.index('`raw'), text.index('"s"')
+        text = self.edit(document, text, start, end, '')
+        self.assertMatchesFull(document, text)
+
+    def test_random_edits(self):
+        rng = random.Random(5)
+        for case in range(150):
+            text = ''.join(rng.choice(STATEMENTS) for _ in range(rng.randint(0, 8)))
+            document = IncrementalParser(text)
+            for _ in range(8):
+                if rng.random() < 0.5:
+                    start = rng.randint(0, len(text))
+                    end = min(len(text), start + rng.randint(0, 6))
+                    new = ''.join(rng.choice(SNIPPETS) for _ in range(rng.randint(0, 2)))
+                else:
+                    # Inserts or deletes a whole statement at a line start.
+                    start = rng.choice([0] + [i + 1 for i, c in enumerate(text) if c == '\n'])
+                    end, new = start, rng.choice(STATEMENTS)
+                    if rng.random() < 0.5:
+                        end, new = text.find('\n', start) + 1 or len(text), ''
+                text = self.edit(document, text, start, end, new)
+                with self.subTest(case=case):
+                    self.assertMatchesFull(document, text)
+
+    def test_untouched_statements_reused(self):
+        text = 'x := 1;\nfunc f() {\n  a := 1;\n}\ny := 2;\nif x > 1 {\n print(x);\n}\n'
+        document = IncrementalParser(text)
+        before = list(document.ast[1])
+        start = text.index('a := 1')
+        text = self.edit(document, text, start, start + 1, 'b')
+        self.assertMatchesFull(document, text)
+        after = document.ast[1]
+        self.assertEqual(len(after), len(before))
+        self.assertIsNot(after[1], before[1])
+        for index in (0, 2, 3):
+            self.assertIs(after[index], before[index])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import io
+import json
+import unittest
+
+from Modules.Lexer_Core import LexerCore
+from Modules.componentsLEXER.Core_Errors import ParseError
+from Modules.componentsLEXER.Json_Encoder import ResultJsonEncoder
+
+SOURCES = [
+    '''package main
+
+func main() {
+    var n int = 3;
+    for (i := 0; i < n; i = i + 1) {
+        if i == 1 {
+            print("One");
+        } else {
+            print("Other:", i);
+        }
+    }
+}
+''',
+    'package main\nfunc main() {\n    m := {"a": 1, "b": x};\n    r := `raw\nü`;\n}\n',
+    'package main\nfunc main() {\n    x := "ü\\n\\"q" @ 4;\n    y := "unterminated\n    if { }\n',
+    '',
+]
+
+MODES = [{}, {"compact": True}, {"spans": True}, {"nodes": True}, {"flat": True}]
+
+def token_to_dict(token):
+    return {"type": token.type, "value": token.value, "lineno": token.lineno, "lexpos": token.lexpos}
+
+def error_to_dict(error):
+    data = {
+        "kind": "parser" if isinstance(error, ParseError) else "lexer",
+        "lineno": error.lineno,
+        "col": error.col,
+        "message": error.message
+    }
+    if isinstance(error, ParseError) and error.value is not None:
+        data["value"] = error.value
+    return data
+
+def result_to_dict(result):
+    """Builds the dictionary whose `json.dumps` the encoder must match."""
+    return {
+        "path": result["path"],
+        "tokens": [token_to_dict(tok) for tok in result["tokens"]],
+        "ast": result["ast"],
+        "lexer_errors": [error_to_dict(err) for err in result["lexer_errors"]],
+        "parser_errors": [error_to_dict(err) for err in result["parser_errors"]]
+    }
+
+class ResultJsonEncoderTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.core = LexerCore()
+
+    def test_same_as_json_dumps(self):
+        for source in SOURCES:
+            expected = result_to_dict(dict(self.core.process(source), path="p"))
+            for mode in MODES:
+                result = dict(self.core.process(source, **mode), path="p")
+                for ensure_ascii in (False, True):
+                    with self.subTest(source=source[:20], mode=mode, ensure_ascii=ensure_ascii):
+                        out = io.StringIO()
+                        ResultJsonEncoder(out, ensure_ascii=ensure_ascii, buffer_size=7).write_json(result)
+                        self.assertEqual(out.getvalue(), json.dumps(expected, ensure_ascii=ensure_ascii) + '\n')
+
+    def test_unreadable_file(self):
+        out = io.StringIO()
+        ResultJsonEncoder(out).write_jsonl([{"path": "x", "error": "nope"}])
+        self.assertEqual(out.getvalue(), json.dumps({"path": "x", "error": "nope"}) + '\n')
+
+if __name__ == '__main__':
+    unittest.main()
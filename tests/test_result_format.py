@@ -0,0 +1,169 @@
+import unittest
+
+from Modules.Lexer_Core import LexerCore
+from Modules.componentsLEXER.Flat_Ast import FlatAst
+from Modules.componentsLEXER.Result_Format import ResultReader, ResultWriter
+
+# Sources round-tripped by the tests: the examples of the README, inputs
+# with lexer and parser errors, and edge cases of the format.
+SAMPLES = {
+    "example_1": '''package main
+
+func main() {
+    var n int = 3;
+
+    // Example of for loop and if-else
+    for (i := 0; i < n; i = i + 1) {
+        if i == 1 {
+            print("One");
+        } else {
+            print("Other:", i);
+        }
+    }
+}
+''',
+    "example_2": '''/* Example 2
+   Code between /* nested */ comments should be ignored
+*/
+package main
+
+func main() {
+    flag := true;
+    peoples := {
+        "age": 30,
+        "name": "Ana"
+    };
+    raw := `multi
+line`;
+    if peoples["age"] >= 18 {
+        print("[+] Of legal age");
+    }
+}
+''',
+    "example_3": '''package main
+func main() {
+    if age < 18 && flag {
+        print("You are underage and have permission");
+    } else if age < 18 && !flag {
+        print("You are underage and do not have permission");
+    } else {
+        print("You are of legal age");
+    }
+}
+''',
+    "errors": '''package main
+func main() {
+    x := 3 @ 4;
+    y := "unterminated
+    z := $;
+    if x { print("a"); } else if { }
+}
+''',
+    "empty": '',
+    "large_int": 'package main\nfunc main() { x := 123456789012345678901234567890; }\n',
+    "non_ascii": 'package main\nfunc main() { s := "ñandú ∂ 😀"; t := `ü\n€`; ¿ }\n',
+}
+
+# Options of `LexerCore.process` for each result mode.
+MODES = {
+    "tuple": {},
+    "compact": {"compact": True},
+    "spans": {"spans": True},
+    "nodes": {"nodes": True},
+    "flat": {"flat": True},
+}
+
+def token_rows(tokens):
+    return [(tok.type, tok.value, tok.lineno, tok.lexpos) for tok in tokens]
+
+def ast_rows(ast):
+    if ast is None:
+        return None
+    flat = ast if isinstance(ast, FlatAst) else FlatAst.from_tree(ast)
+    return flat.to_tuple(), [flat.span_of(index) for index in range(len(flat))]
+
+def error_rows(errors):
+    return [(type(err), err.lineno, err.col, err.lexpos, str(err)) for err in errors]
+
+def replace_ints(tree, values):
+    """Returns a tuple AST with its ints replaced by `values[int]`."""
+    if isinstance(tree, (tuple, list)):
+        return type(tree)(replace_ints(child, values) for child in tree)
+    if type(tree) is int:
+        return values.get(tree, tree)
+    return tree
+
+class ResultFormatTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.core = LexerCore()
+
+    def assertRoundTrip(self, result, text=None):
+        decoded = ResultReader(ResultWriter().dumps(result, text=text)).result()
+        self.assertIs(type(decoded["tokens"]), type(result["tokens"]))
+        self.assertEqual(token_rows(decoded["tokens"]), token_rows(result["tokens"]))
+        self.assertIs(type(decoded["ast"]), type(result["ast"]))
+        self.assertEqual(ast_rows(decoded["ast"]), ast_rows(result["ast"]))
+        self.assertEqual(error_rows(decoded["lexer_errors"]), error_rows(result["lexer_errors"]))
+        self.assertEqual(error_rows(decoded["parser_errors"]), error_rows(result["parser_errors"]))
+        return decoded
+
+    def test_round_trip_every_mode(self):
+        for name, source in SAMPLES.items():
+            for mode, options in MODES.items():
+                for text in (None, source):
+                    with self.subTest(sample=name, mode=mode, text=text is not None):
+                        self.assertRoundTrip(self.core.process(source, **options), text)
+
+    def test_compact_tokens_keep_text(self):
+        source = SAMPLES["non_ascii"]
+        decoded = self.assertRoundTrip(self.core.process(source, compact=True))
+        self.assertEqual(decoded["tokens"].text, source)
+
+    def test_compact_tokens_keep_end_line(self):
+        source = 'package main\nfunc main() {\n x := 1;\n'
+        result = self.core.process(source, compact=True)
+        self.assertEqual(result["tokens"].end_lineno, 4)
+        decoded = self.assertRoundTrip(result)
+        self.assertEqual(decoded["tokens"].end_lineno, 4)
+        self.assertEqual(decoded["parser_errors"][-1].lineno, 4)
+
+    def test_errors_present(self):
+        result = self.core.process(SAMPLES["errors"])
+        self.assertTrue(result["lexer_errors"])
+        self.assertGreater(len(result["parser_errors"]), len(result["lexer_errors"]))
+
+    def test_empty_result(self):
+        decoded = self.assertRoundTrip({"tokens": [], "ast": None, "lexer_errors": [], "parser_errors": []})
+        self.assertEqual(decoded["tokens"], [])
+        self.assertIsNone(decoded["ast"])
+
+    def test_large_and_negative_ints(self):
+        result = self.core.process(SAMPLES["large_int"])
+        large = 123456789012345678901234567890
+        self.assertIn(large, [tok.value for tok in result["tokens"]])
+        values = {large: -2 ** 70}
+        for tok in result["tokens"]:
+            if tok.value == large:
+                tok.value = -large
+        result["ast"] = replace_ints(result["ast"], values)
+        decoded = self.assertRoundTrip(result)
+        self.assertIn(-large, [tok.value for tok in decoded["tokens"]])
+        self.assertIn(-2 ** 70, FlatAst.from_tree(decoded["ast"]).values)
+        self.assertEqual(decoded["ast"], result["ast"])
+
+    def test_rejects_bad_data(self):
+        data = ResultWriter().dumps(self.core.process(SAMPLES["example_1"]), text=SAMPLES["example_1"])
+        ResultReader(data)
+        bad_version = bytearray(data)
+        bad_version[4] += 1
+        with self.assertRaisesRegex(ValueError, "format version"):
+            ResultReader(bytes(bad_version))
+        with self.assertRaisesRegex(ValueError, "bad magic"):
+            ResultReader(b"XXXX" + data[4:])
+        for size in (0, 10, 20, len(data) // 2, len(data) - 1):
+            with self.subTest(size=size), self.assertRaises(ValueError):
+                ResultReader(data[:size])
+
+if __name__ == '__main__':
+    unittest.main()
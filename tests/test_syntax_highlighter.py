@@ -0,0 +1,144 @@
+import random
+import re
+import unittest
+
+from Modules.componentsGUI.Syntax_Highlighter import SyntaxHighlighter
+
+# Pixel height of a line in `FakeText`.
+LINE_HEIGHT = 15
+
+SOURCE = '''package main
+
+func main() {
+    var n int = 3;
+
+    // Example of for loop and if-else
+    for (i := 0; i < n; i = i + 1) {
+        if i == 1 {
+            print("One");
+        } else {
+            print("Other:", i);
+        }
+    }
+}
+'''
+
+class FakeRoot:
+    """Stand-in for the main window: runs idle callbacks on demand."""
+    def __init__(self):
+        self.idle = []
+
+    def after(self, ms, func):
+        return None
+
+    def after_idle(self, func):
+        self.idle.append(func)
+        return len(self.idle)
+
+    def after_cancel(self, timer_id):
+        pass
+
+    def run_idle(self):
+        while self.idle:
+            self.idle.pop(0)()
+
+class FakeText:
+    """
+    Stand-in for a Tk text widget. Tags are sets of character offsets that
+    move with the text like in Tk: inserted characters get no tags.
+    """
+    def __init__(self, height=40 * LINE_HEIGHT):
+        self.text = ''
+        self.top = 1
+        self.height = height
+        self.tags = {}
+
+    def _offset(self, index):
+        match = re.fullmatch(r'(\d+)\.(\d+|end)', index)
+        line, col = int(match.group(1)), match.group(2)
+        starts = [0] + [m.end() for m in re.finditer('\n', self.text)]
+        if line > len(starts):
+            return len(self.text)
+        end = starts[line] - 1 if line < len(starts) else len(self.text)
+        return end if col == 'end' else min(starts[line - 1] + int(col), end)
+
+    def index(self, index):
+        line = self.top + int(index.split(',')[1]) // LINE_HEIGHT
+        return f"{min(line, self.text.count(chr(10)) + 1)}.0"
+
+    def winfo_height(self):
+        return self.height
+
+    def get(self, start, end):
+        return self.text
+
+    def bind(self, sequence, func, add=None):
+        pass
+
+    def tag_config(self, tag, **options):
+        self.tags.setdefault(tag, set())
+
+    def tag_add(self, tag, start, end):
+        self.tags[tag].update(range(self._offset(start), self._offset(end)))
+
+    def tag_remove(self, tag, start, end):
+        start, end = self._offset(start), self._offset(end)
+        self.tags[tag] = {offset for offset in self.tags[tag] if not start <= offset < end}
+
+    def replace(self, start, end, text):
+        shift = len(text) - (end - start)
+        for tag, offsets in self.tags.items():
+            self.tags[tag] = {
+                offset if offset < start else offset + shift
+                for offset in offsets if not start <= offset < end
+            }
+        self.text = self.text[:start] + text + self.text[end:]
+
+def highlighted(text, top):
+    """Returns the tags of a fresh highlighter on `text` scrolled to `top`."""
+    root, widget = FakeRoot(), FakeText()
+    widget.replace(0, 0, text)
+    widget.top = top
+    highlighter = SyntaxHighlighter(root, widget)
+    highlighter.text_changed()
+    root.run_idle()
+    return widget.tags
+
+class SyntaxHighlighterTest(unittest.TestCase):
+    def setUp(self):
+        self.root, self.widget = FakeRoot(), FakeText()
+        self.highlighter = SyntaxHighlighter(self.root, self.widget)
+        self.edit(0, 0, SOURCE)
+
+    def edit(self, start, end, text):
+        self.widget.replace(start, end, text)
+        self.highlighter.text_changed()
+        self.root.run_idle()
+
+    def assertMatchesFresh(self):
+        self.assertEqual(self.widget.tags, highlighted(self.widget.text, self.widget.top))
+
+    def test_paste_repeating_following_text(self):
+        line = '    var n int = 3;\n'
+        start = SOURCE.index(line)
+        self.edit(start, start, line)
+        self.assertMatchesFresh()
+
+    def test_paste_closing_brace_before_brace(self):
+        start = SOURCE.rindex('}')
+        self.edit(start, start, '}\n')
+        self.assertMatchesFresh()
+
+    def test_random_edits(self):
+        snippets = ['x', '\n', '"', '`', '/*', '*/', '}\n', 'func ', '', 'var a int = 5;\n', '`raw\nraw`']
+        rng = random.Random(7)
+        self.edit(0, 0, SOURCE * 20)
+        for _ in range(300):
+            start = rng.randrange(len(self.widget.text) + 1)
+            end = min(len(self.widget.text), start + rng.choice([0, 0, 1, 3, 30]))
+            self.widget.top = rng.randint(1, self.widget.text.count('\n') + 1)
+            self.edit(start, end, rng.choice(snippets))
+            self.assertMatchesFresh()
+
+if __name__ == '__main__':
+    unittest.main()